@@ -140,13 +140,15 @@ export default function AiInterviewPage() {
       });
 
       if (!response.ok) {
-        throw new Error('Failed to upload video');
+        throw new Error(response.status === 503
+          ? 'The analysis server is busy, please try again in a few minutes'
+          : 'Failed to upload video');
       }
 
       setProcessingStep('Analyzing your performance...');
       setAnalysisProgress(50);
 
-      const data = await response.json();
+      const data = await waitForAnalysis(await response.json());
 
       if (data.success) {
         // Simulate analysis progress
@@ -176,6 +178,29 @@ export default function AiInterviewPage() {
     }
   };
 
+  // The upload only queues the analysis; poll the job until it has finished
+  const waitForAnalysis = async (job) => {
+    if (!job.success || !job.status_url) {
+      return job;
+    }
+    for (;;) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      const response = await fetch(`http://localhost:5000${job.status_url}`);
+      if (!response.ok) {
+        throw new Error('Failed to get analysis status');
+      }
+      const status = await response.json();
+      if (status.status === 'done' || status.status === 'failed') {
+        return status;
+      }
+      setProcessingStep(status.status === 'queued'
+        ? 'Waiting for the analysis to start...'
+        : status.partial && status.partial.fluency
+          ? 'Analyzing facial expressions and eye contact...'
+          : 'Transcribing your speech...');
+    }
+  };
+
   const simulateAnalysisProgress = () => {
     return new Promise((resolve) => {
       const steps = [
@@ -0,0 +1,119 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache for resume analysis, keyed by a hash of the file bytes.
+
+    Two tiers:
+    - memory: LRU of ready-to-score values, capped at max_entries; get()
+    - sqlite (optional): extracted text and a small JSON-able dict of facts
+      about the file that the text doesn't hold (e.g. its page counts), so
+      it survives restarts. After a get() miss, stored() returns them; the
+      caller rebuilds the value from them (off the event loop: it is the
+      analysis minus the PDF/DOCX parse) and put()s it back in memory
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        db_path: Optional[str] = None,
+        db_max_entries: int = 10000,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.db_max_entries = max(1, db_max_entries)
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resume_text ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, accessed REAL NOT NULL, "
+                "meta TEXT NOT NULL DEFAULT '{}')"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(resume_text)")}
+            if "meta" not in columns:  # file written before meta was stored
+                self._db.execute("ALTER TABLE resume_text ADD COLUMN meta TEXT NOT NULL DEFAULT '{}'")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """The value from the memory tier; on None, look in stored()."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+            return value
+
+    def stored(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """The text and meta put() with the key, from the sqlite tier."""
+        with self._lock:
+            stored = self._db_get(key)
+            self._stats["misses" if stored is None else "disk_hits"] += 1
+            return stored
+
+    def put(self, key: str, text: str, value: Any, meta: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO resume_text (key, text, accessed, meta) VALUES (?, ?, ?, ?)",
+                    (key, text, time.time(), json.dumps(meta or {}))
+                )
+                self._db.execute(
+                    "DELETE FROM resume_text WHERE key IN ("
+                    "SELECT key FROM resume_text ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.db_max_entries,)
+                )
+                self._db.commit()
+
+    # Drop ready-made values but keep the text tier: values are rebuilt from it
+    def clear_memory(self):
+        with self._lock:
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM resume_text")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hit_rate = (self._stats["hits"] + self._stats["disk_hits"]) / lookups if lookups else 0.0
+            return {
+                **self._stats,
+                "hit_rate": round(hit_rate, 3),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_tier": self._db is not None,
+            }
+
+    # Caller must hold self._lock
+    def _remember(self, key: str, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    # Caller must hold self._lock
+    def _db_get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT text, meta FROM resume_text WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute("UPDATE resume_text SET accessed = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+        return row[0], json.loads(row[1])
@@ -0,0 +1,103 @@
+"""
+Screen a local directory of resumes against one role.
+
+Parses and scores every PDF/DOCX under DIRECTORY in parallel across cores and
+prints one NDJSON line per resume as it finishes, followed by a ranking line
+(the same records /batch-analyze streams).
+
+Usage:
+    python batch_cli.py DIRECTORY --role "software engineer" [--experience 3] [--workers 8] [--out results.ndjson]
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import main
+
+
+def find_resumes(directory: Path):
+    return sorted(
+        path for path in directory.rglob("*")
+        if path.is_file() and path.suffix.lower() in main.RESUME_EXTENSIONS
+    )
+
+
+def screen(paths, role, experience, workers, out):
+    results = []
+    queue = iter(paths)
+    pending = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def start_next():
+            path = next(queue, None)
+            if path is None:
+                return
+            data = path.read_bytes()
+            if len(data) > main.MAX_UPLOAD_BYTES:
+                record(main.batch_error(str(path), 400, "File too large. Maximum size is 10MB"))
+                start_next()
+                return
+            pending[pool.submit(main.process_resume_bytes, data)] = path
+
+        def record(result):
+            results.append(result)
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+        # Two jobs per worker keeps every core busy without reading the whole directory up front
+        for _ in range(workers * 2):
+            start_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    _, document, _ = future.result()
+                except main.ExtractionError as e:
+                    record(main.batch_error(str(path), 500, str(e)))
+                else:
+                    if document is None:
+                        record(main.batch_error(str(path), 400, "Resume text too short or empty"))
+                    else:
+                        features, document_scores = document
+                        report = main.analyze_resume(features, document_scores, path.stem, role, experience)
+                        record(main.batch_result(str(path), report))
+                start_next()
+
+    ranking = main.rank_batch_results(results, role)
+    out.write(json.dumps(ranking) + "\n")
+    return ranking
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--role", default="")
+    parser.add_argument("--experience", default="")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", type=Path, help="write NDJSON here instead of stdout")
+    args = parser.parse_args()
+
+    if not args.directory.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+    paths = find_resumes(args.directory)
+    if not paths:
+        parser.error(f"no PDF or DOCX files found under {args.directory}")
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        ranking = screen(paths, args.role, args.experience, max(1, args.workers), out)
+    finally:
+        if args.out:
+            out.close()
+
+    print(f"Screened {ranking['total']} resumes: {ranking['analyzed']} analyzed, {ranking['failed']} failed",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    run()
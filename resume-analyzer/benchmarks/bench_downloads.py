@@ -0,0 +1,259 @@
+"""
+Benchmark: resume downloads for /analyze against a local stand-in storage host.
+
+Starts a threaded HTTP/1.1 server that serves a synthetic resume with an ETag
+(answering If-None-Match with 304), an oversized file with and without a
+Content-Length, and counts TCP connections and concurrent requests. Then:
+- one fresh requests.get per download (the old download_file) vs the pooled
+  ResumeDownloader, sequentially: time and connections opened
+- a burst of concurrent downloads: peak concurrency seen by the server
+- the byte cap on oversized bodies
+- /analyze end to end through the app, twice for the same URL (the second
+  download is a 304)
+
+It ends with checks of the downloader's contract and exits with status 1
+if one fails: the byte cap (declared and chunked), ETag revalidation, LRU
+eviction of the ETag cache, and one downloader used from several event
+loops. This is a manual check; the service has no automated test suite.
+
+Usage:
+    python benchmarks/bench_downloads.py [--downloads 200] [--burst 100] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import hashlib
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import resume_pdf  # noqa: E402
+from downloader import DownloadError, ResumeDownloader  # noqa: E402
+
+MAX_BYTES = 10 * 1024 * 1024
+
+
+class StorageServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, resume, latency):
+        super().__init__(("127.0.0.1", 0), StorageHandler)
+        self.resume = resume
+        self.etag = '"%s"' % hashlib.sha256(resume).hexdigest()[:16]
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def reset(self):
+        with self.lock:
+            self.connections = self.requests = self.not_modified = self.active = self.peak_active = 0
+
+
+class StorageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY a kept-alive
+    # connection stalls on delayed ACKs, which real storage hosts don't do
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.active += 1
+            server.peak_active = max(server.peak_active, server.active)
+        try:
+            time.sleep(server.latency)
+            if self.path.startswith("/resume.pdf"):
+                if self.headers.get("If-None-Match") == server.etag:
+                    with server.lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", server.etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("ETag", server.etag)
+                self.send_header("Content-Length", str(len(server.resume)))
+                self.end_headers()
+                self.wfile.write(server.resume)
+            elif self.path == "/huge.pdf":
+                self.send_response(200)
+                self.send_header("Content-Length", str(MAX_BYTES * 5))
+                self.end_headers()
+                self.wfile.write(b"%PDF" + b"0" * (1024 * 1024))
+                self.close_connection = True
+            elif self.path == "/huge-chunked.pdf":
+                self.send_response(200)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                chunk = b"0" * (256 * 1024)
+                try:
+                    for _ in range(200):  # 50MB if the client kept reading
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                self.close_connection = True
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+def old_download(url):
+    resp = requests.get(url, timeout=30, allow_redirects=True)
+    resp.raise_for_status()
+    return resp.content
+
+
+async def pooled_downloads(url, n, concurrency, unique):
+    downloader = ResumeDownloader(max_bytes=MAX_BYTES, max_concurrency=concurrency)
+    try:
+        urls = [f"{url}?v={i}" if unique else url for i in range(n)]
+        return await asyncio.gather(*(downloader.fetch(u) for u in urls)), downloader.stats()
+    finally:
+        await downloader.aclose()
+
+
+async def capped(url):
+    downloader = ResumeDownloader(max_bytes=MAX_BYTES)
+    start = time.perf_counter()
+    try:
+        await downloader.fetch(url)
+        outcome = "downloaded (cap not applied!)"
+    except DownloadError as e:
+        outcome = str(e)
+    finally:
+        await downloader.aclose()
+    return outcome, time.perf_counter() - start
+
+
+async def fetch_all(downloader, urls):
+    return [await downloader.fetch(url) for url in urls]
+
+
+def verify(base, resume):
+    """The downloader checks; returns the names of the failed ones."""
+    failed = []
+
+    def check(ok, what):
+        print(f"  {'ok  ' if ok else 'FAIL'} {what}")
+        if not ok:
+            failed.append(what)
+
+    print("\nchecks")
+    for path in ("/huge.pdf", "/huge-chunked.pdf"):
+        outcome, _ = asyncio.run(capped(base + path))
+        check(outcome.startswith("File too large"), f"byte cap on {path}")
+
+    url = f"{base}/resume.pdf"
+    downloader = ResumeDownloader(max_bytes=MAX_BYTES, cache_max_bytes=2 * len(resume))
+    bodies = asyncio.run(fetch_all(downloader, [url, url]))
+    stats = downloader.stats()
+    check(bodies == [resume, resume] and stats["downloads"] == 1 and stats["not_modified"] == 1,
+          "ETag revalidation: second fetch of a URL is a 304 served from the cache")
+
+    # Every asyncio.run is a new event loop: the client must be rebuilt for it
+    bodies = asyncio.run(fetch_all(downloader, [f"{url}?v=1", f"{url}?v=2"]))
+    stats = downloader.stats()
+    check(bodies == [resume, resume] and stats["errors"] == 0, "one downloader across event loops")
+    check(stats["cached_urls"] == 2 and stats["cached_bytes"] <= 2 * len(resume),
+          "ETag cache stays within cache_max_bytes")
+    asyncio.run(fetch_all(downloader, [url]))
+    check(downloader.stats()["downloads"] == 4, "least recently used URL was evicted (full download again)")
+    asyncio.run(downloader.aclose())
+    return failed
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--downloads", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005, help="server think time per request (s)")
+    args = parser.parse_args()
+
+    resume = resume_pdf(3, seed=3)
+    server = StorageServer(resume, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        print(f"{args.downloads} sequential downloads of a {len(resume) // 1024} KB resume")
+        start = time.perf_counter()
+        for i in range(args.downloads):
+            assert old_download(f"{base}/resume.pdf?v={i}") == resume
+        old_seconds = time.perf_counter() - start
+        print(f"  requests.get per call   {old_seconds:6.2f}s  connections={server.connections}")
+
+        server.reset()
+        start = time.perf_counter()
+        bodies, _ = asyncio.run(pooled_downloads(f"{base}/resume.pdf", args.downloads, 1, unique=True))
+        assert all(b == resume for b in bodies)
+        print(f"  pooled client           {time.perf_counter() - start:6.2f}s  connections={server.connections}")
+
+        server.reset()
+        bodies, stats = asyncio.run(pooled_downloads(f"{base}/resume.pdf", args.downloads, 1, unique=False))
+        assert all(b == resume for b in bodies)
+        print(f"  same URL (ETag cache)   requests={server.requests} not_modified={server.not_modified} "
+              f"downloads={stats['downloads']}")
+
+        server.reset()
+        start = time.perf_counter()
+        asyncio.run(pooled_downloads(f"{base}/resume.pdf", args.burst, args.concurrency, unique=True))
+        print(f"\n{args.burst} concurrent downloads, limit {args.concurrency}: "
+              f"{time.perf_counter() - start:.2f}s  peak at server={server.peak_active}  "
+              f"connections={server.connections}")
+
+        print("\nbyte cap")
+        for path in ("/huge.pdf", "/huge-chunked.pdf"):
+            outcome, seconds = asyncio.run(capped(base + path))
+            print(f"  {path:<18} {outcome}  ({seconds * 1000:.0f} ms)")
+
+        import main  # noqa: E402
+        from fastapi.testclient import TestClient
+
+        server.reset()
+        with TestClient(main.app) as client:
+            for attempt in ("first", "repeat"):
+                start = time.perf_counter()
+                resp = client.post("/analyze", json={"userId": "bench", "resumeUrl": f"{base}/resume.pdf",
+                                                     "role": "software engineer"})
+                print(f"\n/analyze {attempt:<6} {resp.status_code}  {(time.perf_counter() - start) * 1000:7.1f} ms  "
+                      f"ats_score={resp.json().get('ats_score')}")
+            print(f"server: requests={server.requests} not_modified={server.not_modified}")
+            print(client.get("/health").json()["downloads"])
+
+        failed = verify(base, resume)
+    finally:
+        server.shutdown()
+    if failed:
+        sys.exit(f"{len(failed)} check(s) failed")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,203 @@
+"""
+Micro-benchmark for the resume feature extractors in features.py.
+
+Each extractor is timed against the per-call regex implementation it replaced,
+on a synthetic cleaned resume, and the outputs are checked for equality.
+
+Usage:
+    python benchmarks/bench_extractors.py [--lines 120] [--number 200]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import features  # noqa: E402
+
+
+# ---------- Reference implementations (before precompiled patterns) ----------
+
+LEGACY_ACTION_VERBS = json.loads((BASE_DIR / "taxonomy.json").read_text(encoding="utf-8"))["action_verbs"]
+ACTION_VERBS = features.ActionVerbMatcher(LEGACY_ACTION_VERBS)
+
+
+def legacy_simple_clean(text):
+    text = re.sub(r'\t+', ' ', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'\n\s*\n+', '\n\n', text)
+    return text.strip().lower()
+
+
+def legacy_extract_contact_info(text):
+    phone_pattern = r'(\+?\d{1,3}[-.\s]?)?(\d{10}|\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
+    return {
+        "email": bool(re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)),
+        "phone": bool(re.search(phone_pattern, text)),
+        "linkedin": bool(re.search(r'linkedin\.com/in/[\w-]+', text, re.I)),
+        "github": bool(re.search(r'github\.com/[\w-]+', text, re.I)),
+        "portfolio": bool(re.search(r'(portfolio|website|http)', text, re.I))
+    }
+
+
+def legacy_extract_sections(text):
+    patterns = {
+        "summary": r'\b(summary|profile|objective|about\s+me|professional\s+summary)\b',
+        "skills": r'\b(skills|technical\s+skills|core\s+skills|competencies|expertise)\b',
+        "experience": r'\b(experience|work\s+experience|employment|professional\s+experience)\b',
+        "education": r'\b(education|academic|qualifications|degrees)\b',
+        "projects": r'\b(projects|portfolio|work\s+samples)\b',
+        "certifications": r'\b(certifications?|licenses?|credentials)\b',
+        "achievements": r'\b(achievements?|awards?|honors?|accomplishments?)\b'
+    }
+    sections = {}
+    current_section = "header"
+    current_content = []
+    for line in text.split('\n'):
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+        matched = False
+        for section_name, pattern in patterns.items():
+            if re.search(pattern, line_stripped, re.I) and len(line_stripped) < 50:
+                if current_content:
+                    sections[current_section] = '\n'.join(current_content)
+                current_section = section_name
+                current_content = []
+                matched = True
+                break
+        if not matched:
+            current_content.append(line_stripped)
+    if current_content:
+        sections[current_section] = '\n'.join(current_content)
+    return sections
+
+
+def legacy_analyze_experience(exp_text, user_exp):
+    year_ranges = re.findall(r'(20\d{2})\s*[-–—to]+\s*(20\d{2}|present|current)', exp_text, re.I)
+    total_years = 0
+    for start, end in year_ranges:
+        end_year = datetime.now().year if end.lower() in ['present', 'current'] else int(end)
+        total_years += max(0, end_year - int(start))
+    explicit_years = re.findall(r'(\d+)\+?\s*years?', exp_text, re.I)
+    if explicit_years:
+        total_years = max(total_years, int(explicit_years[0]))
+    parsed_user_years = features.parse_user_experience_years(user_exp)
+    consistent = True if parsed_user_years is None else abs(total_years - parsed_user_years) <= 1
+    detail_level = "low"
+    if len(exp_text.split('\n')) > 5:
+        detail_level = "high"
+    elif len(exp_text) > 100:
+        detail_level = "medium"
+    return {
+        "years_found": total_years,
+        "user_years": parsed_user_years,
+        "consistent": consistent,
+        "detail_level": detail_level
+    }
+
+
+def legacy_count_action_verbs(text):
+    found_verbs = []
+    for verb in LEGACY_ACTION_VERBS:
+        if re.search(r'\b' + verb + r'\w*\b', text, re.I):
+            found_verbs.append(verb)
+    return len(found_verbs), found_verbs
+
+
+def legacy_analyze_achievements(text):
+    metrics_patterns = {
+        "percentage": r'\d+%',
+        "money": r'\$\d+[kmb]?',
+        "numbers": r'\b\d+\+?\b',
+        "time_saved": r'\d+\s*(hours?|days?|weeks?|months?)',
+        "team_size": r'team\s+of\s+\d+',
+    }
+    metrics_found = {k: len(re.findall(p, text, re.I)) for k, p in metrics_patterns.items()}
+    total_metrics = sum(metrics_found.values())
+    return {
+        "total_quantified": total_metrics,
+        "metrics_breakdown": metrics_found,
+        "has_impact": total_metrics > 3
+    }
+
+
+def legacy_check_ats_optimization(text, sections):
+    return {
+        "simple_formatting": not bool(re.search(r'[│┤┼╪╫╬═║]', text)),
+        "no_images_text": True,
+        "standard_sections": len(set(sections.keys()) & {"experience", "education", "skills"}) == 3,
+        "contact_info": bool(re.search(r'@', text)),
+        "appropriate_length": 300 < len(text.split()) < 1500,
+    }
+
+
+# ---------- Synthetic resume ----------
+
+def build_resume(lines, rng):
+    verbs = LEGACY_ACTION_VERBS + ["worked", "helped", "participated"]
+    tools = ["python", "docker", "kubernetes", "react", "sql", "aws", "java", "git"]
+    out = [
+        "Jane Doe",
+        "jane.doe@example.com | +1 (555) 123-4567 | linkedin.com/in/janedoe | github.com/jdoe",
+        "",
+        "Professional Summary",
+        "Backend engineer with 6+ years of experience.",
+        "",
+        "Technical Skills",
+        ", ".join(tools),
+        "",
+        "Work Experience",
+    ]
+    for i in range(lines):
+        if i % 8 == 0:
+            out.append(f"Company {i}\t2019 - present")
+        else:
+            out.append(
+                f"{rng.choice(verbs).capitalize()} {rng.choice(tools)} services for a team of {rng.randint(2, 12)}, "
+                f"cutting latency {rng.randint(5, 80)}% and saving ${rng.randint(1, 99)}k over {rng.randint(1, 9)} months"
+            )
+    out += ["", "Education", "Bachelor of Technology, 2018, GPA 8.5", "", "Awards", "Hackathon winner 2020"]
+    return "\n".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=120, help="experience bullets in the synthetic resume")
+    parser.add_argument("--number", type=int, default=200, help="calls per measurement")
+    args = parser.parse_args()
+
+    raw = build_resume(args.lines, random.Random(42))
+    text = legacy_simple_clean(raw)
+    sections = legacy_extract_sections(text)
+    exp_text = sections.get("experience", "")
+
+    cases = [
+        ("simple_clean", legacy_simple_clean, features.simple_clean, (raw,)),
+        ("extract_contact_info", legacy_extract_contact_info, features.extract_contact_info, (text,)),
+        ("extract_sections", legacy_extract_sections, features.extract_sections, (text,)),
+        ("analyze_experience", legacy_analyze_experience, features.analyze_experience, (exp_text, "5 years")),
+        ("count_action_verbs", legacy_count_action_verbs,
+         lambda t: features.count_action_verbs(t, ACTION_VERBS), (text,)),
+        ("analyze_achievements", legacy_analyze_achievements, features.analyze_achievements, (text,)),
+        ("check_ats_optimization", legacy_check_ats_optimization, features.check_ats_optimization, (text, sections)),
+    ]
+
+    print(f"resume: {len(text.split())} words, {text.count(chr(10)) + 1} lines")
+    print(f"{'extractor':<24} {'legacy us':>10} {'engine us':>10} {'speedup':>8}")
+    for name, legacy, engine, call_args in cases:
+        if legacy(*call_args) != engine(*call_args):
+            raise SystemExit(f"{name}: output differs from the legacy implementation")
+        legacy_us = min(timeit.repeat(lambda: legacy(*call_args), number=args.number, repeat=3)) / args.number * 1e6
+        engine_us = min(timeit.repeat(lambda: engine(*call_args), number=args.number, repeat=3)) / args.number * 1e6
+        print(f"{name:<24} {legacy_us:>10.1f} {engine_us:>10.1f} {legacy_us / engine_us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: incremental re-analysis of edited resume text (/analyze-text).
+
+For resumes of several lengths, times the document analysis of the whole
+text (analyze_document, what the file endpoints run) against
+process_resume_text re-using the blocks of the previous version after a
+single edit: one experience bullet rewritten, the skills line changed, a
+bullet inserted at the top of the experience section. Every incremental
+result is checked against a from-scratch analysis of the edited text.
+
+Usage:
+    python benchmarks/bench_incremental.py [--pages 2 10 40] [--repeat 20]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import resume_lines  # noqa: E402
+
+import main  # noqa: E402
+from features import ResumeFeatures  # noqa: E402
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def edits(lines):
+    experience = lines.index("Work Experience")
+    skills = lines.index("Technical Skills")
+
+    def rewrite_bullet(ls):
+        ls[experience + len(ls) // 3] = "Led Kubernetes and Terraform rollout for a team of 6, cutting costs 30%"
+
+    def change_skills(ls):
+        ls[skills + 1] += ", Kafka, Redis"
+
+    def insert_bullet(ls):
+        ls.insert(experience + 2, "Automated release checks with Jenkins, saving 4 hours per week")
+
+    return {"rewrite bullet": rewrite_bullet, "change skills": change_skills, "insert bullet": insert_bullet}
+
+
+def same_features(a, b):
+    return all(getattr(a, name) == getattr(b, name) for name in ResumeFeatures.__slots__) and \
+        list(a.sections) == list(b.sections) and list(a.skill_frequency) == list(b.skill_frequency)
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 10, 40])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    taxonomy = main.TAXONOMY.current
+    version = taxonomy.version
+
+    print(f"{'pages':>5} {'edit':<15} {'full ms':>8} {'incremental ms':>15} {'speedup':>8} "
+          f"{'blocks':>7} {'re-analyzed':>12}  sections")
+    for pages in args.pages:
+        lines = resume_lines(pages, seed=pages)
+        text = "\n".join(lines)
+        _, _, blocks, _, _ = main.process_resume_text(text, (), version)
+
+        for name, edit in edits(lines).items():
+            edited_lines = list(lines)
+            edit(edited_lines)
+            edited = "\n".join(edited_lines)
+
+            full, _ = timed(lambda: main.analyze_document(edited, taxonomy), args.repeat)
+            incremental, result = timed(lambda: main.process_resume_text(edited, blocks, version), args.repeat)
+            features, document_scores, _, changes, _ = result
+
+            expected, expected_scores = main.analyze_document(edited, taxonomy)
+            assert same_features(features, expected), f"{pages} pages, {name}: features differ"
+            assert document_scores == expected_scores, f"{pages} pages, {name}: scores differ"
+
+            print(f"{pages:>5} {name:<15} {full * 1000:>8.2f} {incremental * 1000:>15.2f} "
+                  f"{full / incremental:>7.1f}x {changes['blocks']:>7} {changes['blocks_reanalyzed']:>12}  "
+                  f"{', '.join(changes['sections_reanalyzed'])}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,92 @@
+"""
+Benchmark: job description matching, one JD against N resumes.
+
+Compares scoring all resumes with JobMatcher.match in one call (one sparse
+matrix product) against calling it once per resume, and splits the batched
+time into vectorizing and the product itself. Also checks the sparse scores
+against a dense NumPy computation of the same cosine.
+
+Usage:
+    python benchmarks/bench_jd_match.py [--resumes 1 100 1000 5000]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import resume_lines  # noqa: E402
+from jd_match import JobMatcher  # noqa: E402
+from skill_matcher import SkillMatcher  # noqa: E402
+
+JOB_DESCRIPTION = """
+Senior Backend Engineer. You will design and build REST APIs and microservices in Python and Java,
+run them on Kubernetes and Docker in AWS, and own CI/CD with Jenkins and Terraform. Strong SQL,
+experience with Kafka or Redis, and a track record of improving latency and reliability required.
+"""
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def dense_scores(matcher, resumes):
+    # Same weighting as JobMatcher, but dense; only for small N
+    _, jd_skills = matcher.skill_matcher.match(JOB_DESCRIPTION.lower())
+    jd = matcher.vectorize([(JOB_DESCRIPTION, jd_skills)]).toarray()
+    counts = matcher.vectorize(resumes).toarray()
+    idf = np.log((1.0 + len(resumes)) / (1.0 + (counts > 0).sum(axis=0))) + 1.0
+
+    def weigh(m):
+        w = np.where(m > 0, 1.0 + np.log(np.where(m > 0, m, 1.0)), 0.0)
+        w[:, :matcher.n_skills] *= 3.0
+        w *= idf
+        norms = np.linalg.norm(w, axis=1, keepdims=True)
+        return w / np.where(norms == 0, 1.0, norms)
+
+    return (weigh(counts) @ weigh(jd).T).ravel() * 100
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, nargs="+", default=[1, 100, 1000, 5000])
+    parser.add_argument("--pages", type=int, default=2)
+    args = parser.parse_args()
+
+    skills = [s.lower() for s in json.loads((BASE_DIR / "skills.json").read_text(encoding="utf-8"))]
+    skill_matcher = SkillMatcher(skills)
+    matcher = JobMatcher(skill_matcher)
+
+    texts = ["\n".join(resume_lines(args.pages, seed=i)) for i in range(max(args.resumes))]
+    resumes = [(text, skill_matcher.match(text.lower())[1]) for text in texts]
+
+    small = resumes[:50]
+    expected = dense_scores(matcher, small)
+    got = np.array([r["match_score"] for r in matcher.match(JOB_DESCRIPTION, small)["results"]])
+    print(f"sparse vs dense scores on {len(small)} resumes: max abs diff {np.abs(got - expected).max():.3f}\n")
+
+    print(f"{'resumes':>8} {'batched s':>10} {'vectorize s':>12} {'product ms':>11} {'per-resume s':>13} {'speedup':>8}")
+    for n in args.resumes:
+        batch = resumes[:n]
+        batched, result = timed(lambda: matcher.match(JOB_DESCRIPTION, batch))
+        vectorize, counts = timed(lambda: matcher.vectorize(batch))
+        query = matcher.vectorize([(JOB_DESCRIPTION, {})]).T.tocsc()
+        product, _ = timed(lambda: counts @ query)
+        looped = min(n, 500)
+        per_resume, _ = timed(lambda: [matcher.match(JOB_DESCRIPTION, [r]) for r in batch[:looped]])
+        per_resume *= n / looped
+        best = max(result["results"], key=lambda r: r["match_score"])["match_score"]
+        print(f"{n:>8} {batched:>10.3f} {vectorize:>12.3f} {product * 1000:>11.2f} "
+              f"{per_resume:>13.3f} {per_resume / batched:>7.1f}x   best={best}")
+
+
+if __name__ == "__main__":
+    run()
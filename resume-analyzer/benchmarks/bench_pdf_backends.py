@@ -0,0 +1,92 @@
+"""
+Benchmark: PDF text extraction backends on a locally generated corpus.
+
+For every synthetic resume size and every available backend this reports
+throughput (pages/s) and text parity against the pdfplumber baseline:
+- same: fraction of pages whose text is identical
+- words: word-level similarity of the whole document (difflib ratio)
+- skills: whether the extracted skills and ATS score come out identical
+
+The largest document is also extracted with page-level parallelism: its
+page ranges run as jobs of one process pool, as the service runs them in
+its analysis pool.
+
+Usage:
+    python benchmarks/bench_pdf_backends.py [--pages 1 3 10 30] [--workers 4]
+"""
+import argparse
+import difflib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import resume_pdf  # noqa: E402
+from pdf_extraction import PDF_BACKENDS, extract_pdf_page_range, extract_pdf_pages, split_pages  # noqa: E402
+import main  # noqa: E402
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def extract_parallel(pool, pdf, backend, ranges):
+    futures = [pool.submit(extract_pdf_page_range, pdf, backend, start, end) for start, end in ranges]
+    return [text for future in futures for text in future.result()]
+
+
+def summarize(pages):
+    features, document_scores = main.analyze_document("\n".join(p for p in pages if p))
+    ats_score, _ = main.compute_scores(features, "software engineer", features.experience_summary(""), document_scores)
+    return features.found_skills, ats_score
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 10, 30])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pages':>5} {'backend':<11} {'seconds':>8} {'pages/s':>8} {'same':>6} {'words':>6} {'skills':>7}")
+    for n_pages in args.pages:
+        pdf = resume_pdf(n_pages, seed=n_pages)
+        baseline = None
+        for backend in PDF_BACKENDS:
+            seconds, pages = timed(lambda: extract_pdf_pages(pdf, backend), args.repeat)
+            if baseline is None:
+                baseline = pages
+                baseline_words = "\n".join(pages).split()
+                baseline_summary = summarize(pages)
+            same = sum(a == b for a, b in zip(pages, baseline)) / max(len(baseline), 1)
+            words = difflib.SequenceMatcher(None, baseline_words, "\n".join(pages).split(), autojunk=False).ratio()
+            skills = "yes" if summarize(pages) == baseline_summary else "no"
+            print(f"{n_pages:>5} {backend:<11} {seconds:>8.3f} {len(pages) / seconds:>8.1f} "
+                  f"{same:>6.0%} {words:>6.1%} {skills:>7}")
+
+    n_pages = max(args.pages)
+    pdf = resume_pdf(n_pages, seed=n_pages)
+    print(f"\nparallel page extraction, {n_pages} pages, {args.workers} workers")
+    ranges = split_pages(n_pages, min(args.workers, n_pages))
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(abs, range(args.workers)))  # start the workers, as the service does at warm-up
+        for backend in PDF_BACKENDS:
+            serial, expected = timed(lambda: extract_pdf_pages(pdf, backend), 1)
+            parallel, pages = timed(lambda: extract_parallel(pool, pdf, backend, ranges), 1)
+            print(f"{backend:<11} serial {serial:.3f}s  parallel {parallel:.3f}s  "
+                  f"speedup {serial / parallel:.2f}x  identical={pages == expected}")
+
+
+if __name__ == "__main__":
+    run()
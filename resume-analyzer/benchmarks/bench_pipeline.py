@@ -0,0 +1,212 @@
+"""
+Benchmark and regression check for the resume scoring pipeline.
+
+For a generated corpus of PDF and DOCX resumes (1, 3, 10 and 50 pages by
+default), reports the time (best of --repeat runs, the least noisy
+estimate) and the peak Python memory (tracemalloc, one separate run) of
+each stage:
+
+    extract          text extraction (PDF pages capped at RESUME_PDF_MAX_PAGES)
+    clean            simple_clean
+    sections         extract_sections
+    skills           extract_skills
+    features         the whole ResumeFeatures record (includes sections, skills)
+    scores           compute_document_scores + compute_scores
+    recommendations  generate_recommendations
+
+and the median end-to-end latency of POST /upload-and-analyze through the
+FastAPI app with the in-process TestClient (worker pool included, analysis
+cache cleared before every request).
+
+The results are compared with a stored baseline: a time or memory that grew
+by more than --threshold (and by more than --min-delta-ms / --min-delta-kb,
+so noise on the fastest stages is ignored) is reported as a regression and
+the script exits with status 1. Timings only compare on the same machine,
+so the baseline is not committed (benchmarks/pipeline_baseline.json is
+git-ignored): record one on each machine with --update-baseline before
+checking against it.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--pages 1 3 10 50] [--repeat 5] [--threshold 0.5]
+                                        [--baseline benchmarks/pipeline_baseline.json] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# No SQLite tiers: every request must run the whole pipeline
+os.environ["RESUME_CACHE_DB"] = ""
+os.environ["RESUME_INDEX_DB"] = ""
+
+from corpus import resume_docx, resume_pdf  # noqa: E402
+
+import main  # noqa: E402
+from features import extract_sections, simple_clean  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "pipeline_baseline.json"
+ROLE = "backend developer"
+EXPERIENCE = "3-5"
+MAKERS = {"pdf": resume_pdf, "docx": resume_docx}
+
+
+def stages(file_type, data):
+    """(name, fn) per stage; each fn takes the previous stage's output."""
+    taxonomy = main.TAXONOMY.current
+    state = {}
+
+    def extract(_):
+        if file_type == "pdf":
+            text, _ = main.extract_text_from_pdf_bytes(data)
+            return text
+        return main.extract_text_from_docx_bytes(data)
+
+    def sections(clean_text):
+        extract_sections(clean_text)
+        return clean_text
+
+    def skills(clean_text):
+        main.extract_skills(clean_text)
+        return clean_text
+
+    def features(clean_text):
+        state["features"] = main.extract_features(clean_text, taxonomy)
+        return clean_text
+
+    def scores(_):
+        features = state["features"]
+        document_scores = main.compute_document_scores(features)
+        experience_summary = features.experience_summary(EXPERIENCE)
+        state["detailed"] = main.compute_scores(features, ROLE, experience_summary, document_scores, taxonomy)[1]
+
+    def recommendations(_):
+        main.generate_recommendations(state["detailed"], state["features"], ROLE, taxonomy)
+
+    return [
+        ("extract", extract),
+        ("clean", simple_clean),
+        ("sections", sections),
+        ("skills", skills),
+        ("features", features),
+        ("scores", scores),
+        ("recommendations", recommendations),
+    ]
+
+
+def measure_stages(file_type, data, repeat):
+    """{stage: {"ms": best time, "peak_kb": peak traced memory}}"""
+    results = {}
+    value = None
+    for name, fn in stages(file_type, data):
+        fn(value)  # warm-up
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = fn(value)
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        fn(value)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[name] = {"ms": min(times) * 1000, "peak_kb": peak / 1024}
+        value = output
+    return results
+
+
+def measure_end_to_end(client, file_type, data, repeat):
+    times = []
+    for _ in range(repeat):
+        main.RESUME_CACHE.clear()
+        start = time.perf_counter()
+        response = client.post(
+            "/upload-and-analyze",
+            files={"file": (f"resume.{file_type}", data, "application/octet-stream")},
+            data={"userId": "bench", "role": ROLE, "experience": EXPERIENCE},
+        )
+        times.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    return {"ms": statistics.median(times) * 1000}
+
+
+def compare(results, baseline, threshold, min_delta_ms, min_delta_kb):
+    """Lines describing every regression against the baseline."""
+    regressions = []
+    for case, case_stages in results.items():
+        for name, current in case_stages.items():
+            before = baseline.get(case, {}).get(name)
+            if before is None:
+                continue
+            for metric, floor in (("ms", min_delta_ms), ("peak_kb", min_delta_kb)):
+                if metric not in current or metric not in before:
+                    continue
+                old, new = before[metric], current[metric]
+                if new - old > floor and new > old * (1 + threshold):
+                    regressions.append(
+                        f"{case:<10} {name:<16} {metric:<8} {old:10.2f} -> {new:10.2f} ({(new - old) / old:+.0%})"
+                    )
+    return regressions
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 10, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed relative growth (0.5 = 50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0)
+    parser.add_argument("--min-delta-kb", type=float, default=256.0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    results = {}
+    with TestClient(main.app) as client:
+        # Let the warm-up fork the workers before this thread imports the parsers
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.05)
+
+        print(f"\nPDF backend {main.PDF_BACKEND}, pages capped at {main.PDF_MAX_PAGES or 'none'}, "
+              f"{main.ANALYSIS_POOL.workers} analysis workers, {args.repeat} runs per stage\n")
+        print(f"{'case':<10} {'stage':<16} {'ms':>10} {'peak KB':>10}")
+        for file_type, make in MAKERS.items():
+            for pages in args.pages:
+                case = f"{file_type}-{pages}"
+                data = make(pages, seed=pages)
+                results[case] = measure_stages(file_type, data, args.repeat)
+                results[case]["end_to_end"] = measure_end_to_end(client, file_type, data, args.repeat)
+                for name, result in results[case].items():
+                    peak = f"{result['peak_kb']:10.0f}" if "peak_kb" in result else f"{'-':>10}"
+                    print(f"{case:<10} {name:<16} {result['ms']:10.2f} {peak}")
+                print()
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; record one with --update-baseline")
+        return
+    regressions = compare(
+        results, json.loads(args.baseline.read_text()), args.threshold, args.min_delta_ms, args.min_delta_kb
+    )
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%} against {args.baseline}:")
+        print("\n".join(f"  {line}" for line in regressions))
+        sys.exit(1)
+    print(f"no regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,124 @@
+"""
+Benchmark: /search index over a large synthetic population of resumes.
+
+Fills a ResumeIndex with random documents drawn from skills.json (skill
+popularity is Zipf-like, as in real resumes), then times typical queries
+and compares heap top-K against sorting every match.
+
+Usage:
+    python benchmarks/bench_search.py [--docs 100000] [--k 10]
+"""
+import argparse
+import heapq
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from resume_index import RANK_FIELDS, ResumeIndex  # noqa: E402
+
+SECTIONS = ["summary", "experience", "education", "skills", "projects", "certifications"]
+
+QUERIES = [
+    {"skills": ["python"]},
+    {"skills": ["python", "docker"]},
+    {"skills": ["python", "docker"], "rank_by": "skills_match"},
+    {"skills": ["java", "spring boot"], "sections": ["projects"]},
+    {"any_skills": ["react", "angular", "vue"], "rank_by": "experience_quality"},
+    {"skills": ["kubernetes"], "min_score": 70},
+    {},
+    {"user_id": "user7"},
+    {"user_id": "user7", "skills": ["python"]},
+]
+
+
+def populate(index, n_docs, seed=0):
+    rng = random.Random(seed)
+    skills = json.loads((BASE_DIR / "skills.json").read_text(encoding="utf-8"))
+    skills = [s.lower() for s in skills]
+    # Put the common queried skills at the popular end of the distribution
+    for common in ("python", "docker", "java", "react", "kubernetes", "spring boot", "angular", "vue"):
+        if common in skills:
+            skills.remove(common)
+            skills.insert(rng.randrange(0, 12), common)
+    weights = [1 / (rank + 1) for rank in range(len(skills))]
+
+    start = time.perf_counter()
+    for doc in range(n_docs):
+        found = set(rng.choices(skills, weights, k=rng.randint(5, 25)))
+        scores = {field: rng.randint(0, 25) for field in RANK_FIELDS}
+        scores["ats_score"] = rng.randint(20, 100)
+        index.add(
+            user_id=f"user{doc % 1000}",
+            resume_id=f"{doc:032x}",
+            name=f"Candidate {doc}",
+            role="software engineer",
+            skills=found,
+            sections=rng.sample(SECTIONS, rng.randint(2, len(SECTIONS))),
+            scores=scores,
+        )
+    return time.perf_counter() - start
+
+
+def full_sort(index, query, k):
+    # What a naive implementation does: filter every document, sort all matches
+    rank_by = query.get("rank_by", "ats_score")
+    required = set(query.get("skills", [])) | set(query.get("sections", []))
+    either = set(query.get("any_skills", []))
+    matches = []
+    for doc in index._docs.values():
+        terms = set(doc["skills"]) | set(doc["sections"])
+        if (required <= terms and (not either or either & terms)
+                and doc["scores"]["ats_score"] >= query.get("min_score", 0)
+                and query.get("user_id", doc["user_id"]) == doc["user_id"]):
+            matches.append(doc)
+    matches.sort(key=lambda d: d["scores"][rank_by], reverse=True)
+    return matches[:k]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    index = ResumeIndex(max_documents=args.docs)
+    seconds = populate(index, args.docs)
+    print(f"indexed {args.docs} resumes in {seconds:.2f}s ({args.docs / seconds:,.0f}/s)  {index.stats()}")
+
+    print(f"\n{'query':<70} {'matches':>8} {'index ms':>9} {'scan ms':>8}")
+    for query in QUERIES:
+        result = index.search(k=args.k, **query)
+        fast = timed(lambda: index.search(k=args.k, **query), args.repeat)
+        slow = timed(lambda: full_sort(index, query, args.k), 1)
+        print(f"{json.dumps(query):<70} {result['total_matches']:>8} {fast:>9.2f} {slow:>8.1f}")
+
+    # heap vs sort on the same candidate set
+    column = index._scores["ats_score"]
+    candidates = list(index._docs)
+    heap_ms = timed(lambda: heapq.nlargest(args.k, candidates, key=column.__getitem__), args.repeat)
+    sort_ms = timed(lambda: sorted(candidates, key=column.__getitem__, reverse=True)[:args.k], args.repeat)
+    print(f"\ntop-{args.k} of {len(candidates)}: heap {heap_ms:.2f} ms, full sort {sort_ms:.2f} ms")
+
+    # incremental updates
+    delete_ms = timed(lambda: [index.delete(f"user{d % 1000}", f"{d:032x}") for d in range(1000)], 1)
+    print(f"delete 1000 resumes: {delete_ms:.1f} ms; {index.stats()['documents']} left")
+
+
+if __name__ == "__main__":
+    run()
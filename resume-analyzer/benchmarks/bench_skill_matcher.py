@@ -0,0 +1,117 @@
+"""
+Benchmark: how skill matching time grows with the size of the skills DB.
+
+Compares the original per-skill regex loop against the compiled SkillMatcher
+on a synthetic resume, growing the dictionary from the real skills.json up to
+tens of thousands of generated entries.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py [--sizes 100 1000 10000 50000] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import re
+import string
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from skill_matcher import SkillMatcher  # noqa: E402
+
+
+# The pre-SkillMatcher implementation, kept here as the reference point
+def legacy_extract_skills(text, skills_db):
+    found_skills = set()
+    skill_frequency = Counter()
+
+    words = re.findall(r'\b\w+(?:\.\w+)?\b', text.lower())
+    text_with_spaces = ' ' + text.lower() + ' '
+
+    for skill in skills_db:
+        if ' ' in skill or '.' in skill:
+            pattern = r'\b' + re.escape(skill) + r'\b'
+            matches = re.findall(pattern, text_with_spaces)
+            if matches:
+                found_skills.add(skill)
+                skill_frequency[skill] = len(matches)
+        else:
+            if skill in words:
+                found_skills.add(skill)
+                skill_frequency[skill] = words.count(skill)
+
+    return sorted(list(found_skills)), dict(skill_frequency)
+
+
+def build_skills_db(size, rng):
+    with open(BASE_DIR / "skills.json", "r", encoding="utf-8") as f:
+        skills = [s.lower() for s in json.load(f)]
+
+    seen = set(skills)
+    while len(skills) < size:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+        roll = rng.random()
+        if roll < 0.3:
+            word += ' ' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+        elif roll < 0.4:
+            word += '.js'
+        if word not in seen:
+            seen.add(word)
+            skills.append(word)
+    return skills[:size]
+
+
+def build_resume(skills_db, words, rng):
+    filler = ["worked", "on", "the", "team", "with", "and", "delivered", "project", "using", "2021"]
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(skills_db) if rng.random() < 0.1 else rng.choice(filler))
+    return ' '.join(out)
+
+
+def time_it(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--words", type=int, default=800, help="words in the synthetic resume")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="skip the legacy loop above this DB size (it gets very slow)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'skills':>8} {'build ms':>10} {'matcher ms':>11} {'legacy ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        skills_db = build_skills_db(size, rng)
+        text = build_resume(skills_db, args.words, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills_db)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        matcher_ms = time_it(lambda: matcher.match(text.lower()), args.repeat)
+
+        if size <= args.legacy_max:
+            expected = legacy_extract_skills(text, skills_db)
+            if matcher.match(text.lower()) != expected:
+                raise SystemExit(f"Mismatch against legacy output at size {size}")
+            legacy_ms = time_it(lambda: legacy_extract_skills(text, skills_db), args.repeat)
+            print(f"{size:>8} {build_ms:>10.2f} {matcher_ms:>11.3f} {legacy_ms:>10.2f} {legacy_ms / matcher_ms:>7.1f}x")
+        else:
+            print(f"{size:>8} {build_ms:>10.2f} {matcher_ms:>11.3f} {'-':>10} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
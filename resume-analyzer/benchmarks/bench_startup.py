@@ -0,0 +1,197 @@
+"""
+Benchmark: resume-analyzer startup.
+
+- `python -X importtime -c "import main"`: total import time and the
+  heaviest modules, and which parsers/libraries are deferred to first use
+- a uvicorn server started from scratch: time from process start to the
+  first 200 from /health (liveness) and from /ready (parsers imported,
+  worker processes started)
+- the taxonomy: compiled from JSON vs loaded from the pickled artifact, for
+  the real taxonomy and a synthetic one with --skills entries
+
+Every number is the median of --runs fresh processes. --save writes them to
+a JSON file and --baseline prints the change against such a file.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--skills 20000] [--save startup.json] [--baseline startup.json]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+# Imported by main before this change; now loaded on first use or by the warm-up
+DEFERRED = ["pdfplumber", "pdfminer", "docx", "numpy", "scipy", "httpx", "uvicorn"]
+
+
+def import_times():
+    """{module: (self us, cumulative us)} from one `-X importtime` run of `import main`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if not parts[0].strip().isdigit():
+            continue  # header line
+        times[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    return times
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get_status(port, path):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+    try:
+        conn.request("GET", path)
+        return conn.getresponse().status
+    except OSError:
+        return None
+    finally:
+        conn.close()
+
+
+def server_start(cache_dir):
+    """Seconds from Popen to the first 200 on /health, then on /ready."""
+    port = free_port()
+    env = dict(os.environ, RESUME_TAXONOMY_CACHE_DIR=str(cache_dir))
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    try:
+        times = {}
+        deadline = start + 60
+        for path in ("/health", "/ready"):
+            while get_status(port, path) != 200:
+                if time.perf_counter() > deadline or server.poll() is not None:
+                    raise SystemExit(f"server never answered {path} with 200")
+                time.sleep(0.002)
+            times[path] = time.perf_counter() - start
+        return times
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def synthetic_taxonomy(directory, n_skills):
+    rng = random.Random(0)
+    taxonomy = json.loads((BASE_DIR / "taxonomy.json").read_text(encoding="utf-8"))
+    skills = json.loads((BASE_DIR / taxonomy.get("skills_file", "skills.json")).read_text(encoding="utf-8"))
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    while len(skills) < n_skills:
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        skills.append(rng.choice([" ", ".", " "]).join(words))
+    taxonomy["skills_file"] = "skills.json"
+    (directory / "skills.json").write_text(json.dumps(skills), encoding="utf-8")
+    (directory / "taxonomy.json").write_text(json.dumps(taxonomy), encoding="utf-8")
+    return directory / "taxonomy.json"
+
+
+def taxonomy_load_seconds(path, cache_dir, runs):
+    # A fresh process per load, so nothing is already compiled or cached
+    code = (
+        "import sys, time; from pathlib import Path; sys.path.insert(0, sys.argv[1]); "
+        "from taxonomy import load_taxonomy; cache = Path(sys.argv[3]) if sys.argv[3] else None; "
+        "start = time.perf_counter(); t, _ = load_taxonomy(Path(sys.argv[2]), cache); "
+        "print(time.perf_counter() - start, t.source)"
+    )
+
+    def load(cache):
+        out = subprocess.run(
+            [sys.executable, "-c", code, str(BASE_DIR), str(path), str(cache or "")],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        return float(out[0]), out[1]
+
+    load(cache_dir)  # writes the artifact
+    built = statistics.median(load(None)[0] for _ in range(runs))
+    loaded = [load(cache_dir) for _ in range(runs)]
+    assert all(source == "artifact" for _, source in loaded)
+    return built, statistics.median(seconds for seconds, _ in loaded)
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skills", type=int, default=20000, help="skills in the synthetic taxonomy")
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports to list")
+    parser.add_argument("--save", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against results saved with --save")
+    args = parser.parse_args()
+
+    results = {}
+    runs = [import_times() for _ in range(args.runs)]
+    total = statistics.median(r["main"][1] for r in runs)
+    results["import_main_ms"] = total / 1000
+    print(f"import main: {total / 1000:.1f} ms (median of {args.runs}, -X importtime)")
+
+    last = runs[-1]
+    heaviest = sorted(((cumulative, name) for name, (_, cumulative) in last.items()), reverse=True)
+    top_level = [(c, n) for c, n in heaviest if "." not in n and n != "main"]
+    print(f"\nheaviest top-level imports (cumulative ms)")
+    for cumulative, name in top_level[:args.top]:
+        print(f"  {name:<24} {cumulative / 1000:8.1f}")
+    print("\ndeferred to first use / warm-up:")
+    for name in DEFERRED:
+        print(f"  {name:<24} {'imported at startup!' if name in last else 'not imported'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        starts = [server_start(tmp / "cache") for _ in range(args.runs)]
+        for path in ("/health", "/ready"):
+            seconds = statistics.median(s[path] for s in starts)
+            results[f"first_{path.strip('/')}_ms"] = seconds * 1000
+        print(f"\nuvicorn from process start (median of {args.runs}):")
+        print(f"  first 200 /health  {results['first_health_ms']:8.1f} ms")
+        print(f"  first 200 /ready   {results['first_ready_ms']:8.1f} ms")
+
+        print("\ntaxonomy load in a fresh process:  JSON compile  vs  pickled artifact")
+        synthetic_dir = tmp / "synthetic"
+        synthetic_dir.mkdir()
+        for label, path in (
+            ("taxonomy.json", BASE_DIR / "taxonomy.json"),
+            (f"{args.skills} skills", synthetic_taxonomy(synthetic_dir, args.skills)),
+        ):
+            cache_dir = tmp / f"cache-{label}"
+            built, loaded = taxonomy_load_seconds(path, cache_dir, args.runs)
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            key = "taxonomy" if path.parent == BASE_DIR else "taxonomy_synthetic"
+            results[f"{key}_json_ms"] = built * 1000
+            results[f"{key}_artifact_ms"] = loaded * 1000
+            print(f"  {label:<16} {built * 1000:10.1f} ms  {loaded * 1000:10.1f} ms  ({built / loaded:.1f}x)")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        print(f"\nvs {args.baseline}:")
+        for key, value in results.items():
+            if key in baseline:
+                before = baseline[key]
+                print(f"  {key:<28} {before:9.1f} -> {value:9.1f} ms  ({(value - before) / before:+.0%})")
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+        print(f"\nsaved to {args.save}")
+
+
+if __name__ == "__main__":
+    run()
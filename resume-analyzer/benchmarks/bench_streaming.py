@@ -0,0 +1,109 @@
+"""
+Benchmark: peak memory of PDF analysis, whole-document vs streaming mode.
+
+For generated PDFs of several page counts (no page cap), analyzes the
+document the way the service does below RESUME_PDF_STREAM_MIN_BYTES (all
+page texts in a list, joined, cleaned, then ResumeFeatures) and in
+streaming mode (iter_pdf_pages -> stream_features), each in a fresh
+process, and reports:
+
+- peak RSS growth over the process before the analysis (ru_maxrss), after
+  a one-page warm-up parse
+- peak traced Python memory (tracemalloc, a separate run: it slows the parse)
+- wall time
+
+Both modes must produce the same feature record.
+
+Usage:
+    python benchmarks/bench_streaming.py [--pages 25 100 250] [--backend pdfplumber]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def analyze(mode, pdf, backend):
+    import main
+    from features import stream_features
+    from pdf_extraction import extract_pdf_pages, iter_pdf_pages
+
+    taxonomy = main.TAXONOMY.current
+    if mode == "stream":
+        features = stream_features(iter_pdf_pages(pdf, backend), taxonomy.skill_matcher, taxonomy.verbs)
+        return features, main.compute_document_scores(features)
+    text = "\n".join(page for page in extract_pdf_pages(pdf, backend) if page)
+    return main.analyze_document(text, taxonomy)
+
+
+def child(mode, pages, backend, traced):
+    """Runs in a fresh process; prints its measurements as JSON."""
+    import resource
+    import tracemalloc
+
+    from corpus import resume_pdf
+    import pdf_extraction
+
+    pdf = resume_pdf(pages, seed=pages)
+    # Parse a one-page document first: fonts, CMaps and lazy imports are a
+    # fixed cost of the first parse, not of the document size
+    pdf_extraction.warm_up(backend)
+    analyze(mode, resume_pdf(1), backend)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    features, scores = analyze(mode, pdf, backend)
+    seconds = time.perf_counter() - start
+    result = {
+        "seconds": seconds,
+        "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before,
+        "pdf_kb": len(pdf) / 1024,
+        "text_kb": len(features.text) / 1024,
+        "digest": repr((sorted(features.skill_frequency.items()), features.word_count,
+                        sorted(features.sections.items()), features.experience_years, scores)),
+    }
+    if traced:
+        result["traced_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+    print(json.dumps(result))
+
+
+def measure(mode, pages, backend, traced=False):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, str(pages), backend, "1" if traced else "0"],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]), sys.argv[4], sys.argv[5] == "1")
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[25, 100, 250])
+    parser.add_argument("--backend", default="pdfplumber")
+    args = parser.parse_args()
+
+    print(f"{'pages':>5} {'pdf KB':>8} {'text KB':>8} {'mode':<8} {'seconds':>8} "
+          f"{'peak RSS +KB':>13} {'traced KB':>10}")
+    for pages in args.pages:
+        digests = set()
+        for mode in ("list", "stream"):
+            result = measure(mode, pages, args.backend)
+            traced = measure(mode, pages, args.backend, traced=True)
+            digests.add(result["digest"])
+            print(f"{pages:>5} {result['pdf_kb']:8.0f} {result['text_kb']:8.0f} {mode:<8} "
+                  f"{result['seconds']:8.2f} {result['rss_kb']:13.0f} {traced['traced_kb']:10.0f}")
+        assert len(digests) == 1, f"{pages} pages: streaming result differs"
+
+
+if __name__ == "__main__":
+    run()
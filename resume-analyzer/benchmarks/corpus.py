@@ -0,0 +1,129 @@
+"""
+Synthetic resume corpus for the benchmarks.
+
+Everything is generated locally and deterministically from a seed: PDFs are
+written by hand (standard Helvetica font, one text stream per page) so no
+PDF-writing library is needed; DOCX files use python-docx, which the service
+already depends on.
+"""
+import io
+import random
+from typing import List
+
+LINES_PER_PAGE = 50
+
+SKILLS = [
+    "Python", "Java", "Docker", "Kubernetes", "React", "Node.js", "SQL", "AWS", "Git",
+    "Machine Learning", "TensorFlow", "REST API", "Excel", "Tableau", "Power BI",
+    "Next.js", "Linux", "Terraform", "Pandas", "Microservices",
+]
+VERBS = [
+    "Developed", "Implemented", "Led", "Optimized", "Reduced", "Increased", "Built",
+    "Designed", "Automated", "Achieved", "Improved", "Scaled", "Delivered", "Managed",
+]
+
+
+def resume_lines(pages: int, seed: int = 0) -> List[str]:
+    """Lines of a plausible resume that fills roughly `pages` pages."""
+    rng = random.Random(seed)
+    lines = [
+        "Jane Doe",
+        "jane.doe@example.com | +1 (555) 123-4567 | linkedin.com/in/janedoe | github.com/jdoe",
+        "",
+        "Professional Summary",
+        "Backend engineer with 6+ years of experience building APIs and data platforms.",
+        "",
+        "Technical Skills",
+        ", ".join(rng.sample(SKILLS, 12)),
+        "",
+        "Work Experience",
+    ]
+    tail = [
+        "",
+        "Projects",
+        "Built a dashboard with React and Node.js that reduced report time by 40%",
+        "",
+        "Education",
+        "Bachelor of Technology, Computer Science, 2018, GPA 8.5, coursework in algorithms",
+        "",
+        "Certifications",
+        "AWS Certified Solutions Architect",
+        "",
+        "Achievements",
+        "Won the 2020 company hackathon award",
+    ]
+    bullets = max(1, pages * LINES_PER_PAGE - len(lines) - len(tail))
+    for i in range(bullets):
+        if i % 8 == 0:
+            lines.append(f"Company {i // 8 + 1} 20{rng.randint(10, 19)} - present")
+        else:
+            lines.append(
+                f"{rng.choice(VERBS)} {rng.choice(SKILLS)} services for a team of {rng.randint(2, 12)}, "
+                f"cutting latency {rng.randint(5, 80)}% and saving ${rng.randint(1, 99)}k in {rng.randint(1, 9)} months"
+            )
+    return lines + tail
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(lines: List[str], lines_per_page: int = LINES_PER_PAGE) -> bytes:
+    """Minimal multi-page PDF with one text line per resume line."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = []  # object bodies, numbered from 1
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(b"")  # pages tree, filled in below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    page_ids = []
+    for page in pages:
+        stream = ["BT", "/F1 9 Tf", "11 TL", "40 760 Td"]
+        for line in page:
+            stream.append(f"({_pdf_escape(line[:120])}) '")
+        stream.append("ET")
+        data = "\n".join(stream).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(lines: List[str]) -> bytes:
+    import docx
+
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def resume_pdf(pages: int, seed: int = 0) -> bytes:
+    return make_pdf(resume_lines(pages, seed))
+
+
+def resume_docx(pages: int, seed: int = 0) -> bytes:
+    return make_docx(resume_lines(pages, seed))
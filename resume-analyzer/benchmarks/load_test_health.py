@@ -0,0 +1,124 @@
+"""
+Load test: /health latency while large PDFs are being parsed.
+
+Starts the API with uvicorn in a subprocess, measures /health latency on an
+idle server, then again while several clients keep uploading large synthetic
+PDFs to /upload-and-analyze. Every upload uses a fresh seed so the analysis
+cache never short-circuits the parse.
+
+Usage:
+    python benchmarks/load_test_health.py [--pages 40] [--clients 4] [--seconds 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import resume_pdf  # noqa: E402
+
+
+def wait_for_server(url, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(url + "/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("server did not start")
+
+
+def probe_health(url, seconds, interval=0.05):
+    latencies = []
+    deadline = time.time() + seconds
+    with requests.Session() as session:
+        while time.time() < deadline:
+            start = time.perf_counter()
+            session.get(url + "/health", timeout=60)
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(interval)
+    return latencies
+
+
+def upload_loop(url, pages, stop, seed_source, results):
+    with requests.Session() as session:
+        while not stop.is_set():
+            seed = next(seed_source)
+            pdf = resume_pdf(pages, seed=seed)
+            start = time.perf_counter()
+            resp = session.post(
+                url + "/upload-and-analyze",
+                files={"file": (f"resume_{seed}.pdf", pdf, "application/pdf")},
+                data={"userId": "load-test", "role": "software engineer"},
+                timeout=600,
+            )
+            results.append((resp.status_code, time.perf_counter() - start))
+
+
+def summarize(name, latencies):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{name:<22} n={len(ordered):<5} p50={statistics.median(ordered):8.2f} ms  "
+          f"p99={p99:8.2f} ms  max={ordered[-1]:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40, help="pages per uploaded PDF")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent uploading clients")
+    parser.add_argument("--seconds", type=float, default=20, help="duration of each phase")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=0, help="RESUME_ANALYSIS_WORKERS (0 = cores)")
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, RESUME_ANALYSIS_WORKERS=str(args.workers))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env,
+    )
+    try:
+        wait_for_server(url)
+        idle = probe_health(url, args.seconds)
+
+        stop = threading.Event()
+        seeds = iter(range(1_000_000))
+        uploads = []
+        clients = [
+            threading.Thread(target=upload_loop, args=(url, args.pages, stop, seeds, uploads), daemon=True)
+            for _ in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        time.sleep(1.0)  # let the first uploads reach the parser
+        loaded = probe_health(url, args.seconds)
+        stop.set()
+        for client in clients:
+            client.join()
+
+        print(f"{args.clients} clients uploading {args.pages}-page PDFs")
+        summarize("/health idle", idle)
+        summarize("/health under load", loaded)
+        statuses = {}
+        for status, _ in uploads:
+            statuses[status] = statuses.get(status, 0) + 1
+        ok = [seconds for status, seconds in uploads if status == 200]
+        print(f"uploads: {statuses}" + (f", mean {statistics.mean(ok):.2f} s per 200" if ok else ""))
+        print(requests.get(url + "/health").json().get("workers"))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class DownloadError(Exception):
+    """The resume could not be downloaded (network error, bad status or too large)."""
+
+
+class ResumeDownloader:
+    """
+    Async resume downloads over one shared, keep-alive connection pool.
+
+    - at most `max_concurrency` downloads run at once; the rest wait
+    - the body is streamed and abandoned as soon as it exceeds `max_bytes`
+      (a larger Content-Length is refused before reading anything)
+    - responses with an ETag or Last-Modified are kept in an LRU capped at
+      `cache_max_bytes`; fetching the same URL again sends a conditional
+      request and a 304 is served from the cache
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_concurrency: int = 16,
+        max_connections: int = 32,
+        timeout: float = 30.0,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache_max_bytes = cache_max_bytes
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._headers = headers or {}
+
+        # Connections and the semaphore belong to one event loop; both are
+        # (re)created on first use in a loop. httpx itself is imported then too,
+        # keeping it out of process startup
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._cache: "OrderedDict[str, Tuple[Dict[str, str], bytes]]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"downloads": 0, "not_modified": 0, "rejected_too_large": 0, "errors": 0, "in_flight": 0}
+
+    async def fetch(self, url: str) -> bytes:
+        import httpx
+
+        client, semaphore = self._bind()
+        async with semaphore:
+            with self._lock:
+                self._stats["in_flight"] += 1
+            try:
+                return await self._fetch(client, url)
+            except httpx.HTTPError as e:
+                self._count("errors")
+                raise DownloadError(str(e) or type(e).__name__)
+            finally:
+                with self._lock:
+                    self._stats["in_flight"] -= 1
+
+    async def _fetch(self, client: "httpx.AsyncClient", url: str) -> bytes:
+        with self._lock:
+            cached = self._cache.get(url)
+        headers = {}
+        if cached is not None:
+            validators, _ = cached
+            if "etag" in validators:
+                headers["If-None-Match"] = validators["etag"]
+            if "last-modified" in validators:
+                headers["If-Modified-Since"] = validators["last-modified"]
+
+        async with client.stream("GET", url, headers=headers) as resp:
+            if resp.status_code == 304 and cached is not None:
+                self._count("not_modified")
+                with self._lock:
+                    if url in self._cache:
+                        self._cache.move_to_end(url)
+                return cached[1]
+
+            resp.raise_for_status()
+            declared = resp.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                self._too_large()
+
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body += chunk
+                if len(body) > self.max_bytes:
+                    self._too_large()
+
+            content = bytes(body)
+            validators = {k: resp.headers[k] for k in ("etag", "last-modified") if k in resp.headers}
+
+        self._count("downloads")
+        if validators:
+            self._remember(url, validators, content)
+        return content
+
+    def _too_large(self):
+        self._count("rejected_too_large")
+        raise DownloadError(f"File too large. Maximum size is {self.max_bytes // (1024 * 1024)}MB")
+
+    def _remember(self, url: str, validators: Dict[str, str], content: bytes):
+        if len(content) > self.cache_max_bytes:
+            return
+        with self._lock:
+            previous = self._cache.pop(url, None)
+            if previous is not None:
+                self._cache_bytes -= len(previous[1])
+            self._cache[url] = (validators, content)
+            self._cache_bytes += len(content)
+            while self._cache_bytes > self.cache_max_bytes:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _bind(self) -> Tuple["httpx.AsyncClient", asyncio.Semaphore]:
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 10.0)),
+                headers=self._headers,
+                follow_redirects=True,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "max_concurrency": self.max_concurrency,
+                "cached_urls": len(self._cache),
+                "cached_bytes": self._cache_bytes,
+            }
+
+    async def aclose(self):
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._semaphore = None
+        self._loop = None
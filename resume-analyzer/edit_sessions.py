@@ -0,0 +1,69 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from features import BlockFeatures
+
+
+class EditSession:
+    """Block features of one analyzed text, kept for the next edit of it."""
+
+    __slots__ = ("user_id", "taxonomy_version", "blocks", "created")
+
+    def __init__(self, user_id: str, taxonomy_version: str, blocks: Sequence[BlockFeatures]):
+        self.user_id = user_id
+        self.taxonomy_version = taxonomy_version
+        self.blocks: Tuple[BlockFeatures, ...] = tuple(blocks)
+        self.created = time.monotonic()
+
+
+class EditSessions:
+    """
+    Recent /analyze-text results by analysis id, so that re-submitting an
+    edited resume only re-analyzes the blocks that changed.
+
+    - an id is only found for the user it was issued to
+    - LRU capped at `max_entries`; entries expire after `ttl_seconds`
+    - every analysis gets a new id, so earlier versions stay reachable
+      (e.g. after an undo) until they age out
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 1800):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, EditSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def put(self, user_id: str, taxonomy_version: str, blocks: Sequence[BlockFeatures]) -> str:
+        analysis_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries[analysis_id] = EditSession(user_id, taxonomy_version, blocks)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return analysis_id
+
+    def get(self, user_id: str, analysis_id: str) -> Optional[EditSession]:
+        with self._lock:
+            session = self._entries.get(analysis_id)
+            if session is None or session.user_id != user_id:
+                self._stats["misses"] += 1
+                return None
+            if time.monotonic() - session.created > self.ttl_seconds:
+                del self._entries[analysis_id]
+                self._stats["expired"] += 1
+                return None
+            self._entries.move_to_end(analysis_id)
+            self._stats["hits"] += 1
+            return session
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self.max_entries}
@@ -0,0 +1,638 @@
+import re
+import zlib
+from datetime import datetime
+from typing import FrozenSet, Iterable, Iterator, Optional, Dict, List, Sequence, Tuple
+
+from metrics import stage
+from skill_matcher import SkillMatcher
+
+# ---------- Compiled patterns ----------
+# Everything is compiled once at import. Alternatives are merged into a single
+# pattern wherever that keeps the old per-pattern results intact and is faster.
+
+# Runs of two or more: rewriting every single space as itself dominated cleaning
+SPACES_RE = re.compile(r' {2,}')
+BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+# Contact info kinds are independent yes/no checks. A merged alternation was
+# measurably slower than five early-exit searches, so they stay separate.
+CONTACT_PATTERNS = {
+    "email": re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'),
+    # phone pattern supports 10-digit (India) and US-style numbers
+    "phone": re.compile(r'(\+?\d{1,3}[-.\s]?)?(\d{10}|\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'),
+    "linkedin": re.compile(r'linkedin\.com/in/[\w-]+', re.I),
+    "github": re.compile(r'github\.com/[\w-]+', re.I),
+    "portfolio": re.compile(r'(portfolio|website|http)', re.I),
+}
+
+# Section headers, in priority order. The lookahead alternation tries each
+# section against the whole line in turn, so the first section in this order
+# wins exactly as when the patterns were searched one by one.
+SECTION_PATTERNS = {
+    "summary": r'\b(summary|profile|objective|about\s+me|professional\s+summary)\b',
+    "skills": r'\b(skills|technical\s+skills|core\s+skills|competencies|expertise)\b',
+    "experience": r'\b(experience|work\s+experience|employment|professional\s+experience)\b',
+    "education": r'\b(education|academic|qualifications|degrees)\b',
+    "projects": r'\b(projects|portfolio|work\s+samples)\b',
+    "certifications": r'\b(certifications?|licenses?|credentials)\b',
+    "achievements": r'\b(achievements?|awards?|honors?|accomplishments?)\b'
+}
+# Any header keyword at all; most lines have none and skip SECTION_RE
+SECTION_KEYWORD_RE = re.compile('|'.join(SECTION_PATTERNS.values()), re.I)
+SECTION_RE = re.compile(
+    '|'.join(
+        rf'(?=.*?(?P<{name}>{pattern}))'
+        for name, pattern in SECTION_PATTERNS.items()
+    ),
+    re.I
+)
+MAX_HEADER_LENGTH = 50
+
+USER_YEARS_RE = re.compile(r'(\d+(\.\d+)?)')
+YEAR_RANGE_RE = re.compile(r'(20\d{2})\s*[-–—to]+\s*(20\d{2}|present|current)', re.I)
+EXPLICIT_YEARS_RE = re.compile(r'(\d+)\+?\s*years?', re.I)
+
+
+def _prefix_alternation(words: List[str]) -> str:
+    """Group words by first letter so the regex engine rejects most positions on one char."""
+    groups: Dict[str, List[str]] = {}
+    for word in words:
+        groups.setdefault(word[0], []).append(re.escape(word[1:]))
+    return '(?:' + '|'.join(
+        re.escape(first) + '(?:' + '|'.join(rest) + ')' for first, rest in groups.items()
+    ) + ')'
+
+
+class ActionVerbMatcher:
+    """
+    Action verbs compiled for counting (the list comes from the taxonomy).
+
+    One pass finds every word that starts with any verb; only those words
+    are then checked against the individual verbs.
+    """
+
+    def __init__(self, verbs: List[str]):
+        self.verbs = tuple(verbs)
+        self.any_verb_re = re.compile(r'\b' + _prefix_alternation(verbs) + r'\w*\b', re.I)
+        self.prefixes = [(verb, re.compile(re.escape(verb), re.I)) for verb in verbs]
+
+
+# Metric kinds are counted independently (a '30%' is both a percentage and a
+# number), so they stay separate patterns.
+METRICS_PATTERNS = {
+    "percentage": re.compile(r'\d+%', re.I),
+    "money": re.compile(r'\$\d+[kmb]?', re.I),
+    "numbers": re.compile(r'\b\d+\+?\b', re.I),
+    "time_saved": re.compile(r'\d+\s*(?:hours?|days?|weeks?|months?)', re.I),
+    "team_size": re.compile(r'team\s+of\s+\d+', re.I),
+}
+
+BOX_DRAWING_RE = re.compile(r'[│┤┼╪╫╬═║]')
+
+
+# ---------- Extractors ----------
+
+# Enhanced cleaning
+def simple_clean(text: str) -> str:
+    # Tabs become spaces and space runs collapse, so tab runs need no pass of their own
+    text = SPACES_RE.sub(' ', text.replace('\t', ' '))
+    text = BLANK_LINES_RE.sub('\n\n', text)
+    return text.strip().lower()
+
+
+# simple_clean('\n'.join(non-empty pages)), one line at a time. Runs of blank
+# lines become one empty line and the ends are stripped, as above; the last
+# non-blank line is held back until the next one shows it isn't the last.
+def clean_lines(pages: Iterable[str]) -> Iterator[str]:
+    pending: Optional[str] = None
+    blank = False
+    for page in pages:
+        if not page:
+            continue
+        for line in page.split('\n'):
+            line = SPACES_RE.sub(' ', line.replace('\t', ' '))
+            if not line or line.isspace():
+                blank = True
+                continue
+            if pending is None:
+                line = line.lstrip()
+            else:
+                yield pending.lower()
+                if blank:
+                    yield ''
+            pending = line
+            blank = False
+    if pending is not None:
+        yield pending.rstrip().lower()
+
+
+# Extract contact information
+def extract_contact_info(text: str) -> Dict[str, bool]:
+    return {kind: bool(pattern.search(text)) for kind, pattern in CONTACT_PATTERNS.items()}
+
+
+# Section a header line opens, or None for an ordinary line (expects a stripped line)
+def section_header(line: str) -> Optional[str]:
+    if len(line) < MAX_HEADER_LENGTH and SECTION_KEYWORD_RE.search(line):
+        match = SECTION_RE.match(line)
+        if match:
+            return match.lastgroup
+    return None
+
+
+# Enhanced section detection
+def extract_sections(text: str) -> Dict[str, str]:
+    lines = text.split('\n')
+    sections = {}
+    current_section = "header"
+    current_content = []
+
+    for line in lines:
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+
+        section = section_header(line_stripped)
+        if section is not None:
+            if current_content:
+                sections[current_section] = '\n'.join(current_content)
+            current_section = section
+            current_content = []
+        else:
+            current_content.append(line_stripped)
+
+    if current_content:
+        sections[current_section] = '\n'.join(current_content)
+
+    return sections
+
+
+# Parse user entered experience years safely
+def parse_user_experience_years(user_exp: str) -> Optional[float]:
+    """
+    Convert user input like 'Fresher', '0-1 years', '2 yrs', '1.5' into a float.
+    Returns None if it can't be parsed.
+    """
+    if not user_exp:
+        return None
+
+    user_exp = user_exp.strip().lower()
+    if user_exp in {"fresher", "freshers"}:
+        return 0.0
+
+    # pick first number (supports decimals)
+    match = USER_YEARS_RE.search(user_exp)
+    if match:
+        try:
+            return float(match.group(1))
+        except ValueError:
+            return None
+
+    return None
+
+
+# Measure experience years and detail from the experience section alone
+def measure_experience(exp_text: str) -> Tuple[int, str]:
+    total_years = 0
+    current_year = datetime.now().year
+    for start, end in YEAR_RANGE_RE.findall(exp_text):
+        start_year = int(start)
+        end_year = current_year if end.lower() in ['present', 'current'] else int(end)
+        total_years += max(0, end_year - start_year)
+
+    # Cheap substring check first: the regex backtracks at every number
+    explicit_years = EXPLICIT_YEARS_RE.search(exp_text) if 'year' in exp_text.lower() else None
+    if explicit_years:
+        total_years = max(total_years, int(explicit_years.group(1)))
+
+    detail_level = "low"
+    if exp_text.count('\n') >= 5:
+        detail_level = "high"
+    elif len(exp_text) > 100:
+        detail_level = "medium"
+
+    return total_years, detail_level
+
+
+# Compare measured experience with what the user entered
+def summarize_experience(total_years: int, detail_level: str, user_exp: str) -> Dict:
+    parsed_user_years = parse_user_experience_years(user_exp)
+    if parsed_user_years is not None:
+        consistent = abs(total_years - parsed_user_years) <= 1
+    else:
+        # if user didn't specify or it's unparseable, don't penalize
+        consistent = True
+
+    return {
+        "years_found": total_years,
+        "user_years": parsed_user_years,
+        "consistent": consistent,
+        "detail_level": detail_level
+    }
+
+
+# Analyze experience years and details
+def analyze_experience(exp_text: str, user_exp: str) -> Dict:
+    return summarize_experience(*measure_experience(exp_text), user_exp)
+
+
+# Words of the text that start with an action verb
+def find_verb_words(text: str, verbs: ActionVerbMatcher) -> FrozenSet[str]:
+    return frozenset(match.group() for match in verbs.any_verb_re.finditer(text))
+
+
+# Action verbs used by any of the words, in verb list order
+def match_verb_words(words: Iterable[str], verbs: ActionVerbMatcher) -> Tuple[int, List[str]]:
+    found_verbs = [
+        verb for verb, prefix in verbs.prefixes
+        if any(prefix.match(word) for word in words)
+    ]
+    return len(found_verbs), found_verbs
+
+
+# Count action verbs
+def count_action_verbs(text: str, verbs: ActionVerbMatcher) -> Tuple[int, List[str]]:
+    return match_verb_words(find_verb_words(text, verbs), verbs)
+
+
+def count_metrics(text: str) -> Dict[str, int]:
+    return {
+        metric_type: len(pattern.findall(text))
+        for metric_type, pattern in METRICS_PATTERNS.items()
+    }
+
+
+# Analyze achievements and quantification
+def analyze_achievements(text: str) -> Dict:
+    return summarize_achievements(count_metrics(text))
+
+
+def summarize_achievements(metrics_found: Dict[str, int]) -> Dict:
+    total_metrics = sum(metrics_found.values())
+
+    return {
+        "total_quantified": total_metrics,
+        "metrics_breakdown": metrics_found,
+        "has_impact": total_metrics > 3
+    }
+
+
+# Check ATS optimization
+def check_ats_optimization(text: str, sections: Dict) -> Dict:
+    return summarize_ats_checks(bool(BOX_DRAWING_RE.search(text)), '@' in text, sections, len(text.split()))
+
+
+def summarize_ats_checks(has_box_drawing: bool, has_at: bool, sections: Dict, word_count: int) -> Dict:
+    ats_score = {}
+    ats_score["simple_formatting"] = not has_box_drawing
+    ats_score["no_images_text"] = True  # assumption for text-only parsing
+    ats_score["standard_sections"] = len(set(sections.keys()) & {"experience", "education", "skills"}) == 3
+    ats_score["contact_info"] = has_at
+    ats_score["appropriate_length"] = 300 < word_count < 1500
+    return ats_score
+
+
+# ---------- Per-document feature record ----------
+
+class ResumeFeatures:
+    """
+    Every role-independent signal of one cleaned resume, computed once.
+
+    Built a single time per document and shared by compute_scores,
+    generate_recommendations and the response builder. Attributes are
+    read-only; the dicts and tuples they hold must be treated the same way.
+    """
+
+    __slots__ = (
+        "text",
+        "word_count",
+        "sections",
+        "found_skills",
+        "skill_frequency",
+        "contact_info",
+        "achievements",
+        "ats_checks",
+        "action_verb_count",
+        "found_verbs",
+        "experience_text",
+        "experience_years",
+        "experience_detail",
+        "experience_action_count",
+    )
+
+    def __init__(self, text: str, skill_matcher: SkillMatcher, verbs: ActionVerbMatcher):
+        with stage("sections"):
+            sections = extract_sections(text)
+        with stage("skills"):
+            found_skills, skill_frequency = skill_matcher.match(text.lower())
+        with stage("action_verbs"):
+            action_verb_count, found_verbs = count_action_verbs(text, verbs)
+        experience_text = sections.get("experience", "")
+        with stage("experience"):
+            experience_years, experience_detail = measure_experience(experience_text)
+            experience_action_count = count_action_verbs(experience_text, verbs)[0] if experience_text else 0
+        with stage("contact_info"):
+            contact_info = extract_contact_info(text)
+        with stage("achievements"):
+            achievements = analyze_achievements(text)
+        with stage("ats_checks"):
+            ats_checks = check_ats_optimization(text, sections)
+
+        set_slot = object.__setattr__
+        set_slot(self, "text", text)
+        set_slot(self, "word_count", len(text.split()))
+        set_slot(self, "sections", sections)
+        set_slot(self, "found_skills", tuple(found_skills))
+        set_slot(self, "skill_frequency", skill_frequency)
+        set_slot(self, "contact_info", contact_info)
+        set_slot(self, "achievements", achievements)
+        set_slot(self, "ats_checks", ats_checks)
+        set_slot(self, "action_verb_count", action_verb_count)
+        set_slot(self, "found_verbs", tuple(found_verbs))
+        set_slot(self, "experience_text", experience_text)
+        set_slot(self, "experience_years", experience_years)
+        set_slot(self, "experience_detail", experience_detail)
+        set_slot(self, "experience_action_count", experience_action_count)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self):
+        # Records cross process boundaries (worker pool), so pickle by slot values
+        return _restore_features, tuple(getattr(self, name) for name in self.__slots__)
+
+    def experience_summary(self, user_exp: str) -> Dict:
+        return summarize_experience(self.experience_years, self.experience_detail, user_exp)
+
+
+def _restore_features(*values) -> ResumeFeatures:
+    features = object.__new__(ResumeFeatures)
+    for name, value in zip(ResumeFeatures.__slots__, values):
+        object.__setattr__(features, name, value)
+    return features
+
+
+# ---------- Incremental analysis ----------
+# For edit sessions: the cleaned text is cut into blocks of whole lines, and
+# every signal above except the experience measurement is a sum, union or
+# any() over lines, so it can be computed per block and merged. A block whose
+# text didn't change keeps its features. Blocks start at section headers and,
+# inside long sections, after lines whose hash hits BLOCK_LINES, so an edit
+# only moves the boundaries next to it.
+
+BLOCK_LINES = 16
+
+# A few patterns can match across a line break ('3\nmonths', 'team of\n5', a
+# phone number wrapped over two lines). No block starts where such a match
+# could continue, which keeps the per-block counts equal to whole-text counts.
+SEAM_RE = re.compile(r'\s*(?:[\d(+.\-]|hour|day|week|month|of\b)', re.I)
+
+
+def split_blocks(text: str, block_lines: int = BLOCK_LINES) -> List[str]:
+    lines = text.split('\n')
+    blocks = []
+    start = 0
+    offset = 0
+    for i in range(1, len(lines)):
+        offset += len(lines[i - 1]) + 1
+        stripped = lines[i].strip()
+        cut = (
+            (stripped and section_header(stripped) is not None)
+            or zlib.crc32(lines[i - 1].encode("utf-8")) % block_lines == 0
+        )
+        if cut and not SEAM_RE.match(text, offset):
+            blocks.append('\n'.join(lines[start:i]))
+            start = i
+    blocks.append('\n'.join(lines[start:]))
+    return blocks
+
+
+# split_blocks('\n'.join(lines)) for a stream of lines, one block at a time.
+# The seam check before a line may need the lines after it when it is blank,
+# so undecided lines wait in `queue` until a non-blank line arrives.
+def iter_blocks(lines: Iterable[str], block_lines: int = BLOCK_LINES) -> Iterator[str]:
+    block: List[str] = []
+    queue: List[str] = []
+
+    def settle(final: bool) -> Iterator[str]:
+        while queue:
+            line = queue[0]
+            if block:
+                stripped = line.strip()
+                cut = (
+                    (stripped and section_header(stripped) is not None)
+                    or zlib.crc32(block[-1].encode("utf-8")) % block_lines == 0
+                )
+                if cut:
+                    ahead = next((i for i, l in enumerate(queue) if l.strip()), None)
+                    if ahead is None and not final:
+                        return
+                    following = queue if ahead is None else queue[:ahead + 1]
+                    if not SEAM_RE.match('\n'.join(following)):
+                        yield '\n'.join(block)
+                        block.clear()
+            block.append(queue.pop(0))
+
+    for line in lines:
+        queue.append(line)
+        yield from settle(False)
+    yield from settle(True)
+    yield '\n'.join(block)
+
+
+class BlockFeatures:
+    """
+    The per-block share of ResumeFeatures for one block of split_blocks().
+
+    `sections` holds (section opened by a header in this block, or None for
+    lines continuing the previous block's section; its non-empty lines; the
+    verb words of those lines).
+    """
+
+    __slots__ = (
+        "text",
+        "sections",
+        "header_verb_words",
+        "word_count",
+        "skill_frequency",
+        "metrics",
+        "contact_info",
+        "has_box_drawing",
+        "has_at",
+    )
+
+    def __init__(self, text: str, skill_matcher: SkillMatcher, verbs: ActionVerbMatcher):
+        sections: List[Tuple[Optional[str], str, FrozenSet[str]]] = []
+        section: Optional[str] = None
+        content: List[str] = []
+        headers: List[str] = []
+        for line in text.split('\n'):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            header = section_header(stripped)
+            if header is None:
+                content.append(stripped)
+                continue
+            sections.append(self._part(section, content, verbs))
+            section, content = header, []
+            headers.append(stripped)
+        sections.append(self._part(section, content, verbs))
+
+        self.text = text
+        self.sections = sections
+        self.header_verb_words = find_verb_words('\n'.join(headers), verbs) if headers else frozenset()
+        self.word_count = len(text.split())
+        self.skill_frequency = skill_matcher.match(text.lower())[1]
+        self.metrics = count_metrics(text)
+        self.contact_info = extract_contact_info(text)
+        self.has_box_drawing = bool(BOX_DRAWING_RE.search(text))
+        self.has_at = '@' in text
+
+    @staticmethod
+    def _part(section: Optional[str], lines: List[str], verbs: ActionVerbMatcher):
+        content = '\n'.join(lines)
+        return section, content, find_verb_words(content, verbs) if content else frozenset()
+
+
+class FeatureAccumulator:
+    """
+    Folds BlockFeatures in document order into the ResumeFeatures record of
+    the whole text. Only the merged counts and the section contents are
+    kept, so the blocks themselves can be dropped once added.
+    """
+
+    __slots__ = (
+        "skill_matcher",
+        "verbs",
+        "counts",
+        "metrics",
+        "verb_words",
+        "word_count",
+        "contact_info",
+        "has_box_drawing",
+        "has_at",
+        "sections",
+        "experience_words",
+        "current_section",
+        "current_content",
+        "current_words",
+    )
+
+    def __init__(self, skill_matcher: SkillMatcher, verbs: ActionVerbMatcher):
+        self.skill_matcher = skill_matcher
+        self.verbs = verbs
+        self.counts: Dict[str, int] = {}
+        self.metrics = dict.fromkeys(METRICS_PATTERNS, 0)
+        self.verb_words = set()
+        self.word_count = 0
+        self.contact_info = dict.fromkeys(CONTACT_PATTERNS, False)
+        self.has_box_drawing = False
+        self.has_at = False
+        # Replay of extract_sections over the blocks' section parts
+        self.sections: Dict[str, str] = {}
+        self.experience_words: FrozenSet[str] = frozenset()
+        self.current_section = "header"
+        self.current_content: List[str] = []
+        self.current_words: List[FrozenSet[str]] = []
+
+    def add(self, block: BlockFeatures):
+        counts = self.counts
+        for skill, n in block.skill_frequency.items():
+            counts[skill] = counts.get(skill, 0) + n
+        for metric, n in block.metrics.items():
+            self.metrics[metric] += n
+        self.verb_words |= block.header_verb_words
+        self.word_count += block.word_count
+        for kind, found in block.contact_info.items():
+            if found:
+                self.contact_info[kind] = True
+        self.has_box_drawing = self.has_box_drawing or block.has_box_drawing
+        self.has_at = self.has_at or block.has_at
+
+        for section, content, words in block.sections:
+            if section is not None:
+                self._flush()
+                self.current_section, self.current_content, self.current_words = section, [], []
+            if content:
+                self.current_content.append(content)
+                self.current_words.append(words)
+                self.verb_words |= words
+
+    def _flush(self):
+        if self.current_content:
+            self.sections[self.current_section] = '\n'.join(self.current_content)
+            if self.current_section == "experience":
+                self.experience_words = frozenset().union(*self.current_words)
+
+    def finish(self, text: str) -> ResumeFeatures:
+        """The record for `text`, the '\n'-join of every added block's text."""
+        self._flush()
+        sections = self.sections
+        verbs = self.verbs
+
+        order = self.skill_matcher.order
+        skill_frequency = {s: self.counts[s] for s in sorted(self.counts, key=order.__getitem__)}
+        action_verb_count, found_verbs = match_verb_words(self.verb_words, verbs)
+        experience_text = sections.get("experience", "")
+        experience_years, experience_detail = measure_experience(experience_text)
+
+        features = object.__new__(ResumeFeatures)
+        set_slot = object.__setattr__
+        set_slot(features, "text", text)
+        set_slot(features, "word_count", self.word_count)
+        set_slot(features, "sections", sections)
+        set_slot(features, "found_skills", tuple(sorted(skill_frequency)))
+        set_slot(features, "skill_frequency", skill_frequency)
+        set_slot(features, "contact_info", dict(self.contact_info))
+        set_slot(features, "achievements", summarize_achievements(self.metrics))
+        set_slot(features, "ats_checks", summarize_ats_checks(
+            self.has_box_drawing,
+            self.has_at,
+            sections,
+            self.word_count,
+        ))
+        set_slot(features, "action_verb_count", action_verb_count)
+        set_slot(features, "found_verbs", tuple(found_verbs))
+        set_slot(features, "experience_text", experience_text)
+        set_slot(features, "experience_years", experience_years)
+        set_slot(features, "experience_detail", experience_detail)
+        set_slot(features, "experience_action_count",
+                 match_verb_words(self.experience_words, verbs)[0] if experience_text else 0)
+        return features
+
+
+def merge_blocks(
+    text: str,
+    blocks: Sequence[BlockFeatures],
+    skill_matcher: SkillMatcher,
+    verbs: ActionVerbMatcher
+) -> ResumeFeatures:
+    """The same record ResumeFeatures(text, ...) builds, from the blocks of split_blocks(text)."""
+    accumulator = FeatureAccumulator(skill_matcher, verbs)
+    for block in blocks:
+        accumulator.add(block)
+    return accumulator.finish(text)
+
+
+# ---------- Streaming analysis ----------
+# For very large documents: ResumeFeatures(simple_clean('\n'.join(pages)), ...)
+# built from a stream of page texts. Pages are cleaned, cut into blocks and
+# analyzed as they arrive, so besides the cleaned text (which the record
+# keeps) only one page and one block's temporaries are alive at a time.
+
+def stream_features(
+    pages: Iterable[str],
+    skill_matcher: SkillMatcher,
+    verbs: ActionVerbMatcher,
+    block_lines: int = BLOCK_LINES
+) -> ResumeFeatures:
+    accumulator = FeatureAccumulator(skill_matcher, verbs)
+    texts = []
+    for block_text in iter_blocks(clean_lines(pages), block_lines):
+        accumulator.add(BlockFeatures(block_text, skill_matcher, verbs))
+        texts.append(block_text)
+    return accumulator.finish('\n'.join(texts))
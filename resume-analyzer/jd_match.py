@@ -0,0 +1,165 @@
+import re
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from skill_matcher import SkillMatcher
+
+# Words with dots/pluses/hashes kept whole: node.js, c++, c#, asp.net
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each etc for from had has have having he her here hers him his how i if in into is it
+its itself just me more most my no nor not of off on once only or other our ours out over own per
+same she should so some such than that the their them then there these they this those through to
+too under until up very via was we were what when where which while who whom why will with would
+you your yours
+""".split())
+
+SKILL_WEIGHT = 3.0
+DEFAULT_HASH_FEATURES = 2 ** 18
+BIGRAM_MULTIPLIER = 1000003
+WORD_HASH_CACHE_SIZE = 200000
+
+# Word -> hash, shared by every JobMatcher (hashes don't depend on the skills)
+_WORD_HASHES: Dict[str, int] = {}
+
+
+def _hash_term(term: str) -> int:
+    # crc32 rather than hash(): columns must not depend on PYTHONHASHSEED
+    return zlib.crc32(term.encode("utf-8"))
+
+
+class JobMatcher:
+    """
+    Cosine similarity between a job description and resumes.
+
+    Feature space (one sparse row per document):
+    - one column per skills DB entry, counted by the shared SkillMatcher and
+      weighted by SKILL_WEIGHT
+    - word unigrams and bigrams (stop words dropped) hashed into
+      `hash_features` columns after the skill columns
+
+    Term frequencies are sublinear (1 + log tf) and weighted by a smoothed
+    IDF over the resumes being matched, so terms every candidate has count
+    for less. All resumes are scored against the job description with one
+    sparse matrix-vector product.
+    """
+
+    def __init__(self, skill_matcher: SkillMatcher, hash_features: int = DEFAULT_HASH_FEATURES):
+        self.skill_matcher = skill_matcher
+        self.skills = list(skill_matcher.order)
+        self.n_skills = len(self.skills)
+        self.hash_features = hash_features
+        self.n_features = self.n_skills + hash_features
+
+    def _words(self, text: str) -> List[str]:
+        return [w for w in TOKEN_RE.findall(text.lower()) if w not in STOP_WORDS]
+
+    # Hashed columns of a document's unigrams followed by its bigrams
+    def _term_columns(self, words: List[str]) -> np.ndarray:
+        cache = _WORD_HASHES
+        if len(cache) > WORD_HASH_CACHE_SIZE:
+            cache.clear()
+        lookup = cache.get
+        hashes = np.fromiter(
+            (lookup(w) or cache.setdefault(w, _hash_term(w)) for w in words),
+            dtype=np.int64,
+            count=len(words),
+        )
+        # A bigram's hash combines its word hashes, so no bigram strings are built
+        bigrams = (hashes[:-1] * BIGRAM_MULTIPLIER) ^ hashes[1:]
+        return self.n_skills + np.concatenate([hashes, bigrams]) % self.hash_features
+
+    # Readable term for each hashed column of a document
+    def _term_names(self, words: List[str]) -> Dict[int, str]:
+        terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return dict(zip(self._term_columns(words).tolist(), terms))
+
+    def _skill_columns(self, skill_frequency: Dict[str, int]) -> Tuple[List[int], List[float]]:
+        order = self.skill_matcher.order
+        known = [(order[s], float(n)) for s, n in skill_frequency.items() if s in order]
+        return [c for c, _ in known], [n for _, n in known]
+
+    def vectorize(self, docs: Sequence[Tuple[str, Dict[str, int]]]) -> sparse.csr_matrix:
+        """Raw term counts for (text, skill_frequency) pairs, one row each."""
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        vals: List[np.ndarray] = []
+        for i, (text, skill_frequency) in enumerate(docs):
+            term_cols = self._term_columns(self._words(text))
+            skill_cols, skill_counts = self._skill_columns(skill_frequency)
+            rows.append(np.full(len(skill_cols) + len(term_cols), i, dtype=np.int32))
+            cols.append(np.array(skill_cols, dtype=np.int64))
+            cols.append(term_cols)
+            vals.append(np.array(skill_counts))
+            vals.append(np.ones(len(term_cols)))
+
+        shape = (len(docs), self.n_features)
+        if not docs:
+            return sparse.csr_matrix(shape)
+        counts = sparse.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=shape,
+        )
+        counts.sum_duplicates()
+        return counts
+
+    def _weigh(self, counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+        weighted = counts.astype(np.float64, copy=True)
+        weighted.data = 1.0 + np.log(weighted.data)
+        weighted.data[weighted.indices < self.n_skills] *= SKILL_WEIGHT
+        weighted.data *= idf[weighted.indices]
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ weighted
+
+    def match(
+        self,
+        job_description: str,
+        resumes: Sequence[Tuple[str, Dict[str, int]]],
+        max_terms: int = 15,
+    ) -> Dict:
+        """
+        Score (text, skill_frequency) resumes against a job description.
+        Results keep the input order; scores are cosine similarity x 100.
+        """
+        _, jd_skill_frequency = self.skill_matcher.match(job_description.lower())
+        jd = self.vectorize([(job_description, jd_skill_frequency)])
+        counts = self.vectorize(resumes)
+
+        # Smoothed IDF over the resumes: log((1 + n) / (1 + df)) + 1
+        df = np.bincount(counts.indices, minlength=self.n_features)
+        idf = np.log((1.0 + len(resumes)) / (1.0 + df)) + 1.0
+
+        query = self._weigh(jd, idf)
+        matrix = self._weigh(counts, idf)
+        scores = np.asarray((matrix @ query.T).todense()).ravel()
+
+        # Per-term contributions to each score, restricted to hashed n-grams
+        # the job description shares with the resume
+        contributions = sparse.csr_matrix(matrix.multiply(query))
+        column_names = self._term_names(self._words(job_description))
+        jd_skills = list(jd_skill_frequency)
+
+        results = []
+        for i, score in enumerate(scores):
+            start, end = contributions.indptr[i], contributions.indptr[i + 1]
+            cols = contributions.indices[start:end]
+            weights = contributions.data[start:end]
+            terms = cols >= self.n_skills
+            cols, weights = cols[terms], weights[terms]
+            top = cols[np.argsort(-weights, kind="stable")[:max_terms]]
+            resume_skills = resumes[i][1]
+            results.append({
+                "match_score": round(float(score) * 100, 1),
+                "matched_skills": [s for s in jd_skills if s in resume_skills],
+                "missing_skills": [s for s in jd_skills if s not in resume_skills],
+                "overlapping_terms": [column_names[c] for c in top.tolist()],
+            })
+
+        return {"job_skills": jd_skills, "results": results}
+
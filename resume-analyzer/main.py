@@ -1,78 +1,155 @@
 import io
+import asyncio
+import hashlib
+import importlib
+import zipfile
 import re
 import json
-import tempfile
 import os
+import time
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
-from collections import Counter
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterator, Optional, Dict, List, Sequence, Tuple, Union
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form, Query
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-import requests
-import pdfplumber
-import docx
-import uvicorn  
+
+from features import (
+    BlockFeatures,
+    ResumeFeatures,
+    merge_blocks,
+    simple_clean,
+    split_blocks,
+    stream_features,
+    extract_contact_info,
+    extract_sections,
+    analyze_experience,
+    count_action_verbs,
+    analyze_achievements,
+    check_ats_optimization,
+)
+from analysis_cache import AnalysisCache
+from downloader import DownloadError, ResumeDownloader
+from edit_sessions import EditSessions
+from metrics import MetricsRegistry, Profile, TimingMiddleware, annotate, current_profile, run_profiled, set_labels, stage
+from pdf_extraction import PDF_BACKENDS, count_pdf_pages, extract_pdf_page_range, extract_pdf_pages
+from pdf_extraction import iter_pdf_pages, split_pages
+from pdf_extraction import warm_up as warm_up_pdf_parser
+from readiness import Readiness
+from resume_index import RANK_FIELDS, ResumeIndex
+from taxonomy import Taxonomy, TaxonomyError, TaxonomyStore
+from upload_stream import UploadRejected, receive_upload
+from worker_pool import AnalysisPool, PoolBusy
 
 BASE_DIR = Path(__file__).parent
 
-# Load skills DB
-skills_path = BASE_DIR / "skills.json"
-if not skills_path.exists():
-    raise RuntimeError(f"skills.json not found at {skills_path}")
-with open(skills_path, "r", encoding="utf-8") as f:
-    SKILLS_DB = [s.lower() for s in json.load(f)]
-
-# Enhanced Role-specific skills and keywords with weights
-ROLE_SKILLS = {
-    "software engineer": {
-        "must_have": ["git", "python", "java", "javascript", "sql", "api", "testing"],
-        "good_to_have": ["react", "node.js", "docker", "kubernetes", "aws", "azure", "ci/cd", "agile"],
-        "keywords": ["api", "backend", "frontend", "full-stack", "microservices", "testing", "deployment", "scalability"],
-        "action_verbs": ["developed", "implemented", "built", "designed", "architected", "optimized", "deployed"]
-    },
-    "data analyst": {
-        "must_have": ["sql", "excel", "python", "statistics", "data analysis"],
-        "good_to_have": ["tableau", "power bi", "r", "pandas", "visualization", "looker", "dashboards"],
-        "keywords": ["analysis", "reporting", "metrics", "dashboard", "forecasting", "insights", "data-driven"],
-        "action_verbs": ["analyzed", "reported", "forecasted", "visualized", "investigated", "identified"]
-    },
-    "machine learning engineer": {
-        "must_have": ["python", "tensorflow", "pytorch", "scikit-learn", "machine learning"],
-        "good_to_have": ["deep learning", "nlp", "computer vision", "mlops", "spark", "aws", "model deployment"],
-        "keywords": ["model", "training", "accuracy", "neural network", "pipeline", "feature engineering", "optimization"],
-        "action_verbs": ["trained", "optimized", "deployed", "researched", "experimented", "validated"]
-    },
-    "frontend developer": {
-        "must_have": ["javascript", "html", "css", "react", "responsive design"],
-        "good_to_have": ["typescript", "tailwind", "vue", "angular", "webpack", "next.js"],
-        "keywords": ["ui", "ux", "component", "state management", "performance", "accessibility"],
-        "action_verbs": ["designed", "implemented", "optimized", "created", "enhanced"]
-    },
-    "backend developer": {
-        "must_have": ["python", "java", "node.js", "sql", "api", "rest"],
-        "good_to_have": ["microservices", "docker", "mongodb", "redis", "graphql", "kafka"],
-        "keywords": ["api", "database", "server", "scalability", "architecture", "performance"],
-        "action_verbs": ["architected", "built", "scaled", "optimized", "integrated"]
-    },
-    "devops engineer": {
-        "must_have": ["docker", "kubernetes", "ci/cd", "linux", "git", "aws"],
-        "good_to_have": ["terraform", "ansible", "jenkins", "monitoring", "azure", "gcp"],
-        "keywords": ["automation", "deployment", "infrastructure", "monitoring", "orchestration"],
-        "action_verbs": ["automated", "deployed", "configured", "monitored", "optimized"]
-    }
-}
+# Roles, skills (skills.json), aliases and action verbs, compiled once per
+# version of the taxonomy file and swapped in when the files change
+TAXONOMY_PATH = Path(os.getenv("RESUME_TAXONOMY_PATH") or BASE_DIR / "taxonomy.json")
+TAXONOMY_POLL_SECONDS = float(os.getenv("RESUME_TAXONOMY_POLL_SECONDS", "2"))
+# Compiled taxonomies are pickled here per checksum and loaded on the next start
+# instead of being rebuilt; set RESUME_TAXONOMY_CACHE_DIR="" to always rebuild
+TAXONOMY_CACHE_DIR = os.getenv("RESUME_TAXONOMY_CACHE_DIR", str(BASE_DIR / ".cache"))
+
+try:
+    TAXONOMY = TaxonomyStore(TAXONOMY_PATH, Path(TAXONOMY_CACHE_DIR) if TAXONOMY_CACHE_DIR else None)
+except TaxonomyError as e:
+    raise RuntimeError(str(e))
+
+# Analysis cache: in-memory LRU, plus an optional SQLite file that survives restarts
+CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_SIZE", "128"))
+CACHE_DB_PATH = os.getenv("RESUME_CACHE_DB") or None
+CACHE_DB_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_DB_SIZE", "10000"))
+
+# Search index over analyzed resumes. Only requests with index=true are added,
+# and at most RESUME_INDEX_SIZE resumes are kept (least recently indexed go
+# first). The index lives in the server process: each worker process has its
+# own, lost on restart unless a SQLite path is set to reload it from.
+INDEX_DB_PATH = os.getenv("RESUME_INDEX_DB") or None
+INDEX_MAX_DOCUMENTS = int(os.getenv("RESUME_INDEX_SIZE", "10000"))
+SEARCH_MAX_K = 100
+
+# Longest job description /match-job accepts
+MAX_JOB_DESCRIPTION_CHARS = 20000
+
+# /analyze-text: longest resume text, and how many analyses (and for how long)
+# are kept so an edited resume only re-analyzes what changed
+MAX_RESUME_TEXT_CHARS = 200000
+EDIT_SESSION_MAX_ENTRIES = int(os.getenv("RESUME_EDIT_SESSIONS", "256"))
+EDIT_SESSION_TTL_SECONDS = float(os.getenv("RESUME_EDIT_SESSION_TTL_SECONDS", "1800"))
+
+# Parsing/scoring worker processes (default: one per core) and how many jobs
+# may be running or queued before new uploads get a 503
+ANALYSIS_WORKERS = int(os.getenv("RESUME_ANALYSIS_WORKERS", "0")) or os.cpu_count() or 1
+ANALYSIS_MAX_PENDING = int(os.getenv("RESUME_ANALYSIS_MAX_PENDING", "0")) or ANALYSIS_WORKERS * 4
+
+ANALYSIS_POOL = AnalysisPool(ANALYSIS_WORKERS, ANALYSIS_MAX_PENDING)
+
+# PDF extraction: backend ("pdfplumber" keeps layout-aware text, "pdfminer" is a
+# faster text-only mode, "pypdf" if installed), page cap (0 = no cap, the
+# default, so every page is scored; with a cap, responses report the pages
+# left out in meta.pages and resume_pdf_truncations counts them), and the page
+# count from which page ranges are extracted in parallel as jobs of idle
+# analysis workers
+PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "pdfplumber")
+PDF_MAX_PAGES = int(os.getenv("RESUME_PDF_MAX_PAGES", "0"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PDF_PARALLEL_MIN_PAGES", "8"))
+# PDFs of at least this many bytes are parsed, cleaned and analyzed page by page
+# (streaming mode: memory bounded by a page instead of the whole document, but
+# no parallel page extraction)
+PDF_STREAM_MIN_BYTES = int(os.getenv("RESUME_PDF_STREAM_MIN_BYTES", str(2 * 1024 * 1024)))
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+# /analyze downloads: concurrent downloads, pooled keep-alive connections, and
+# the size of the ETag cache for URLs fetched before
+DOWNLOAD_CONCURRENCY = int(os.getenv("RESUME_DOWNLOAD_CONCURRENCY", "16"))
+DOWNLOAD_MAX_CONNECTIONS = int(os.getenv("RESUME_DOWNLOAD_MAX_CONNECTIONS", "32"))
+DOWNLOAD_CACHE_BYTES = int(os.getenv("RESUME_DOWNLOAD_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# Batch screening: files per request (after ZIP expansion), total uncompressed
+# size, and how long a batch waits before retrying when the pool is full
+BATCH_MAX_FILES = int(os.getenv("RESUME_BATCH_MAX_FILES", "500"))
+BATCH_MAX_BYTES = int(os.getenv("RESUME_BATCH_MAX_BYTES", str(500 * 1024 * 1024)))
+BATCH_RETRY_SECONDS = 0.25
+
+# Import the parsers and start the worker processes in the background after
+# startup (/ready reports when done); "0" leaves it all to the first requests,
+# and /ready answers 200 as soon as the app is serving
+WARMUP_ON_STARTUP = os.getenv("RESUME_WARMUP", "1") != "0"
+
+if PDF_BACKEND not in PDF_BACKENDS:
+    raise RuntimeError(f"Unknown RESUME_PDF_BACKEND '{PDF_BACKEND}'. Available: {', '.join(PDF_BACKENDS)}")
+
+
+RESUME_DOWNLOADER = ResumeDownloader(
+    max_bytes=MAX_UPLOAD_BYTES,
+    max_concurrency=DOWNLOAD_CONCURRENCY,
+    max_connections=DOWNLOAD_MAX_CONNECTIONS,
+    timeout=30.0,
+    cache_max_bytes=DOWNLOAD_CACHE_BYTES,
+    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+)
 
-# Enhanced positive action verbs
-ACTION_VERBS = [
-    "achieved", "improved", "trained", "mentored", "created", "designed", "developed",
-    "implemented", "reduced", "increased", "launched", "led", "managed", "optimized",
-    "resolved", "streamlined", "automated", "built", "delivered", "enhanced", "executed",
-    "founded", "generated", "innovated", "pioneered", "scaled", "spearheaded", "transformed"
-]
 
-app = FastAPI(title="Enhanced Resume Analyzer API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    TAXONOMY.watch(TAXONOMY_POLL_SECONDS)
+    if WARMUP_ON_STARTUP:
+        READINESS.start()
+    else:
+        READINESS.skip()
+    yield
+    TAXONOMY.stop()
+    ANALYSIS_POOL.shutdown()
+    await RESUME_DOWNLOADER.aclose()
+
+
+app = FastAPI(title="Enhanced Resume Analyzer API", lifespan=lifespan)
 
 # CORS configuration
 origins = [
@@ -87,301 +164,236 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Debug-Timings"],
     max_age=86400
 )
 
+# Prometheus metrics (GET /metrics). Stage timings are labeled with the file
+# type and page count bucket of the resume; X-Debug-Timings: 1 on a request
+# returns its own stage timings in the same response header.
+METRICS = MetricsRegistry()
+STAGE_SECONDS = METRICS.histogram(
+    "resume_stage_seconds",
+    "Time spent in each analysis stage",
+    labels=("stage", "file_type", "pages"),
+)
+REQUEST_SECONDS = METRICS.histogram(
+    "resume_request_seconds",
+    "HTTP request duration",
+    labels=("endpoint", "method", "status"),
+)
+EXTRACTION_FAILURES = METRICS.counter(
+    "resume_extraction_failures",
+    "Uploads whose text could not be extracted",
+    labels=("file_type",),
+)
+DOCX_FALLBACKS = METRICS.counter(
+    "resume_docx_fallbacks",
+    "Unrecognized uploads that only parsed as DOCX after the PDF attempt",
+)
+WORKER_CRASHES = METRICS.counter(
+    "resume_worker_crashes",
+    "Analysis jobs lost to a worker process that died (the pool is replaced)",
+)
+PDF_TRUNCATIONS = METRICS.counter(
+    "resume_pdf_truncations",
+    "PDFs analyzed without their pages past RESUME_PDF_MAX_PAGES",
+)
+
+app.add_middleware(TimingMiddleware, stage_histogram=STAGE_SECONDS, request_histogram=REQUEST_SECONDS)
+
+
 class AnalyzeRequest(BaseModel):
     userId: str
     resumeUrl: str
     role: Optional[str] = ""
     experience: Optional[str] = ""
     name: Optional[str] = ""
+    index: bool = False  # add the result to the user's /search index
 
 
-# ---------- Helper functions ----------
+class AnalyzeTextRequest(BaseModel):
+    userId: str
+    text: str
+    role: Optional[str] = ""
+    experience: Optional[str] = ""
+    name: Optional[str] = ""
+    previousAnalysisId: Optional[str] = None
 
-# Download resume file (for URL-based uploads)
-def download_file(url: str) -> bytes:
-    try:
-        if 'firebasestorage.googleapis.com' in url and 'alt=media' not in url:
-            separator = '&' if '?' in url else '?'
-            url = f"{url}{separator}alt=media"
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        }
+# ---------- Helper functions ----------
 
-        resp = requests.get(url, timeout=30, headers=headers, allow_redirects=True)
-        resp.raise_for_status()
-        return resp.content
+# Download resume file (for URL-based uploads)
+async def download_file(url: str) -> bytes:
+    if 'firebasestorage.googleapis.com' in url and 'alt=media' not in url:
+        separator = '&' if '?' in url else '?'
+        url = f"{url}{separator}alt=media"
 
-    except requests.RequestException as e:
+    try:
+        return await RESUME_DOWNLOADER.fetch(url)
+    except DownloadError as e:
         raise HTTPException(status_code=400, detail=f"Failed to download resume: {str(e)}")
 
 
-# PDF parser
-def extract_text_from_pdf_bytes(b: bytes) -> str:
-    pages = []
-    with pdfplumber.open(io.BytesIO(b)) as pdf:
-        for p in pdf.pages:
-            text = p.extract_text()
-            if text:
-                pages.append(text)
-    return "\n".join(pages)
-
-
-# DOCX parser
-def extract_text_from_docx_bytes(b: bytes) -> str:
-    temp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-            tmp.write(b)
-            temp_path = tmp.name
-        doc = docx.Document(temp_path)
-        return "\n".join([p.text for p in doc.paragraphs])
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            os.unlink(temp_path)
-
-
-# Enhanced cleaning
-def simple_clean(text: str) -> str:
-    text = re.sub(r'\t+', ' ', text)
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n\s*\n+', '\n\n', text)
-    return text.strip().lower()
-
-
-# Extract contact information
-def extract_contact_info(text: str) -> Dict[str, bool]:
-    # phone pattern supports 10-digit (India) and US-style numbers
-    phone_pattern = r'(\+?\d{1,3}[-.\s]?)?(\d{10}|\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
-    contacts = {
-        "email": bool(re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)),
-        "phone": bool(re.search(phone_pattern, text)),
-        "linkedin": bool(re.search(r'linkedin\.com/in/[\w-]+', text, re.I)),
-        "github": bool(re.search(r'github\.com/[\w-]+', text, re.I)),
-        "portfolio": bool(re.search(r'(portfolio|website|http)', text, re.I))
-    }
-    return contacts
+# Page count label of the stage metrics
+def page_bucket(pages: int) -> str:
+    for upper, label in ((1, "1"), (2, "2"), (5, "3-5"), (10, "6-10"), (20, "11-20")):
+        if pages <= upper:
+            return label
+    return "21+"
 
 
-# Enhanced skill extraction with context
-def extract_skills(text: str) -> Tuple[List[str], Dict[str, int]]:
-    found_skills = set()
-    skill_frequency = Counter()
-
-    words = re.findall(r'\b\w+(?:\.\w+)?\b', text.lower())
-    text_with_spaces = ' ' + text.lower() + ' '
-
-    for skill in SKILLS_DB:
-        if ' ' in skill or '.' in skill:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            matches = re.findall(pattern, text_with_spaces)
-            if matches:
-                found_skills.add(skill)
-                skill_frequency[skill] = len(matches)
-        else:
-            if skill in words:
-                found_skills.add(skill)
-                skill_frequency[skill] = words.count(skill)
-
-    return sorted(list(found_skills)), dict(skill_frequency)
-
-
-# Enhanced section detection
-def extract_sections(text: str) -> Dict[str, str]:
-    patterns = {
-        "summary": r'\b(summary|profile|objective|about\s+me|professional\s+summary)\b',
-        "skills": r'\b(skills|technical\s+skills|core\s+skills|competencies|expertise)\b',
-        "experience": r'\b(experience|work\s+experience|employment|professional\s+experience)\b',
-        "education": r'\b(education|academic|qualifications|degrees)\b',
-        "projects": r'\b(projects|portfolio|work\s+samples)\b',
-        "certifications": r'\b(certifications?|licenses?|credentials)\b',
-        "achievements": r'\b(achievements?|awards?|honors?|accomplishments?)\b'
-    }
+# PDF parser. Also returns the page counts (see pdf_page_counts).
+def extract_text_from_pdf_bytes(b: bytes) -> Tuple[str, Dict]:
+    with stage("extract_pdf"):
+        pages = extract_pdf_pages(b, PDF_BACKEND, PDF_MAX_PAGES)
+    set_labels(pages=page_bucket(len(pages)))
+    return "\n".join(text for text in pages if text), pdf_page_counts(b, len(pages))
 
-    lines = text.split('\n')
-    sections = {}
-    current_section = "header"
-    current_content = []
 
-    for line in lines:
-        line_stripped = line.strip()
-        if not line_stripped:
-            continue
+# Pages of a PDF and how many of them were analyzed: fewer when the document
+# is longer than PDF_MAX_PAGES
+def pdf_page_counts(b: bytes, analyzed: int) -> Dict:
+    total = analyzed
+    if PDF_MAX_PAGES and analyzed >= PDF_MAX_PAGES:
+        with stage("count_pages"):
+            total = max(count_pdf_pages(b), analyzed)
+    return page_counts(total, analyzed)
 
-        matched = False
-        for section_name, pattern in patterns.items():
-            if re.search(pattern, line_stripped, re.I) and len(line_stripped) < 50:
-                if current_content:
-                    sections[current_section] = '\n'.join(current_content)
-                current_section = section_name
-                current_content = []
-                matched = True
-                break
 
-        if not matched:
-            current_content.append(line_stripped)
+def page_counts(total: int, analyzed: int) -> Dict:
+    return {"total": total, "analyzed": analyzed, "truncated": total > analyzed}
 
-    if current_content:
-        sections[current_section] = '\n'.join(current_content)
 
-    return sections
+# DOCX parser
+def extract_text_from_docx_bytes(b: bytes) -> str:
+    with stage("extract_docx"):
+        import docx
 
+        doc = docx.Document(io.BytesIO(b))
+        return "\n".join([p.text for p in doc.paragraphs])
 
-# Parse user entered experience years safely
-def parse_user_experience_years(user_exp: str) -> Optional[float]:
-    """
-    Convert user input like 'Fresher', '0-1 years', '2 yrs', '1.5' into a float.
-    Returns None if it can't be parsed.
-    """
-    if not user_exp:
-        return None
 
-    user_exp = user_exp.strip().lower()
-    if user_exp in {"fresher", "freshers"}:
-        return 0.0
+# Detect the file format from its magic bytes: "pdf", "docx" or None
+# The PDF header, after an optional BOM and whitespace
+PDF_HEADER_RE = re.compile(rb'(?:\xef\xbb\xbf)?[ \t\r\n\f\x00]*%PDF-')
 
-    # pick first number (supports decimals)
-    match = re.search(r'(\d+(\.\d+)?)', user_exp)
-    if match:
-        try:
-            return float(match.group(1))
-        except ValueError:
-            return None
 
+def sniff_file_type(b: bytes) -> Optional[str]:
+    # DOCX is an OOXML package, i.e. a ZIP archive; checked first, as a
+    # stored (uncompressed) PDF member puts a PDF header in its first 1 KB
+    if b[:4] == b"PK\x03\x04":
+        return "docx"
+    if PDF_HEADER_RE.match(b[:1024]):
+        return "pdf"
     return None
 
 
-# Analyze experience years and details
-def analyze_experience(exp_text: str, user_exp: str) -> Dict:
-    year_ranges = re.findall(r'(20\d{2})\s*[-–—to]+\s*(20\d{2}|present|current)', exp_text, re.I)
+# Enhanced skill extraction with context
+def extract_skills(text: str) -> Tuple[List[str], Dict[str, int]]:
+    return TAXONOMY.current.skill_matcher.match(text.lower())
+
 
-    total_years = 0
-    for start, end in year_ranges:
-        start_year = int(start)
-        end_year = datetime.now().year if end.lower() in ['present', 'current'] else int(end)
-        total_years += max(0, end_year - start_year)
+# ---------- Scoring & recommendation ----------
 
-    explicit_years = re.findall(r'(\d+)\+?\s*years?', exp_text, re.I)
-    if explicit_years:
-        total_years = max(total_years, int(explicit_years[0]))
+EDU_YEAR_RE = re.compile(r'20\d{2}')
+EDU_DETAILS_RE = re.compile(r'gpa|coursework|courses', re.I)
 
-    parsed_user_years = parse_user_experience_years(user_exp)
-    if parsed_user_years is not None:
-        consistent = abs(total_years - parsed_user_years) <= 1
-    else:
-        # if user didn't specify or it's unparseable, don't penalize
-        consistent = True
 
-    detail_level = "low"
-    if len(exp_text.split('\n')) > 5:
-        detail_level = "high"
-    elif len(exp_text) > 100:
-        detail_level = "medium"
+# Role-independent part of the score, cached with the document
+def compute_document_scores(features: ResumeFeatures) -> Dict:
+    text = features.text
+    sections = features.sections
 
-    return {
-        "years_found": total_years,
-        "user_years": parsed_user_years,
-        "consistent": consistent,
-        "detail_level": detail_level
+    document_scores = {
+        "format_structure": 0,
+        "contact_info": 0,
+        "education": 0,
+        "achievements_impact": 0,
+        "ats_optimization": 0,
     }
 
+    # 1. Format & Structure (15 points)
+    required_sections = {"experience", "education", "skills"}
+    found_sections = set(sections.keys())
+    section_score = len(required_sections & found_sections) * 4
+    document_scores["format_structure"] = min(section_score, 12)
 
-# Count action verbs
-def count_action_verbs(text: str) -> Tuple[int, List[str]]:
-    found_verbs = []
-    for verb in ACTION_VERBS:
-        if re.search(r'\b' + verb + r'\w*\b', text, re.I):
-            found_verbs.append(verb)
-    return len(found_verbs), found_verbs
+    if "summary" in sections or "header" in sections:
+        document_scores["format_structure"] += 3
 
+    # 2. Contact Information (5 points)
+    contacts = features.contact_info
+    contact_score = sum([2 if k in ["email", "phone"] else 0.5 for k, v in contacts.items() if v])
+    document_scores["contact_info"] = min(contact_score, 5)
 
-# Analyze achievements and quantification
-def analyze_achievements(text: str) -> Dict:
-    metrics_patterns = {
-        "percentage": r'\d+%',
-        "money": r'\$\d+[kmb]?',
-        "numbers": r'\b\d+\+?\b',
-        "time_saved": r'\d+\s*(hours?|days?|weeks?|months?)',
-        "team_size": r'team\s+of\s+\d+',
-    }
+    # 5. Education (10 points)
+    edu_text = sections.get("education", "")
+    if edu_text:
+        degrees = ["bachelor", "master", "phd", "b.tech", "m.tech", "b.s", "m.s", "degree"]
+        if any(d in edu_text.lower() for d in degrees):
+            document_scores["education"] += 5
 
-    metrics_found = {}
-    for metric_type, pattern in metrics_patterns.items():
-        matches = re.findall(pattern, text, re.I)
-        metrics_found[metric_type] = len(matches)
+        if EDU_YEAR_RE.search(edu_text):
+            document_scores["education"] += 3
 
-    total_metrics = sum(metrics_found.values())
+        if EDU_DETAILS_RE.search(edu_text):
+            document_scores["education"] += 2
 
-    return {
-        "total_quantified": total_metrics,
-        "metrics_breakdown": metrics_found,
-        "has_impact": total_metrics > 3
-    }
+    # 6. Achievements & Impact (15 points)
+    achievement_analysis = features.achievements
+    if achievement_analysis["has_impact"]:
+        document_scores["achievements_impact"] += 8
+    else:
+        document_scores["achievements_impact"] += min(achievement_analysis["total_quantified"] * 1.5, 5)
 
+    impact_verbs = ["increased", "decreased", "improved", "reduced", "achieved", "exceeded"]
+    impact_count = sum(1 for v in impact_verbs if v in text)
+    document_scores["achievements_impact"] += min(impact_count * 1, 7)
 
-# Check ATS optimization
-def check_ats_optimization(text: str, sections: Dict) -> Dict:
-    ats_score = {}
-    ats_score["simple_formatting"] = not bool(re.search(r'[│┤┼╪╫╬═║]', text))
-    ats_score["no_images_text"] = True  # assumption for text-only parsing
-    ats_score["standard_sections"] = len(set(sections.keys()) & {"experience", "education", "skills"}) == 3
-    ats_score["contact_info"] = bool(re.search(r'@', text))
-    word_count = len(text.split())
-    ats_score["appropriate_length"] = 300 < word_count < 1500
-    return ats_score
+    # 7. ATS Optimization (10 points)
+    ats_check = features.ats_checks
+    ats_score = sum([
+        3 if ats_check["standard_sections"] else 0,
+        2 if ats_check["simple_formatting"] else 0,
+        2 if ats_check["contact_info"] else 0,
+        3 if ats_check["appropriate_length"] else 1
+    ])
+    document_scores["ats_optimization"] = min(ats_score, 10)
 
+    return document_scores
 
-# ---------- Scoring & recommendation ----------
 
 # Enhanced scoring function
 def compute_scores(
-    text: str,
-    found_skills: List[str],
-    skill_freq: Dict[str, int],
-    sections: Dict[str, str],
+    features: ResumeFeatures,
     role: str,
-    user_experience: str
+    experience_summary: Dict,
+    document_scores: Optional[Dict] = None,
+    taxonomy: Optional[Taxonomy] = None
 ) -> Tuple[int, Dict]:
+    if document_scores is None:
+        document_scores = compute_document_scores(features)
+    if taxonomy is None:
+        taxonomy = TAXONOMY.current
+
     detailed_scores = {
-        "format_structure": 0,
-        "contact_info": 0,
+        "format_structure": document_scores["format_structure"],
+        "contact_info": document_scores["contact_info"],
         "skills_match": 0,
         "experience_quality": 0,
-        "education": 0,
-        "achievements_impact": 0,
-        "ats_optimization": 0,
+        "education": document_scores["education"],
+        "achievements_impact": document_scores["achievements_impact"],
+        "ats_optimization": document_scores["ats_optimization"],
     }
 
-    # 1. Format & Structure (15 points)
-    required_sections = {"experience", "education", "skills"}
-    found_sections = set(sections.keys())
-    section_score = len(required_sections & found_sections) * 4
-    detailed_scores["format_structure"] = min(section_score, 12)
-
-    if "summary" in sections or "header" in sections:
-        detailed_scores["format_structure"] += 3
-
-    # 2. Contact Information (5 points)
-    contacts = extract_contact_info(text)
-    contact_score = sum([2 if k in ["email", "phone"] else 0.5 for k, v in contacts.items() if v])
-    detailed_scores["contact_info"] = min(contact_score, 5)
-
     # 3. Skills Match (25 points)
-    role_lower = role.lower()
-    if role_lower in ROLE_SKILLS:
-        role_info = ROLE_SKILLS[role_lower]
-        found_set = set(found_skills)
-
-        must_have = set(role_info["must_have"])
-        good_to_have = set(role_info["good_to_have"])
-
-        must_have_found = must_have & found_set
-        good_to_have_found = good_to_have & found_set
+    role_info = taxonomy.role(role)
+    if role_info is not None:
+        must_have_found = role_info.must_have_set.intersection(features.found_skills)
+        good_to_have_found = role_info.good_to_have_set.intersection(features.found_skills)
 
         must_have_score = len(must_have_found) * 2.5
         good_to_have_score = len(good_to_have_found) * 1
@@ -389,65 +401,28 @@ def compute_scores(
         detailed_scores["skills_match"] = min(must_have_score + good_to_have_score, 25)
     else:
         # generic fallback
-        detailed_scores["skills_match"] = min(len(found_skills) * 2, 25)
+        detailed_scores["skills_match"] = min(len(features.found_skills) * 2, 25)
 
     # 4. Experience Quality (20 points)
-    exp_text = sections.get("experience", "")
+    exp_text = features.experience_text
     if exp_text:
-        exp_analysis = analyze_experience(exp_text, user_experience)
-        action_count, _ = count_action_verbs(exp_text)
-
-        if exp_analysis["consistent"]:
+        if experience_summary["consistent"]:
             detailed_scores["experience_quality"] += 5
-        elif exp_analysis["years_found"] > 0:
+        elif experience_summary["years_found"] > 0:
             detailed_scores["experience_quality"] += 3
 
-        if exp_analysis["detail_level"] == "high":
+        if experience_summary["detail_level"] == "high":
             detailed_scores["experience_quality"] += 5
-        elif exp_analysis["detail_level"] == "medium":
+        elif experience_summary["detail_level"] == "medium":
             detailed_scores["experience_quality"] += 3
 
-        detailed_scores["experience_quality"] += min(action_count * 0.5, 5)
+        detailed_scores["experience_quality"] += min(features.experience_action_count * 0.5, 5)
 
-        if role_lower in ROLE_SKILLS:
-            keywords = ROLE_SKILLS[role_lower]["keywords"]
-            keyword_matches = sum(1 for k in keywords if k in exp_text.lower())
+        if role_info is not None:
+            exp_lower = exp_text.lower()
+            keyword_matches = sum(1 for k in role_info.keywords if k in exp_lower)
             detailed_scores["experience_quality"] += min(keyword_matches * 0.8, 5)
 
-    # 5. Education (10 points)
-    edu_text = sections.get("education", "")
-    if edu_text:
-        degrees = ["bachelor", "master", "phd", "b.tech", "m.tech", "b.s", "m.s", "degree"]
-        if any(d in edu_text.lower() for d in degrees):
-            detailed_scores["education"] += 5
-
-        if re.search(r'20\d{2}', edu_text):
-            detailed_scores["education"] += 3
-
-        if re.search(r'gpa|coursework|courses', edu_text, re.I):
-            detailed_scores["education"] += 2
-
-    # 6. Achievements & Impact (15 points)
-    achievement_analysis = analyze_achievements(text)
-    if achievement_analysis["has_impact"]:
-        detailed_scores["achievements_impact"] += 8
-    else:
-        detailed_scores["achievements_impact"] += min(achievement_analysis["total_quantified"] * 1.5, 5)
-
-    impact_verbs = ["increased", "decreased", "improved", "reduced", "achieved", "exceeded"]
-    impact_count = sum(1 for v in impact_verbs if v in text)
-    detailed_scores["achievements_impact"] += min(impact_count * 1, 7)
-
-    # 7. ATS Optimization (10 points)
-    ats_check = check_ats_optimization(text, sections)
-    ats_score = sum([
-        3 if ats_check["standard_sections"] else 0,
-        2 if ats_check["simple_formatting"] else 0,
-        2 if ats_check["contact_info"] else 0,
-        3 if ats_check["appropriate_length"] else 1
-    ])
-    detailed_scores["ats_optimization"] = min(ats_score, 10)
-
     total_score = sum(detailed_scores.values())
     return min(round(total_score), 100), detailed_scores
 
@@ -455,16 +430,18 @@ def compute_scores(
 # Generate personalized recommendations
 def generate_recommendations(
     detailed_scores: Dict,
-    found_skills: List[str],
-    sections: Dict,
+    features: ResumeFeatures,
     role: str,
-    text: str
+    taxonomy: Optional[Taxonomy] = None
 ) -> Dict[str, List[str]]:
+    if taxonomy is None:
+        taxonomy = TAXONOMY.current
+
     strengths = []
     improvements = []
     critical_issues = []
 
-    contacts = extract_contact_info(text)
+    contacts = features.contact_info
     if sum(contacts.values()) >= 3:
         strengths.append("✓ Complete contact information with professional links")
     elif not contacts["email"]:
@@ -475,12 +452,11 @@ def generate_recommendations(
     elif detailed_scores["format_structure"] < 8:
         critical_issues.append("⚠ Missing key sections - add Summary, Skills, Experience, and Education")
 
-    role_lower = role.lower()
-    if role_lower in ROLE_SKILLS:
-        role_info = ROLE_SKILLS[role_lower]
-        found_set = set(found_skills)
-        missing_must = set(role_info["must_have"]) - found_set
-        missing_good = set(role_info["good_to_have"]) - found_set
+    role_info = taxonomy.role(role)
+    if role_info is not None:
+        found_set = set(features.found_skills)
+        missing_must = role_info.must_have_set - found_set
+        missing_good = role_info.good_to_have_set - found_set
 
         if detailed_scores["skills_match"] >= 20:
             strengths.append(f"✓ Excellent technical skills alignment for {role}")
@@ -499,8 +475,7 @@ def generate_recommendations(
             critical_issues.append("⚠ Experience section lacks detail and impact")
         improvements.append("Start bullet points with strong action verbs (led, developed, improved)")
 
-    achievement_analysis = analyze_achievements(text)
-    if achievement_analysis["has_impact"]:
+    if features.achievements["has_impact"]:
         strengths.append("✓ Quantified achievements with measurable impact")
     else:
         improvements.append("Add metrics to show impact (e.g., 'Increased efficiency by 30%', 'Managed team of 5')")
@@ -515,11 +490,10 @@ def generate_recommendations(
     else:
         improvements.append("Use standard section headers and avoid complex tables or graphics")
 
-    action_count, found_verbs = count_action_verbs(text)
-    if action_count < 5:
+    if features.action_verb_count < 5:
         improvements.append("Use more action verbs throughout your resume (achieved, developed, led)")
 
-    word_count = len(text.split())
+    word_count = features.word_count
     if word_count < 300:
         critical_issues.append("⚠ Resume is too short - aim for 400-600 words for better ATS scores")
     elif word_count > 1500:
@@ -532,107 +506,368 @@ def generate_recommendations(
     }
 
 
-# ---------- Endpoints ----------
+# ---------- Analysis core ----------
 
-# NEW ENDPOINT: Direct file upload and analysis
-@app.post("/upload-and-analyze")
-async def upload_and_analyze(
-    file: UploadFile = File(...),
-    userId: str = Form(...),
-    name: str = Form(""),
-    role: str = Form(""),
-    experience: str = Form("")
-):
-    """
-    Accept PDF/DOCX file directly from frontend and analyze it.
-    No external storage needed - processes file in memory.
-    """
+# Extract every document signal once
+def extract_features(clean_text: str, taxonomy: Optional[Taxonomy] = None) -> ResumeFeatures:
+    if taxonomy is None:
+        taxonomy = TAXONOMY.current
+    return ResumeFeatures(clean_text, taxonomy.skill_matcher, taxonomy.verbs)
 
-    # Validate file type
-    if not (file.filename.endswith('.pdf') or file.filename.endswith('.docx')):
-        raise HTTPException(
-            status_code=400,
-            detail="Only PDF and DOCX files are supported"
-        )
 
-    # Read file bytes
-    try:
-        file_bytes = await file.read()
-    except Exception as e:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Could not read file: {str(e)}"
-        )
+# Everything about a resume that does not depend on role or experience
+def analyze_document(text: str, taxonomy: Optional[Taxonomy] = None) -> Tuple[ResumeFeatures, Dict]:
+    with stage("clean"):
+        clean_text = simple_clean(text)
+    features = extract_features(clean_text, taxonomy)
+    with stage("document_scores"):
+        return features, compute_document_scores(features)
 
-    # Check file size (limit to 10MB)
-    if len(file_bytes) > 10 * 1024 * 1024:
-        raise HTTPException(
-            status_code=400,
-            detail="File too large. Maximum size is 10MB"
-        )
 
-    # Extract text
+RESUME_CACHE = AnalysisCache(
+    max_entries=CACHE_MAX_ENTRIES,
+    db_path=CACHE_DB_PATH,
+    db_max_entries=CACHE_DB_MAX_ENTRIES,
+)
+
+RESUME_INDEX = ResumeIndex(db_path=INDEX_DB_PATH, max_documents=INDEX_MAX_DOCUMENTS)
+
+EDIT_SESSIONS = EditSessions(max_entries=EDIT_SESSION_MAX_ENTRIES, ttl_seconds=EDIT_SESSION_TTL_SECONDS)
+
+# Cached features were built with the old skills and verbs
+TAXONOMY.on_swap(lambda taxonomy: RESUME_CACHE.clear_memory())
+TAXONOMY.on_swap(lambda taxonomy: EDIT_SESSIONS.clear())
+
+
+class ExtractionError(Exception):
+    """Text extraction failed; picklable so it can cross the worker pool."""
+
+
+# Text extraction: route by file signature, trial-parse only unknown formats.
+# Also returns the page counts of a PDF (None for DOCX).
+def extract_resume_text(file_bytes: bytes) -> Tuple[str, Optional[Dict]]:
+    file_type = sniff_file_type(file_bytes)
+    if file_type is not None:
+        try:
+            if file_type == "pdf":
+                return extract_text_from_pdf_bytes(file_bytes)
+            return extract_text_from_docx_bytes(file_bytes), None
+        except Exception as e:
+            raise ExtractionError(f"Text extraction failed: {str(e)}")
+
     try:
-        text = extract_text_from_pdf_bytes(file_bytes)
+        text, pages = extract_text_from_pdf_bytes(file_bytes)
         if len(text.strip()) < 50:
-            text = extract_text_from_docx_bytes(file_bytes)
+            text, pages = extract_text_from_docx_bytes(file_bytes), None
+            annotate(docx_fallback=True)
     except Exception:
         try:
-            text = extract_text_from_docx_bytes(file_bytes)
+            text, pages = extract_text_from_docx_bytes(file_bytes), None
+            annotate(docx_fallback=True)
         except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Text extraction failed: {str(e)}"
-            )
+            raise ExtractionError(f"Text extraction failed: {str(e)}")
+    return text, pages
+
+
+# The page counts of a PDF go with its document scores into the response
+def with_page_counts(document: Tuple[ResumeFeatures, Dict], pages: Optional[Dict]) -> Tuple[ResumeFeatures, Dict]:
+    if pages is not None:
+        document[1]["pages"] = pages
+    return document
+
+
+# Streaming mode for large PDFs. Returns the cleaned text (what the cache keeps:
+# analyze_document gives the same record for it) and the analysis, or None
+# when the text is too short.
+def analyze_pdf_streaming(b: bytes, taxonomy: Taxonomy) -> Tuple[str, Optional[Tuple[ResumeFeatures, Dict]]]:
+    page_count = 0
+
+    def pages() -> Iterator[str]:
+        nonlocal page_count
+        parsed = iter_pdf_pages(b, PDF_BACKEND, PDF_MAX_PAGES)
+        while True:
+            try:
+                text = next(parsed)
+            except StopIteration:
+                return
+            except Exception as e:
+                raise ExtractionError(f"Text extraction failed: {str(e)}")
+            page_count += 1
+            yield text
+
+    with stage("stream_analysis"):
+        features = stream_features(pages(), taxonomy.skill_matcher, taxonomy.verbs)
+    set_labels(pages=page_bucket(page_count))
+    if len(features.text) < 50:
+        return features.text, None
+    with stage("document_scores"):
+        document = features, compute_document_scores(features)
+    return features.text, with_page_counts(document, pdf_page_counts(b, page_count))
+
+
+# Runs in a worker process: parse the file and analyze the text if usable.
+# Also returns the taxonomy version the analysis was built with.
+def process_resume_bytes(
+    source: "ResumeSource",
+    taxonomy_version: Optional[str] = None
+) -> Tuple[str, Optional[Tuple[ResumeFeatures, Dict]], str]:
+    taxonomy = TAXONOMY.ensure(taxonomy_version)
+    file_bytes = read_resume(source)
+    if len(file_bytes) >= PDF_STREAM_MIN_BYTES and sniff_file_type(file_bytes) == "pdf":
+        text, document = analyze_pdf_streaming(file_bytes, taxonomy)
+        return text, document, taxonomy.version
+    text, pages = extract_resume_text(file_bytes)
+    if len(text.strip()) < 50:
+        return text, None, taxonomy.version
+    return text, with_page_counts(analyze_document(text, taxonomy), pages), taxonomy.version
+
+
+# Runs in a worker process: the page count of a PDF, 0 if it can't be read
+# (the whole-file path then reports the error)
+def count_resume_pages(source: "ResumeSource") -> int:
+    with stage("count_pages"):
+        try:
+            return count_pdf_pages(read_resume(source))
+        except Exception:
+            return 0
+
 
+# Runs in a worker process: the text of pages [start, end) of a PDF
+def extract_resume_pages(source: "ResumeSource", start: int, end: int) -> List[str]:
+    with stage("extract_pdf"):
+        try:
+            return extract_pdf_page_range(read_resume(source), PDF_BACKEND, start, end)
+        except Exception as e:
+            raise ExtractionError(f"Text extraction failed: {str(e)}")
+
+
+# Runs in a worker process: analyze the pages of a PDF extracted by
+# extract_resume_pages jobs, like process_resume_bytes
+def process_resume_pages(
+    pages: List[str],
+    total_pages: int,
+    taxonomy_version: Optional[str] = None
+) -> Tuple[str, Optional[Tuple[ResumeFeatures, Dict]], str]:
+    taxonomy = TAXONOMY.ensure(taxonomy_version)
+    set_labels(pages=page_bucket(len(pages)))
+    text = "\n".join(page for page in pages if page)
     if len(text.strip()) < 50:
+        return text, None, taxonomy.version
+    document = analyze_document(text, taxonomy)
+    return text, with_page_counts(document, page_counts(total_pages, len(pages))), taxonomy.version
+
+
+# Runs in a worker process: rebuild the analysis of a resume from the text and
+# page counts kept in the cache's sqlite tier, like process_resume_bytes
+def rebuild_resume(
+    text: str,
+    pages: Optional[Dict],
+    taxonomy_version: Optional[str] = None
+) -> Tuple[str, Optional[Tuple[ResumeFeatures, Dict]], str]:
+    taxonomy = TAXONOMY.ensure(taxonomy_version)
+    return text, with_page_counts(analyze_document(text, taxonomy), pages), taxonomy.version
+
+
+# Runs in a worker process: analyze resume text from the editor. Blocks of the
+# text that are unchanged since the previous analysis keep their features.
+# Also returns every block, what was re-analyzed and the taxonomy version.
+def process_resume_text(
+    text: str,
+    previous_blocks: Sequence[BlockFeatures],
+    taxonomy_version: str
+) -> Tuple[ResumeFeatures, Dict, List[BlockFeatures], Dict, str]:
+    taxonomy = TAXONOMY.ensure(taxonomy_version)
+    known = {}
+    if taxonomy.version == taxonomy_version:
+        known = {block.text: block for block in previous_blocks}
+
+    with stage("clean"):
+        clean_text = simple_clean(text)
+    with stage("split_blocks"):
+        block_texts = split_blocks(clean_text)
+
+    blocks = []
+    reanalyzed_blocks = 0
+    reanalyzed_sections: Dict[str, None] = {}  # ordered set
+    current_section = "header"
+    with stage("block_features"):
+        for block_text in block_texts:
+            block = known.get(block_text)
+            fresh = block is None
+            if fresh:
+                block = BlockFeatures(block_text, taxonomy.skill_matcher, taxonomy.verbs)
+                reanalyzed_blocks += 1
+            for section, content, _ in block.sections:
+                current_section = section or current_section
+                if fresh and (section or content):
+                    reanalyzed_sections[current_section] = None
+            blocks.append(block)
+
+    with stage("merge_blocks"):
+        features = merge_blocks(clean_text, blocks, taxonomy.skill_matcher, taxonomy.verbs)
+    with stage("document_scores"):
+        document_scores = compute_document_scores(features)
+    changes = {
+        "blocks": len(blocks),
+        "blocks_reanalyzed": reanalyzed_blocks,
+        "sections_reanalyzed": list(reanalyzed_sections),
+    }
+    return features, document_scores, blocks, changes, taxonomy.version
+
+
+WORKER_CRASHED_DETAIL = "Resume analysis was interrupted by a worker crash. Please retry shortly."
+
+
+# Hand work to the worker pool, or shed load when it is full. The job runs
+# under its own Profile; await it with run_analysis.
+def submit_analysis(fn, *args) -> Future:
+    try:
+        return ANALYSIS_POOL.submit(run_profiled, fn, *args)
+    except PoolBusy:
         raise HTTPException(
-            status_code=400,
-            detail="Resume text too short or empty. Please ensure your PDF contains readable text."
+            status_code=503,
+            detail="Resume analyzer is busy. Please retry shortly.",
+            headers={"Retry-After": "5"}
         )
 
-    # Clean and analyze
-    clean_text = simple_clean(text)
-    sections = extract_sections(clean_text)
-    found_skills, skill_frequency = extract_skills(clean_text)
 
-    # Compute scores
-    ats_score, detailed_scores = compute_scores(
-        clean_text,
-        found_skills,
-        skill_frequency,
-        sections,
-        role,
-        experience
-    )
+# Wait for a job from submit_analysis. Its stage timings join the current
+# request's, next to the time the request spent on it (queueing included).
+# A worker that died with the job in flight (the pool replaces itself) is a
+# 503 too.
+async def run_analysis(future: Future) -> Tuple[Any, Profile]:
+    start = time.perf_counter()
+    try:
+        result, worker_profile = await asyncio.wrap_future(future)
+    except BrokenProcessPool:
+        WORKER_CRASHES.inc()
+        raise HTTPException(status_code=503, detail=WORKER_CRASHED_DETAIL, headers={"Retry-After": "5"})
+    profile = current_profile()
+    if profile is not None:
+        profile.merge(worker_profile)
+        profile.record("analysis_pool", time.perf_counter() - start)
+    return result, worker_profile
+
+
+# Analyze a cache miss in the worker pool. While workers are idle, a PDF of at
+# least PDF_PARALLEL_MIN_PAGES pages is split into page ranges extracted as
+# separate pool jobs; they count against the pool like any other job, so
+# concurrent long uploads queue (or get a 503) instead of adding processes.
+async def run_resume_analysis(source: "ResumeSource") -> Tuple[Tuple, Profile]:
+    taxonomy_version = TAXONOMY.current.version
+    if (PDF_PARALLEL_MIN_PAGES and ANALYSIS_POOL.idle_workers() > 1
+            and resume_size(source) < PDF_STREAM_MIN_BYTES and sniff_file_type(resume_head(source)) == "pdf"):
+        total_pages, _ = await run_analysis(submit_analysis(count_resume_pages, source))
+        n_pages = min(total_pages, PDF_MAX_PAGES) if PDF_MAX_PAGES else total_pages
+        parts = min(ANALYSIS_POOL.idle_workers(), n_pages)
+        if n_pages >= PDF_PARALLEL_MIN_PAGES and parts > 1:
+            futures = [
+                submit_analysis(extract_resume_pages, source, start, end)
+                for start, end in split_pages(n_pages, parts)
+            ]
+            chunks = await asyncio.gather(*(run_analysis(future) for future in futures))
+            pages = [text for chunk, _ in chunks for text in chunk]
+            return await run_analysis(submit_analysis(process_resume_pages, pages, total_pages, taxonomy_version))
+    return await run_analysis(submit_analysis(process_resume_bytes, source, taxonomy_version))
+
+
+# Cache a worker result, or report why the text was unusable.
+# Results built with a taxonomy that has since been replaced are not cached.
+def finish_resume(key: str, result: Tuple, too_short_detail: str) -> Tuple[ResumeFeatures, Dict]:
+    text, document, taxonomy_version = result
+    if document is None:
+        raise HTTPException(status_code=400, detail=too_short_detail)
+
+    if taxonomy_version == TAXONOMY.current.version:
+        RESUME_CACHE.put(key, text, document, {"pages": document[1].get("pages")})
+    return document
+
+
+# Content hash identifying an uploaded file (cache and search index key)
+def resume_key(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+# A resume file: its bytes, or the path of an upload spooled to disk. Worker
+# jobs open a path themselves, so the server process never holds such a file.
+ResumeSource = Union[bytes, str]
+
+
+def read_resume(source: ResumeSource) -> bytes:
+    return Path(source).read_bytes() if isinstance(source, str) else source
+
+
+# The first KB of a resume file: enough for sniff_file_type
+def resume_head(source: ResumeSource) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read(1024)
+    return source[:1024]
+
+
+def resume_size(source: ResumeSource) -> int:
+    return os.path.getsize(source) if isinstance(source, str) else len(source)
+
+
+# Cached document analysis keyed by the file content. A hit in the sqlite
+# tier is re-analyzed from its stored text in the worker pool, like a miss.
+async def load_resume(key: str, source: ResumeSource, too_short_detail: str) -> Tuple[ResumeFeatures, Dict]:
+    file_type = sniff_file_type(resume_head(source)) or "unknown"
+    set_labels(file_type=file_type, pages="n/a")
+    document = RESUME_CACHE.get(key)
+    if document is not None:
+        return document
+    stored = RESUME_CACHE.stored(key)
+    if stored is not None:
+        text, meta = stored
+        future = submit_analysis(rebuild_resume, text, meta.get("pages"), TAXONOMY.current.version)
+        result, _ = await run_analysis(future)
+        return finish_resume(key, result, too_short_detail)
 
-    # Extra meta info for better reports
-    contact_info = extract_contact_info(clean_text)
-    experience_summary = analyze_experience(sections.get("experience", ""), experience)
-    ats_checks = check_ats_optimization(clean_text, sections)
+    try:
+        result, worker_profile = await run_resume_analysis(source)
+    except ExtractionError as e:
+        EXTRACTION_FAILURES.inc(file_type=file_type)
+        raise HTTPException(status_code=500, detail=str(e))
+    if worker_profile.info.get("docx_fallback"):
+        DOCX_FALLBACKS.inc()
+    document = finish_resume(key, result, too_short_detail)
+    if (document[1].get("pages") or {}).get("truncated"):
+        PDF_TRUNCATIONS.inc()
+    return document
+
+
+# Build the full analysis response for one role / experience
+def analyze_resume(
+    features: ResumeFeatures,
+    document_scores: Dict,
+    name: str,
+    role: str,
+    experience: str
+) -> Dict:
+    taxonomy = TAXONOMY.current
+    experience_summary = features.experience_summary(experience)
+
+    # Compute scores
+    with stage("scores"):
+        ats_score, detailed_scores = compute_scores(features, role, experience_summary, document_scores, taxonomy)
 
     # Generate recommendations
-    recommendations = generate_recommendations(
-        detailed_scores,
-        found_skills,
-        sections,
-        role,
-        clean_text
-    )
+    with stage("recommendations"):
+        recommendations = generate_recommendations(detailed_scores, features, role, taxonomy)
 
     # Get missing skills
-    role_lower = role.lower() if role else ""
     missing_required = []
     missing_preferred = []
 
-    if role_lower in ROLE_SKILLS:
-        role_info = ROLE_SKILLS[role_lower]
-        found_set = set(found_skills)
-        missing_required = [s for s in role_info["must_have"] if s not in found_set]
-        missing_preferred = [s for s in role_info["good_to_have"] if s not in found_set]
+    role_info = taxonomy.role(role)
+    if role_info is not None:
+        found_set = set(features.found_skills)
+        missing_required = [s for s in role_info.must_have if s not in found_set]
+        missing_preferred = [s for s in role_info.good_to_have if s not in found_set]
 
     # Top skills by frequency
-    top_skills = sorted(skill_frequency.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_skills = sorted(features.skill_frequency.items(), key=lambda x: x[1], reverse=True)[:10]
 
     # Skills match percentage (more meaningful than overall score again)
     skills_match_pct = 0.0
@@ -672,18 +907,19 @@ async def upload_and_analyze(
             "ATS Optimization": detailed_scores["ats_optimization"]
         },
         "analysis": {
-            "skills_found": found_skills,
-            "total_skills": len(found_skills),
+            "skills_found": list(features.found_skills),
+            "total_skills": len(features.found_skills),
             "top_skills": [{"skill": s, "frequency": f} for s, f in top_skills],
             "missing_required_skills": missing_required,
             "missing_preferred_skills": missing_preferred[:5],
-            "sections_found": list(sections.keys()),
-            "word_count": len(clean_text.split()),
+            "sections_found": list(features.sections.keys()),
+            "word_count": features.word_count,
         },
         "meta": {
-            "contact_info": contact_info,
+            "contact_info": features.contact_info,
             "experience_summary": experience_summary,
-            "ats_checks": ats_checks
+            "ats_checks": features.ats_checks,
+            "pages": document_scores.get("pages")
         },
         "recommendations": recommendations,
         "next_steps": [
@@ -695,138 +931,516 @@ async def upload_and_analyze(
     }
 
 
+# ---------- Batch analysis ----------
+
+# Expand one uploaded file into resumes: a ZIP archive yields its PDF/DOCX members
+def expand_batch_upload(filename: str, data: bytes) -> List[Tuple[str, bytes]]:
+    if not zipfile.is_zipfile(io.BytesIO(data)):
+        return [(filename, data)]
+
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        return [(filename, data)]
+
+    with archive:
+        names = archive.namelist()
+        if "word/document.xml" in names:
+            return [(filename, data)]  # a DOCX, not an archive of resumes
+
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(RESUME_EXTENSIONS)
+            and not info.filename.startswith("__MACOSX/")
+        ]
+        if sum(info.file_size for info in members) > BATCH_MAX_BYTES:
+            raise HTTPException(status_code=400, detail=f"Archive {filename} is too large to screen")
+        return [(info.filename, archive.read(info)) for info in members]
+
+
+# Read a multi-file upload: PDF/DOCX files and ZIP archives of them.
+# Returns the resumes to analyze and per-file errors for rejected uploads.
+async def read_batch_uploads(files: List[UploadFile]) -> Tuple[List[Tuple[str, bytes]], List[Dict]]:
+    items = []
+    rejected = []
+    total_bytes = 0
+    for upload in files:
+        filename = upload.filename or "resume"
+        if not filename.lower().endswith(RESUME_EXTENSIONS + ('.zip',)):
+            rejected.append(batch_error(filename, 400, "Only PDF, DOCX and ZIP files are supported"))
+            continue
+
+        try:
+            data = await upload.read()
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Could not read file {filename}: {str(e)}")
+
+        total_bytes += len(data)
+        if total_bytes > BATCH_MAX_BYTES:
+            raise HTTPException(status_code=400, detail="Batch too large")
+        items.extend(expand_batch_upload(filename, data))
+
+    if not items and not rejected:
+        raise HTTPException(status_code=400, detail="No PDF or DOCX resumes found in upload")
+    if len(items) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many resumes. Maximum is {BATCH_MAX_FILES} per batch")
+    return items, rejected
+
+
+# One NDJSON record per resume in a batch
+def batch_result(filename: str, report: Dict) -> Dict:
+    return {"type": "result", "file": filename, **report}
+
+
+def batch_error(filename: str, status_code: int, detail: str) -> Dict:
+    return {"type": "result", "file": filename, "success": False, "status_code": status_code, "error": detail}
+
+
+# Final NDJSON record: successful results ranked by ATS score and by skills match
+def rank_batch_results(results: List[Dict], role: str) -> Dict:
+    scored = [
+        {
+            "file": r["file"],
+            "candidate_name": r["candidate_name"],
+            "ats_score": r["ats_score"],
+            "skills_match": r["detailed_scores"]["Skills Match"],
+        }
+        for r in results if r.get("success")
+    ]
+    by_ats = sorted(scored, key=lambda r: (-r["ats_score"], -r["skills_match"], r["file"]))
+    by_skills = sorted(scored, key=lambda r: (-r["skills_match"], -r["ats_score"], r["file"]))
+    return {
+        "type": "ranking",
+        "role": role or "General",
+        "total": len(results),
+        "analyzed": len(scored),
+        "failed": len(results) - len(scored),
+        "by_ats_score": [{"rank": i + 1, **r} for i, r in enumerate(by_ats)],
+        "by_skills_match": [{"rank": i + 1, **r} for i, r in enumerate(by_skills)],
+    }
+
+
+# Load one batch member; waits for pool capacity instead of failing with 503
+async def load_batch_document(data: bytes) -> Tuple[str, ResumeFeatures, Dict]:
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB")
+
+    key = resume_key(data)
+    crashes = 0
+    while True:
+        try:
+            features, document_scores = await load_resume(key, data, "Resume text too short or empty")
+            return key, features, document_scores
+        except HTTPException as e:
+            if e.status_code != 503:
+                raise
+            if e.detail == WORKER_CRASHED_DETAIL:
+                crashes += 1
+                if crashes > 1:  # likely this file crashing the worker: report it
+                    raise
+            await asyncio.sleep(BATCH_RETRY_SECONDS)
+
+
+# Stages of one batch member are labeled with its own file type and page
+# count, and still add up into the request's timings
+def batch_item_profile() -> Profile:
+    return Profile(STAGE_SECONDS, parent=current_profile())
+
+
+# Analyze one batch member
+async def analyze_batch_item(
+    filename: str,
+    data: bytes,
+    user_id: str,
+    role: str,
+    experience: str,
+    index: bool = False
+) -> Dict:
+    with batch_item_profile():
+        try:
+            key, features, document_scores = await load_batch_document(data)
+        except HTTPException as e:
+            return batch_error(filename, e.status_code, e.detail)
+
+        report = analyze_resume(features, document_scores, Path(filename).stem, role, experience)
+    if index:
+        RESUME_INDEX.add_report(user_id, key, report)
+    return batch_result(filename, report)
+
+
+# Load one /match-job member
+async def load_job_candidate(data: bytes) -> Tuple[str, ResumeFeatures, Dict]:
+    with batch_item_profile():
+        return await load_batch_document(data)
+
+
+# Stream NDJSON lines as resumes finish, keeping one job in flight per worker
+async def stream_batch(
+    items: List[Tuple[str, bytes]],
+    user_id: str,
+    role: str,
+    experience: str,
+    rejected: Optional[List[Dict]] = None,
+    index: bool = False
+) -> AsyncIterator[str]:
+    queue = iter(items)
+    pending = set()
+    results = list(rejected or [])
+    for result in results:
+        yield json.dumps(result) + "\n"
+
+    def start_next():
+        item = next(queue, None)
+        if item is not None:
+            pending.add(asyncio.ensure_future(analyze_batch_item(*item, user_id, role, experience, index)))
+
+    for _ in range(ANALYSIS_POOL.workers):
+        start_next()
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending -= done
+            for task in done:
+                result = task.result()
+                results.append(result)
+                start_next()
+                yield json.dumps(result) + "\n"
+        yield json.dumps(rank_batch_results(results, role)) + "\n"
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# ---------- Warm-up ----------
+
+def import_modules(*names: str):
+    for name in names:
+        importlib.import_module(name)
+
+
+# Runs once in every analysis worker: the parsers are only used there
+def warm_worker() -> int:
+    warm_up_pdf_parser(PDF_BACKEND)
+    import_modules("docx")
+    return os.getpid()
+
+
+# Workers are forked first: forking while this thread is halfway through
+# importing NumPy can leave the child with locks nobody will release
+READINESS = Readiness()
+READINESS.add_step("analysis_workers", lambda: {"started": ANALYSIS_POOL.prestart(warm_worker)})
+READINESS.add_step("job_matcher", lambda: import_modules("jd_match"))
+READINESS.add_step("http_client", lambda: import_modules("httpx"))
+
+
+# ---------- Endpoints ----------
+
+# Multipart body of /upload-and-analyze, for the OpenAPI docs (the endpoint reads the stream itself)
+UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file", "userId"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "userId": {"type": "string"},
+                        "name": {"type": "string", "default": ""},
+                        "role": {"type": "string", "default": ""},
+                        "experience": {"type": "string", "default": ""},
+                        "index": {"type": "boolean", "default": False},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+# Boolean form field, as FastAPI's Form(bool) parses it
+def form_flag(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "on", "yes")
+
+
+def check_resume_filename(filename: str):
+    if not (filename.endswith('.pdf') or filename.endswith('.docx')):
+        raise UploadRejected("Only PDF and DOCX files are supported")
+
+
+# NEW ENDPOINT: Direct file upload and analysis
+@app.post("/upload-and-analyze", openapi_extra=UPLOAD_FORM_SCHEMA)
+async def upload_and_analyze(request: Request):
+    """
+    Accept PDF/DOCX file directly from frontend and analyze it.
+    No external storage needed - the file is deleted after the response.
+
+    The body is streamed: the file type is checked as soon as the file part
+    starts, uploads over 10MB are cut off as soon as the limit is crossed,
+    and the content hash (the cache key) is computed on the way in. Files
+    over 1MB are spooled to a temporary file that the analysis worker opens
+    by path, so this process holds at most 1MB of an upload.
+    """
+    try:
+        upload = await receive_upload(request, "file", MAX_UPLOAD_BYTES, check_resume_filename)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    try:
+        missing = [
+            {"type": "missing", "loc": ("body", field), "msg": "Field required", "input": None}
+            for field, present in (("file", upload.filename is not None), ("userId", "userId" in upload.fields))
+            if not present
+        ]
+        if missing:
+            raise RequestValidationError(missing)
+
+        # Large files are read by the worker from the spooled file
+        features, document_scores = await load_resume(
+            upload.sha256,
+            upload.source(),
+            "Resume text too short or empty. Please ensure your PDF contains readable text."
+        )
+    finally:
+        upload.close()
+
+    fields = upload.fields
+    report = analyze_resume(
+        features, document_scores, fields.get("name", ""), fields.get("role", ""), fields.get("experience", "")
+    )
+    if form_flag(fields.get("index", "")):
+        RESUME_INDEX.add_report(fields["userId"], upload.sha256, report)
+    return report
+
+
 @app.get("/health")
 def health():
-    return {"status": "ok", "version": "2.1"}
+    return {
+        "status": "ok",
+        "version": "2.1",
+        "cache": RESUME_CACHE.stats(),
+        "index": RESUME_INDEX.stats(),
+        "taxonomy": TAXONOMY.stats(),
+        "workers": ANALYSIS_POOL.stats(),
+        "downloads": RESUME_DOWNLOADER.stats(),
+        "edit_sessions": EDIT_SESSIONS.stats()
+    }
+
+
+# Prometheus scrape endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+
+# Readiness probe: 503 until the warm-up steps have finished (200 from the
+# start with RESUME_WARMUP=0)
+@app.get("/ready")
+def ready():
+    state = READINESS.stats()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
 
 
 @app.get("/roles")
 def get_roles():
     """Get list of supported roles."""
+    taxonomy = TAXONOMY.current
     return {
-        "roles": list(ROLE_SKILLS.keys()),
-        "total": len(ROLE_SKILLS)
+        "roles": list(taxonomy.roles.keys()),
+        "total": len(taxonomy.roles),
+        "taxonomy_version": taxonomy.version
     }
 
 
 # OLD ENDPOINT: URL-based analysis (keep for backward compatibility)
 @app.post("/analyze")
-def analyze(req: AnalyzeRequest):
+async def analyze(req: AnalyzeRequest):
     """Enhanced resume analysis from URL."""
     try:
-        file_bytes = download_file(req.resumeUrl)
+        file_bytes = await download_file(req.resumeUrl)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Could not download resume: {e}")
 
-    try:
-        text = extract_text_from_pdf_bytes(file_bytes)
-        if len(text.strip()) < 50:
-            text = extract_text_from_docx_bytes(file_bytes)
-    except Exception:
-        try:
-            text = extract_text_from_docx_bytes(file_bytes)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Text extraction failed: {e}")
+    key = resume_key(file_bytes)
+    features, document_scores = await load_resume(key, file_bytes, "Resume text too short or empty")
+    report = analyze_resume(features, document_scores, req.name, req.role, req.experience)
+    if req.index:
+        RESUME_INDEX.add_report(req.userId, key, report)
+    return report
 
-    if len(text.strip()) < 50:
+
+# Editor flow: analyze resume text. Pass the analysis_id of the previous
+# version as previousAnalysisId and only the changed parts are re-analyzed.
+@app.post("/analyze-text")
+async def analyze_text(req: AnalyzeTextRequest):
+    """Resume analysis from plain text, incremental across edits."""
+    if len(req.text) > MAX_RESUME_TEXT_CHARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Resume text too long. Maximum is {MAX_RESUME_TEXT_CHARS} characters"
+        )
+    if len(req.text.strip()) < 50:
         raise HTTPException(status_code=400, detail="Resume text too short or empty")
 
-    clean_text = simple_clean(text)
-    sections = extract_sections(clean_text)
-    found_skills, skill_frequency = extract_skills(clean_text)
-
-    ats_score, detailed_scores = compute_scores(
-        clean_text,
-        found_skills,
-        skill_frequency,
-        sections,
-        req.role,
-        req.experience
+    taxonomy_version = TAXONOMY.current.version
+    previous = None
+    if req.previousAnalysisId:
+        previous = EDIT_SESSIONS.get(req.userId, req.previousAnalysisId)
+    previous_blocks = ()
+    if previous is not None and previous.taxonomy_version == taxonomy_version:
+        previous_blocks = previous.blocks
+
+    set_labels(file_type="text", pages="n/a")
+    result, _ = await run_analysis(
+        submit_analysis(process_resume_text, req.text, previous_blocks, taxonomy_version)
     )
+    features, document_scores, blocks, changes, taxonomy_version = result
+    report = analyze_resume(features, document_scores, req.name, req.role, req.experience)
+    report["analysis_id"] = EDIT_SESSIONS.put(req.userId, taxonomy_version, blocks)
+    report["incremental"] = {
+        "previous_analysis_id": req.previousAnalysisId,
+        "previous_found": previous is not None,
+        **changes,
+    }
+    return report
 
-    contact_info = extract_contact_info(clean_text)
-    experience_summary = analyze_experience(sections.get("experience", ""), req.experience)
-    ats_checks = check_ats_optimization(clean_text, sections)
 
-    recommendations = generate_recommendations(
-        detailed_scores,
-        found_skills,
-        sections,
-        req.role,
-        clean_text
+# Bulk screening: many resumes (or ZIP archives of them) against one role
+@app.post("/batch-analyze")
+async def batch_analyze(
+    files: List[UploadFile] = File(...),
+    userId: str = Form(...),
+    role: str = Form(""),
+    experience: str = Form(""),
+    index: bool = Form(False)
+):
+    """
+    Analyze a list of PDF/DOCX files and/or ZIP archives in parallel.
+    Streams one NDJSON line per resume as it finishes, then a ranking line.
+    With index=true the results are added to the user's /search index.
+    """
+    items, rejected = await read_batch_uploads(files)
+    return StreamingResponse(
+        stream_batch(items, userId, role, experience, rejected, index),
+        media_type="application/x-ndjson"
     )
 
-    role_lower = req.role.lower() if req.role else ""
-    missing_required = []
-    missing_preferred = []
 
-    if role_lower in ROLE_SKILLS:
-        role_info = ROLE_SKILLS[role_lower]
-        found_set = set(found_skills)
-        missing_required = [s for s in role_info["must_have"] if s not in found_set]
-        missing_preferred = [s for s in role_info["good_to_have"] if s not in found_set]
+# Split a comma-separated query parameter into terms
+def split_terms(value: str) -> List[str]:
+    return [t for t in (v.strip() for v in value.split(",")) if t]
 
-    top_skills = sorted(skill_frequency.items(), key=lambda x: x[1], reverse=True)[:10]
 
-    skills_match_pct = 0.0
-    if detailed_scores["skills_match"] > 0:
-        skills_match_pct = round((detailed_scores["skills_match"] / 25) * 100, 1)
+# Search the resumes a user indexed, e.g.
+# /search?userId=u1&skills=python,docker&rank_by=skills_match
+@app.get("/search")
+def search(
+    userId: str,
+    skills: str = "",
+    any_skills: str = "",
+    sections: str = "",
+    role: Optional[str] = None,
+    min_score: float = 0,
+    rank_by: str = "ats_score",
+    k: int = Query(10, ge=1, le=SEARCH_MAX_K)
+):
+    """
+    Top-k of the user's indexed resumes that have ALL of `skills`, ANY of
+    `any_skills` and ALL of `sections` (comma-separated), ranked by
+    `rank_by`. Only resumes analyzed with index=true are searchable.
+    """
+    if rank_by not in RANK_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"rank_by must be one of: {', '.join(RANK_FIELDS)}"
+        )
+
+    return RESUME_INDEX.search(
+        skills=split_terms(skills),
+        any_skills=split_terms(any_skills),
+        sections=split_terms(sections),
+        user_id=userId,
+        role=role,
+        min_score=min_score,
+        rank_by=rank_by,
+        k=k,
+    )
+
+
+# Remove one of the user's resumes from the search index
+@app.delete("/search/{resume_id}")
+def delete_from_index(resume_id: str, userId: str):
+    if not RESUME_INDEX.delete(userId, resume_id):
+        raise HTTPException(status_code=404, detail="Resume not found in index")
+    return {"deleted": True, "user_id": userId, "resume_id": resume_id}
 
-    if ats_score >= 80:
-        score_label = "Excellent"
-        score_color = "green"
-    elif ats_score >= 60:
-        score_label = "Good"
-        score_color = "blue"
-    elif ats_score >= 40:
-        score_label = "Fair"
-        score_color = "orange"
-    else:
-        score_label = "Needs Improvement"
-        score_color = "red"
 
+# Match resumes against an arbitrary job description
+@app.post("/match-job")
+async def match_job(
+    files: List[UploadFile] = File(...),
+    userId: str = Form(...),
+    job_description: str = Form(...)
+):
+    """
+    Score one or more resumes (PDF/DOCX or ZIP archives) against a job
+    description by TF-IDF cosine similarity over skills and word n-grams.
+    Results are ordered by match_score.
+    """
+    job_description = job_description.strip()
+    if not job_description:
+        raise HTTPException(status_code=400, detail="Job description is empty")
+    if len(job_description) > MAX_JOB_DESCRIPTION_CHARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job description too long. Maximum is {MAX_JOB_DESCRIPTION_CHARS} characters"
+        )
+
+    set_labels(file_type="batch", pages="n/a")
+    items, errors = await read_batch_uploads(files)
+    loaded = await asyncio.gather(
+        *(load_job_candidate(data) for _, data in items),
+        return_exceptions=True
+    )
+
+    matched = []
+    for (filename, _), document in zip(items, loaded):
+        if isinstance(document, HTTPException):
+            errors.append(batch_error(filename, document.status_code, document.detail))
+        elif isinstance(document, BaseException):
+            raise document
+        else:
+            matched.append((filename, document[1]))
+
+    from jd_match import JobMatcher  # NumPy/SciPy load on first use
+
+    with stage("job_match"):
+        scored = JobMatcher(TAXONOMY.current.skill_matcher).match(
+            job_description,
+            [(features.text, features.skill_frequency) for _, features in matched]
+        )
+    results = sorted(
+        (
+            {"file": filename, "candidate_name": Path(filename).stem, **result}
+            for (filename, _), result in zip(matched, scored["results"])
+        ),
+        key=lambda r: (-r["match_score"], r["file"])
+    )
     return {
         "success": True,
-        "candidate_name": req.name or "Candidate",
-        "role": req.role or "General",
-        "experience": req.experience or "Not specified",
-        "ats_score": ats_score,
-        "score_label": score_label,
-        "score_color": score_color,
-        "match_percentage": skills_match_pct,
-        "detailed_scores": {
-            "Format & Structure": detailed_scores["format_structure"],
-            "Contact Information": detailed_scores["contact_info"],
-            "Skills Match": detailed_scores["skills_match"],
-            "Experience Quality": detailed_scores["experience_quality"],
-            "Education": detailed_scores["education"],
-            "Achievements & Impact": detailed_scores["achievements_impact"],
-            "ATS Optimization": detailed_scores["ats_optimization"]
-        },
-        "analysis": {
-            "skills_found": found_skills,
-            "total_skills": len(found_skills),
-            "top_skills": [{"skill": s, "frequency": f} for s, f in top_skills],
-            "missing_required_skills": missing_required,
-            "missing_preferred_skills": missing_preferred[:5],
-            "sections_found": list(sections.keys()),
-            "word_count": len(clean_text.split()),
-        },
-        "meta": {
-            "contact_info": contact_info,
-            "experience_summary": experience_summary,
-            "ats_checks": ats_checks
-        },
-        "recommendations": recommendations,
-        "next_steps": [
-            "Address all critical issues immediately",
-            "Add missing required skills if you have them",
-            "Quantify achievements with specific metrics",
-            "Review and implement suggested improvements"
-        ]
+        "job_skills": scored["job_skills"],
+        "total": len(matched) + len(errors),
+        "results": [{"rank": i + 1, **r} for i, r in enumerate(results)],
+        "errors": [{k: v for k, v in e.items() if k != "type"} for e in errors],
     }
 
 
+
 # ADDED: Uvicorn runner for local development
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(app, host="127.0.0.1", port=8000)
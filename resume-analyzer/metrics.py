@@ -0,0 +1,279 @@
+import contextvars
+import json
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds (seconds) for stage and request latency histograms
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_text(names: Sequence[str], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, one series per combination of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.labels:
+            values = [((), 0)]
+        return [f"{self.name}_total{_label_text(self.labels, key)} {_number(v)}" for key, v in values]
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics), one series per label combination."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        names = self.labels + ("le",)
+        lines = []
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{self.name}_bucket{_label_text(names, key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {total!r}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics served by /metrics, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (), **kwargs) -> Histogram:
+        metric = Histogram(name, help_text, labels, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# ---------- Stage timing ----------
+# Code marks its stages with `with stage("name"):`. The timings go to the
+# Profile active in the current context (a request, a batch item, a worker
+# job); with none active, stage() only costs two clock reads.
+
+_PROFILE: "contextvars.ContextVar[Optional[Profile]]" = contextvars.ContextVar("profile", default=None)
+
+
+class Profile:
+    """
+    Stage timings of one unit of work.
+
+    - `labels` (e.g. file_type, pages) are attached to every observation
+    - with a `histogram`, each stage is observed as it completes; without
+      one (in a worker process) timings are only collected, to be sent back
+      and merge()d into the submitting request's Profile
+    - timings also roll up into `parent`, e.g. a batch item into its request
+    - `info` carries facts about the work (e.g. a format fallback) to the
+      code that counts them
+    """
+
+    def __init__(
+        self,
+        histogram: Optional[Histogram] = None,
+        parent: Optional["Profile"] = None,
+        **labels: str
+    ):
+        self.histogram = histogram
+        self.parent = parent
+        self.labels: Dict[str, str] = dict(labels)
+        self.timings: Dict[str, float] = {}
+        self.info: Dict[str, Any] = {}
+
+    def record(self, name: str, seconds: float):
+        profile = self
+        while profile is not None:
+            profile.timings[name] = profile.timings.get(name, 0.0) + seconds
+            profile = profile.parent
+        if self.histogram is not None:
+            self.histogram.observe(seconds, stage=name, **self.labels)
+
+    def merge(self, other: "Profile"):
+        """Take over the labels, info and stage timings of a Profile filled elsewhere (a worker)."""
+        self.labels.update(other.labels)
+        self.info.update(other.info)
+        for name, seconds in other.timings.items():
+            self.record(name, seconds)
+
+    def activate(self) -> contextvars.Token:
+        return _PROFILE.set(self)
+
+    @staticmethod
+    def deactivate(token: contextvars.Token):
+        _PROFILE.reset(token)
+
+    def __enter__(self) -> "Profile":
+        self._token = self.activate()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.deactivate(self._token)
+        self._token = None
+
+    def header_value(self, **extra: float) -> str:
+        """Compact JSON of the timings (plus `extra`) in milliseconds, for X-Debug-Timings."""
+        timings = {**self.timings, **extra}
+        return json.dumps({name: round(seconds * 1000, 3) for name, seconds in timings.items()},
+                          separators=(",", ":"))
+
+
+def current_profile() -> Optional[Profile]:
+    return _PROFILE.get()
+
+
+# Label the stages of the current unit of work from here on
+def set_labels(**labels: str):
+    profile = _PROFILE.get()
+    if profile is not None:
+        profile.labels.update(labels)
+
+
+# Note a fact about the current unit of work in its Profile.info
+def annotate(**info: Any):
+    profile = _PROFILE.get()
+    if profile is not None:
+        profile.info.update(info)
+
+
+# Runs in a worker process: fn(*args) under a fresh Profile, sent back with
+# the result for Profile.merge on the submitting side
+def run_profiled(fn, *args) -> Tuple[Any, Profile]:
+    with Profile() as profile:
+        result = fn(*args)
+    return result, profile
+
+
+class stage:
+    """Context manager timing one pipeline stage into the current Profile."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        profile = _PROFILE.get()
+        if profile is not None:
+            profile.record(self.name, time.perf_counter() - self.start)
+
+
+# ---------- ASGI middleware ----------
+
+class TimingMiddleware:
+    """
+    Gives every HTTP request a Profile and observes its total duration per
+    route. A request sent with `X-Debug-Timings: 1` gets its stage timings
+    back in the same response header (stages finished before the response
+    started; for streamed responses that is the part before the first byte).
+    """
+
+    def __init__(self, app, stage_histogram: Histogram, request_histogram: Histogram):
+        self.app = app
+        self.stage_histogram = stage_histogram
+        self.request_histogram = request_histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = any(k == b"x-debug-timings" and v not in (b"", b"0") for k, v in scope.get("headers", ()))
+        profile = Profile(self.stage_histogram)
+        status = {"code": 500}
+
+        async def send_with_timings(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if debug:
+                    value = profile.header_value(total=time.perf_counter() - start)
+                    headers = list(message.get("headers", ()))
+                    headers.append((b"x-debug-timings", value.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        start = time.perf_counter()
+        token = profile.activate()
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            Profile.deactivate(token)
+            route = scope.get("route")
+            self.request_histogram.observe(
+                time.perf_counter() - start,
+                endpoint=getattr(route, "path", "other"),
+                method=scope.get("method", ""),
+                status=str(status["code"]),
+            )
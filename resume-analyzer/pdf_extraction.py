@@ -0,0 +1,172 @@
+import importlib.util
+import io
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# pdfplumber, pdfminer and pypdf are imported on first use (or by
+# warm_up()), so importing this module doesn't pay for the parsers
+
+# Same tolerances pdfplumber's extract_text uses by default (in PDF points)
+LINE_TOLERANCE = 3.0
+WORD_GAP_TOLERANCE = 3.0
+
+
+# ---------- Backends ----------
+# A backend takes (pdf bytes, first page, end page) and yields the text of
+# each page in that half-open range, in order. Pages are parsed as they are
+# consumed and their layout objects released before the next one.
+
+def _pdfplumber_pages(b: bytes, start: int, end: Optional[int]) -> Iterator[str]:
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(b)) as pdf:
+        for page in pdf.pages[start:end]:
+            text = page.extract_text() or ""
+            page.close()  # drop the cached chars and layout
+            yield text
+
+
+# The device class subclasses a pdfminer class, so it's built on first use
+@lru_cache(maxsize=None)
+def _text_only_device() -> type:
+    from pdfminer.converter import PDFLayoutAnalyzer
+    from pdfminer.layout import LTChar, LTContainer
+    from pdfminer.pdfinterp import PDFResourceManager
+
+    class _TextOnlyDevice(PDFLayoutAnalyzer):
+        """
+        Collects characters in content-stream order and breaks lines on baseline
+        changes. No layout analysis (no char clustering, no text boxes), which is
+        where pdfplumber spends most of its time.
+        """
+
+        def __init__(self, rsrcmgr: PDFResourceManager):
+            super().__init__(rsrcmgr, laparams=None)
+            self.texts: List[str] = []
+
+        def receive_layout(self, ltpage):
+            lines: List[str] = []
+            current: List[str] = []
+            last: Optional[LTChar] = None
+
+            def walk(container):
+                nonlocal current, last
+                for item in container:
+                    if isinstance(item, LTChar):
+                        char = item.get_text()
+                        if last is not None:
+                            if abs(item.y1 - last.y1) > LINE_TOLERANCE:
+                                lines.append(''.join(current).strip())
+                                current = []
+                            elif (item.x0 - last.x1 > WORD_GAP_TOLERANCE
+                                  and current and not current[-1].isspace() and not char.isspace()):
+                                current.append(' ')
+                        current.append(char)
+                        last = item
+                    elif isinstance(item, LTContainer):
+                        walk(item)
+
+            walk(ltpage)
+            if current:
+                lines.append(''.join(current).strip())
+            self.texts.append('\n'.join(line for line in lines if line))
+
+    return _TextOnlyDevice
+
+
+def _pdfminer_pages(b: bytes, start: int, end: Optional[int]) -> Iterator[str]:
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    document = PDFDocument(PDFParser(io.BytesIO(b)))
+    rsrcmgr = PDFResourceManager(caching=True)
+    device = _text_only_device()(rsrcmgr)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    for page in islice(PDFPage.create_pages(document), start, end):
+        interpreter.process_page(page)
+        yield device.texts.pop()
+
+
+def _pypdf_pages(b: bytes, start: int, end: Optional[int]) -> Iterator[str]:
+    import pypdf
+
+    reader = pypdf.PdfReader(io.BytesIO(b))
+    for page in reader.pages[start:end]:
+        yield page.extract_text() or ""
+
+
+PDF_BACKENDS: Dict[str, Callable[[bytes, int, Optional[int]], Iterator[str]]] = {
+    "pdfplumber": _pdfplumber_pages,
+    "pdfminer": _pdfminer_pages,
+}
+if importlib.util.find_spec("pypdf") is not None:  # optional fast backend
+    PDF_BACKENDS["pypdf"] = _pypdf_pages
+
+
+def warm_up(backend: str = "pdfplumber"):
+    """Import the parser modules a backend needs so the first request doesn't."""
+    import pdfminer.pdfdocument  # noqa: F401  (page counting, every backend)
+    if backend == "pdfplumber":
+        import pdfplumber  # noqa: F401
+    elif backend == "pdfminer":
+        _text_only_device()
+    elif backend == "pypdf":
+        import pypdf  # noqa: F401
+
+
+# ---------- Page counting and page ranges ----------
+
+def count_pdf_pages(b: bytes) -> int:
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    document = PDFDocument(PDFParser(io.BytesIO(b)))
+    count = resolve1(resolve1(document.catalog.get("Pages")) or {}).get("Count")
+    if isinstance(count, int):
+        return count
+    return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def split_pages(n_pages: int, parts: int) -> List[Tuple[int, int]]:
+    """Contiguous page ranges (start, end) covering n_pages in up to `parts` near-equal parts."""
+    size, extra = divmod(n_pages, max(1, parts))
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def extract_pdf_pages(b: bytes, backend: str = "pdfplumber", max_pages: Optional[int] = None) -> List[str]:
+    """Text of each page (up to max_pages) with the chosen backend."""
+    return extract_pdf_page_range(b, backend, 0, max_pages if max_pages else None)
+
+
+def extract_pdf_page_range(b: bytes, backend: str, start: int, end: Optional[int]) -> List[str]:
+    """
+    Text of the pages in [start, end). A long document is extracted in
+    parallel by running the ranges of split_pages as jobs of the caller's
+    process pool and concatenating the results in order.
+    """
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}'. Available: {', '.join(PDF_BACKENDS)}")
+    return list(PDF_BACKENDS[backend](b, start, end))
+
+
+def iter_pdf_pages(b: bytes, backend: str = "pdfplumber", max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Text of each page (up to max_pages), parsed only as the caller asks for
+    the next one. Memory is bounded by the largest page rather than the
+    document; there is no parallel mode.
+    """
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}'. Available: {', '.join(PDF_BACKENDS)}")
+    return PDF_BACKENDS[backend](b, 0, max_pages if max_pages else None)
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class Readiness:
+    """
+    Warm-up of whatever the first request would otherwise pay for (parser
+    imports, worker processes), run in the background after startup.
+
+    - steps run once, in registration order, on a daemon thread
+    - `ready` turns True only when every step has succeeded; a failing step
+      is recorded and the remaining steps still run
+    - until then the service is live (/health answers) but not ready
+    - skip() instead of start() when warm-up is disabled: ready right away,
+      the first requests pay for what the steps would have done
+    """
+
+    def __init__(self):
+        self._steps: List[Tuple[str, Callable[[], Any]]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._created = time.monotonic()
+        self._ready_after: Optional[float] = None
+        self._skipped = False
+
+    def add_step(self, name: str, fn: Callable[[], Any]):
+        self._steps.append((name, fn))
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def skip(self):
+        with self._lock:
+            if self._thread is not None or self._ready_after is not None:
+                return
+            self._skipped = True
+            self._ready_after = time.monotonic() - self._created
+        print("[WARMUP] Disabled: ready without warm-up")
+
+    # Run the steps on the calling thread (scripts and tests)
+    def run(self):
+        self._run()
+
+    def _run(self):
+        failed = False
+        for name, fn in self._steps:
+            start = time.perf_counter()
+            result: Dict[str, Any] = {"ok": True}
+            try:
+                detail = fn()
+                if detail is not None:
+                    result["detail"] = detail
+            except Exception as e:
+                failed = True
+                result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                print(f"[WARMUP] Step '{name}' failed: {result['error']}")
+            result["seconds"] = round(time.perf_counter() - start, 4)
+            with self._lock:
+                self._results[name] = result
+
+        if not failed:
+            with self._lock:
+                self._ready_after = time.monotonic() - self._created
+            print(f"[WARMUP] Ready after {self._ready_after:.2f}s")
+
+    @property
+    def ready(self) -> bool:
+        return self._ready_after is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self._ready_after is not None,
+                "ready_after_seconds": round(self._ready_after, 3) if self._ready_after is not None else None,
+                "skipped": self._skipped,
+                "steps": {name: self._results.get(name, {"ok": None}) for name, _ in self._steps},
+            }
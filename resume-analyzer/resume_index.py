@@ -0,0 +1,247 @@
+import heapq
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Fields a search can rank by (ats_score plus the per-category scores)
+RANK_FIELDS = (
+    "ats_score",
+    "skills_match",
+    "experience_quality",
+    "format_structure",
+    "contact_info",
+    "education",
+    "achievements_impact",
+    "ats_optimization",
+)
+
+# Report "detailed_scores" labels -> rank field names
+_DETAILED_FIELDS = {
+    "Format & Structure": "format_structure",
+    "Contact Information": "contact_info",
+    "Skills Match": "skills_match",
+    "Experience Quality": "experience_quality",
+    "Education": "education",
+    "Achievements & Impact": "achievements_impact",
+    "ATS Optimization": "ats_optimization",
+}
+
+
+def _terms(values: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sorted({v.strip().lower() for v in values if v and v.strip()}))
+
+
+class ResumeIndex:
+    """
+    In-process inverted index over analyzed resumes.
+
+    - postings: skill -> doc ids, section -> doc ids and user -> doc ids
+      (plain int sets; AND queries intersect starting from the rarest term)
+    - one score column per rank field, so top-K is a heap over the
+      candidates keyed by a dict lookup, never a full sort
+    - a document is one (user_id, resume_id) pair; indexing it again
+      replaces the previous entry
+    - at most `max_documents` are kept; beyond that the least recently
+      indexed ones are evicted
+    - the index lives in this process: without sqlite it is lost on restart,
+      and every server process has its own
+    - sqlite (optional): every document is written through and the
+      in-memory index is rebuilt from it on startup
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_documents: int = 10000):
+        self.max_documents = max(1, max_documents)
+        self._lock = threading.Lock()
+        self._next_doc = 0
+        self._doc_ids: Dict[Tuple[str, str], int] = {}
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._skills: Dict[str, Set[int]] = {}
+        self._sections: Dict[str, Set[int]] = {}
+        self._users: Dict[str, Set[int]] = {}
+        self._scores: Dict[str, Dict[int, float]] = {field: {} for field in RANK_FIELDS}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resume_index ("
+                "user_id TEXT NOT NULL, resume_id TEXT NOT NULL, doc TEXT NOT NULL, indexed REAL NOT NULL, "
+                "PRIMARY KEY (user_id, resume_id))"
+            )
+            self._db.commit()
+            evicted = []
+            for (doc,) in self._db.execute("SELECT doc FROM resume_index ORDER BY indexed").fetchall():
+                evicted += self._insert(json.loads(doc))
+            self._db_delete(evicted)
+
+    # Index the response of analyze_resume() for one uploaded file
+    def add_report(self, user_id: str, resume_id: str, report: Dict) -> Dict[str, Any]:
+        analysis = report["analysis"]
+        scores = {"ats_score": report["ats_score"]}
+        for label, field in _DETAILED_FIELDS.items():
+            scores[field] = report["detailed_scores"][label]
+        return self.add(
+            user_id,
+            resume_id,
+            name=report["candidate_name"],
+            role=report["role"],
+            skills=analysis["skills_found"],
+            sections=analysis["sections_found"],
+            scores=scores,
+        )
+
+    def add(
+        self,
+        user_id: str,
+        resume_id: str,
+        name: str,
+        role: str,
+        skills: Iterable[str],
+        sections: Iterable[str],
+        scores: Dict[str, float],
+    ) -> Dict[str, Any]:
+        doc = {
+            "user_id": user_id,
+            "resume_id": resume_id,
+            "name": name,
+            "role": role,
+            "skills": list(_terms(skills)),
+            "sections": list(_terms(sections)),
+            "scores": {field: scores.get(field, 0) for field in RANK_FIELDS},
+            "indexed_at": time.time(),
+        }
+        with self._lock:
+            evicted = self._insert(doc)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO resume_index (user_id, resume_id, doc, indexed) VALUES (?, ?, ?, ?)",
+                    (user_id, resume_id, json.dumps(doc), doc["indexed_at"])
+                )
+                self._db_delete(evicted)
+        return doc
+
+    def delete(self, user_id: str, resume_id: str) -> bool:
+        with self._lock:
+            removed = self._remove((user_id, resume_id))
+            self._db_delete([(user_id, resume_id)])
+            return removed
+
+    def search(
+        self,
+        skills: Iterable[str] = (),
+        any_skills: Iterable[str] = (),
+        sections: Iterable[str] = (),
+        user_id: Optional[str] = None,
+        role: Optional[str] = None,
+        min_score: float = 0,
+        rank_by: str = "ats_score",
+        k: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Resumes having every skill in `skills`, at least one of `any_skills`
+        and every section in `sections` (of `user_id` only, if given), best
+        `k` by `rank_by`.
+        """
+        if rank_by not in self._scores:
+            raise ValueError(f"Unknown rank field '{rank_by}'. Available: {', '.join(RANK_FIELDS)}")
+        required = [(self._skills, t) for t in _terms(skills)] + [(self._sections, t) for t in _terms(sections)]
+        if user_id is not None:
+            required.append((self._users, user_id))
+        optional = _terms(any_skills)
+        role = role.strip().lower() if role else None
+
+        with self._lock:
+            postings = [index.get(term, set()) for index, term in required]
+            if postings:
+                postings.sort(key=len)
+                candidates = postings[0].intersection(*postings[1:])
+            else:
+                candidates = self._docs.keys()
+
+            if optional:
+                either = set().union(*(self._skills.get(t, set()) for t in optional))
+                candidates = either.intersection(candidates)
+
+            docs = self._docs
+            if role is not None:
+                candidates = [d for d in candidates if docs[d]["role"].lower() == role]
+
+            column = self._scores[rank_by]
+            if min_score:
+                candidates = [d for d in candidates if column[d] >= min_score]
+
+            matched = len(candidates)
+            top = heapq.nlargest(max(0, k), candidates, key=column.__getitem__)
+            results = [
+                {"rank": i + 1, "score": column[d], **docs[d]}
+                for i, d in enumerate(top)
+            ]
+
+        return {"total_matches": matched, "rank_by": rank_by, "results": results}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "skills": len(self._skills),
+                "sections": len(self._sections),
+                "users": len(self._users),
+                "max_documents": self.max_documents,
+                "persistent": self._db is not None,
+            }
+
+    # Caller must hold self._lock (or be __init__). Returns the keys of the
+    # documents evicted to stay within max_documents.
+    def _insert(self, doc: Dict[str, Any]) -> List[Tuple[str, str]]:
+        key = (doc["user_id"], doc["resume_id"])
+        self._remove(key)
+
+        doc_id = self._next_doc
+        self._next_doc += 1
+        self._doc_ids[key] = doc_id
+        self._docs[doc_id] = doc
+        for skill in doc["skills"]:
+            self._skills.setdefault(skill, set()).add(doc_id)
+        for section in doc["sections"]:
+            self._sections.setdefault(section, set()).add(doc_id)
+        self._users.setdefault(doc["user_id"], set()).add(doc_id)
+        for field, column in self._scores.items():
+            column[doc_id] = doc["scores"].get(field, 0)
+
+        # Doc ids grow with every insert, so the first one is the oldest
+        evicted = []
+        while len(self._docs) > self.max_documents:
+            oldest = self._docs[next(iter(self._docs))]
+            evicted.append((oldest["user_id"], oldest["resume_id"]))
+            self._remove(evicted[-1])
+        return evicted
+
+    # Caller must hold self._lock
+    def _remove(self, key: Tuple[str, str]) -> bool:
+        doc_id = self._doc_ids.pop(key, None)
+        if doc_id is None:
+            return False
+
+        doc = self._docs.pop(doc_id)
+        for index, terms in (
+            (self._skills, doc["skills"]),
+            (self._sections, doc["sections"]),
+            (self._users, [doc["user_id"]]),
+        ):
+            for term in terms:
+                posting = index[term]
+                posting.discard(doc_id)
+                if not posting:
+                    del index[term]
+        for column in self._scores.values():
+            del column[doc_id]
+        return True
+
+    # Caller must hold self._lock (or be __init__)
+    def _db_delete(self, keys: List[Tuple[str, str]]):
+        if self._db is None:
+            return
+        self._db.executemany("DELETE FROM resume_index WHERE user_id = ? AND resume_id = ?", keys)
+        self._db.commit()
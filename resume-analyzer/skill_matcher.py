@@ -0,0 +1,128 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# A "run" is a maximal stretch of word characters. Every skill is compiled into
+# a path of runs joined by the exact separator text between them, so a single
+# left-to-right walk over the runs of a document finds all skills at once.
+WORD_RUN_RE = re.compile(r'\w+')
+
+# Trie key marking "a skill ends here". Runs and separators are never empty,
+# so "" can't collide with them, and unlike object() it survives pickling
+_END = ""
+
+
+class SkillMatcher:
+    """
+    Token trie compiled once from the skills DB.
+
+    Matching keeps the semantics of the original per-skill loop:
+    - skills containing a space or a dot are counted like
+      ``re.findall(r'\\b' + re.escape(skill) + r'\\b', text)``
+      (non-overlapping occurrences)
+    - every other skill is counted as an exact token of
+      ``re.findall(r'\\b\\w+(?:\\.\\w+)?\\b', text)``
+    The frequency dict comes back in skills DB order.
+
+    `aliases` maps extra terms to skills ('k8s' -> 'kubernetes'); an alias is
+    matched like a skill of its own and its hits are added to its skill.
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self.order: Dict[str, int] = {}
+        self.canonical: Dict[str, str] = {}
+        self.single: Dict[str, str] = {}
+        self.trie: Dict = {}
+        self.fallback: List[Tuple[str, "re.Pattern"]] = []
+
+        for skill in skills:
+            if skill in self.order:
+                continue
+            self.order[skill] = len(self.order)
+            self._add_term(skill, skill)
+
+        for alias, skill in (aliases or {}).items():
+            if alias in self.order or alias in self.canonical:
+                continue
+            if skill not in self.order:
+                raise ValueError(f"Alias '{alias}' points to unknown skill '{skill}'")
+            self._add_term(alias, skill)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _add_term(self, term: str, skill: str):
+        self.canonical[term] = skill
+        if ' ' in term or '.' in term:
+            self._add_phrase(term)
+        else:
+            self.single[term] = skill
+
+    def _add_phrase(self, skill: str):
+        runs = list(WORD_RUN_RE.finditer(skill))
+        # Skills that start or end with a separator ('.net', 'c++ builder+')
+        # have \b semantics that don't map onto runs; keep a regex for those.
+        if not runs or runs[0].start() != 0 or runs[-1].end() != len(skill):
+            pattern = re.compile(r'\b' + re.escape(skill) + r'\b')
+            self.fallback.append((skill, pattern))
+            return
+
+        node = self.trie.setdefault(runs[0].group(), {})
+        for prev, run in zip(runs, runs[1:]):
+            node = node.setdefault(skill[prev.end():run.start()], {})
+            node = node.setdefault(run.group(), {})
+        node[_END] = skill
+
+    def match(self, text: str) -> Tuple[List[str], Dict[str, int]]:
+        """Return (sorted skills found, {skill: frequency}) for lowercase text."""
+        runs = [(m.group(), m.start(), m.end()) for m in WORD_RUN_RE.finditer(text)]
+        n = len(runs)
+
+        counts: Dict[str, int] = {}
+        phrase_end: Dict[str, int] = {}
+        single = self.single
+        trie = self.trie
+        canonical = self.canonical
+
+        i = 0
+        paired = False  # run i was already consumed as the tail of 'a.b'
+        while i < n:
+            word, start, end = runs[i]
+
+            # Single-word skills: rebuild the \w+(?:\.\w+)? token stream
+            if paired:
+                paired = False
+            elif i + 1 < n and runs[i + 1][1] == end + 1 and text[end] == '.':
+                paired = True
+            else:
+                skill = single.get(word)
+                if skill is not None:
+                    counts[skill] = counts.get(skill, 0) + 1
+
+            # Phrase skills: walk the trie from this run
+            node = trie.get(word)
+            j = i
+            while node is not None:
+                term = node.get(_END)
+                if term is not None and start >= phrase_end.get(term, 0):
+                    skill = canonical[term]
+                    counts[skill] = counts.get(skill, 0) + 1
+                    phrase_end[term] = runs[j][2]
+                j += 1
+                if j >= n:
+                    break
+                node = node.get(text[runs[j - 1][2]:runs[j][1]])
+                if node is not None:
+                    node = node.get(runs[j][0])
+            i += 1
+
+        if self.fallback:
+            padded = ' ' + text + ' '
+            for term, pattern in self.fallback:
+                hits = len(pattern.findall(padded))
+                if hits:
+                    skill = canonical[term]
+                    counts[skill] = counts.get(skill, 0) + hits
+
+        order = self.order
+        frequency = {s: counts[s] for s in sorted(counts, key=order.__getitem__)}
+        return sorted(frequency), frequency
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from features import ActionVerbMatcher
+from skill_matcher import SkillMatcher
+
+
+# Bump when Taxonomy, SkillMatcher or ActionVerbMatcher change shape, so
+# artifacts pickled by older code are rebuilt instead of loaded
+ARTIFACT_FORMAT = 1
+ARTIFACT_KEEP = 8
+
+
+class TaxonomyError(Exception):
+    """The taxonomy file is missing or invalid."""
+
+
+class RoleProfile:
+    """One role's skill lists, as ordered tuples (for messages) and frozensets (for lookups)."""
+
+    __slots__ = (
+        "name",
+        "must_have",
+        "good_to_have",
+        "keywords",
+        "action_verbs",
+        "must_have_set",
+        "good_to_have_set",
+    )
+
+    def __init__(self, name: str, spec: Dict[str, List[str]]):
+        self.name = name
+        self.must_have: Tuple[str, ...] = tuple(spec.get("must_have", []))
+        self.good_to_have: Tuple[str, ...] = tuple(spec.get("good_to_have", []))
+        self.keywords: Tuple[str, ...] = tuple(spec.get("keywords", []))
+        self.action_verbs: Tuple[str, ...] = tuple(spec.get("action_verbs", []))
+        self.must_have_set: FrozenSet[str] = frozenset(self.must_have)
+        self.good_to_have_set: FrozenSet[str] = frozenset(self.good_to_have)
+
+
+class Taxonomy:
+    """
+    Compiled, read-only snapshot of the taxonomy file.
+
+    Everything a request needs is built here once: the skill matcher (skills
+    plus aliases), the action-verb matcher and the role profiles. A request
+    should read TaxonomyStore.current once and use that snapshot throughout.
+    """
+
+    def __init__(self, data: Dict[str, Any], skills: List[str], checksum: str):
+        self.checksum = checksum
+        self.source = "json"
+        self.version = f"{data.get('version', '0')}+{checksum[:8]}"
+        self.skills: Tuple[str, ...] = tuple(skills)
+        self.aliases: Dict[str, str] = {a.lower(): s.lower() for a, s in data.get("aliases", {}).items()}
+        self.skill_matcher = SkillMatcher(self.skills, self.aliases)
+        self.verbs = ActionVerbMatcher([v.lower() for v in data.get("action_verbs", [])])
+        self.roles: Dict[str, RoleProfile] = {
+            name.lower(): RoleProfile(name.lower(), spec) for name, spec in data.get("roles", {}).items()
+        }
+
+    def role(self, role: str) -> Optional[RoleProfile]:
+        return self.roles.get(role.lower()) if role else None
+
+
+# ---------- Compiled artifacts ----------
+# A pickled Taxonomy per checksum of its source files, so a restart (or a
+# worker process catching up on a reload) skips compiling the matchers.
+# Artifacts are unpickled, so `cache_dir` must be writable only by the service.
+
+def _artifact_path(cache_dir: Path, checksum: str) -> Path:
+    python = f"{sys.version_info[0]}{sys.version_info[1]}"
+    return cache_dir / f"taxonomy-{checksum[:16]}-f{ARTIFACT_FORMAT}-py{python}.pickle"
+
+
+def _load_artifact(path: Path, checksum: str) -> Optional[Taxonomy]:
+    try:
+        with open(path, "rb") as f:
+            taxonomy = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # truncated or stale file: rebuild it
+        print(f"[TAXONOMY] Ignoring unreadable artifact {path.name}: {e}")
+        return None
+    if not isinstance(taxonomy, Taxonomy) or taxonomy.checksum != checksum:
+        return None
+    taxonomy.source = "artifact"
+    return taxonomy
+
+
+def _save_artifact(path: Path, taxonomy: Taxonomy):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        old = sorted(path.parent.glob("taxonomy-*.pickle"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in old[ARTIFACT_KEEP:]:
+            stale.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"[TAXONOMY] Could not write artifact {path}: {e}")
+
+
+def load_taxonomy(path: Path, cache_dir: Optional[Path] = None) -> Tuple[Taxonomy, List[Path]]:
+    """
+    Compile the taxonomy at `path`; also returns every file it was built from.
+    With `cache_dir`, the compiled taxonomy is loaded from / saved to a pickled
+    artifact keyed by the files' checksum.
+    """
+    try:
+        raw = path.read_bytes()
+        data = json.loads(raw)
+        skills_path = path.parent / data.get("skills_file", "skills.json")
+        skills_raw = skills_path.read_bytes()
+        skills = [s.lower() for s in json.loads(skills_raw)]
+        if not data.get("action_verbs"):
+            raise TaxonomyError("taxonomy has no action_verbs")
+        checksum = hashlib.sha256(raw + b"\0" + skills_raw).hexdigest()
+        files = [path, skills_path]
+        if cache_dir is None:
+            return Taxonomy(data, skills, checksum), files
+
+        artifact = _artifact_path(Path(cache_dir), checksum)
+        taxonomy = _load_artifact(artifact, checksum)
+        if taxonomy is None:
+            taxonomy = Taxonomy(data, skills, checksum)
+            _save_artifact(artifact, taxonomy)
+        return taxonomy, files
+    except TaxonomyError:
+        raise
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        raise TaxonomyError(f"Could not load taxonomy {path}: {e}")
+
+
+class TaxonomyStore:
+    """
+    Holds the active Taxonomy and swaps in a new one when its files change.
+
+    - `current` is replaced in a single assignment, so readers always see a
+      complete snapshot; a file that fails to load keeps the previous one
+    - watch() polls the files' mtime/size from a daemon thread
+    - listeners registered with on_swap() run after every swap
+    """
+
+    def __init__(self, path: Path, cache_dir: Optional[Path] = None):
+        self.path = Path(path)
+        self.cache_dir = cache_dir
+        self.current, self._files = load_taxonomy(self.path, cache_dir)
+        self._signature = self._file_signature()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Taxonomy], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"reloads": 0, "failed_reloads": 0, "last_error": None, "loaded_at": time.time()}
+
+    def _file_signature(self) -> Tuple:
+        signature = []
+        for path in self._files:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def on_swap(self, listener: Callable[[Taxonomy], None]):
+        self._listeners.append(listener)
+
+    def reload_if_changed(self) -> bool:
+        with self._lock:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return False
+            self._signature = signature
+            try:
+                taxonomy, files = load_taxonomy(self.path, self.cache_dir)
+            except TaxonomyError as e:
+                self._stats["failed_reloads"] += 1
+                self._stats["last_error"] = str(e)
+                print(f"[TAXONOMY] Reload failed, keeping {self.current.version}: {e}")
+                return False
+
+            self._files = files
+            self._signature = self._file_signature()
+            if taxonomy.version == self.current.version:
+                return False
+            self.current = taxonomy
+            self._stats["reloads"] += 1
+            self._stats["last_error"] = None
+            self._stats["loaded_at"] = time.time()
+
+        print(f"[TAXONOMY] Loaded version {taxonomy.version}")
+        for listener in self._listeners:
+            listener(taxonomy)
+        return True
+
+    # The snapshot a job was submitted with; worker processes catch up on demand
+    def ensure(self, version: Optional[str]) -> Taxonomy:
+        if version is not None and version != self.current.version:
+            self.reload_if_changed()
+        return self.current
+
+    def watch(self, interval: float):
+        if interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+
+        def poll():
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._thread = threading.Thread(target=poll, name="taxonomy-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        taxonomy = self.current
+        return {
+            **self._stats,
+            "version": taxonomy.version,
+            "source": taxonomy.source,
+            "roles": len(taxonomy.roles),
+            "skills": len(taxonomy.skills),
+            "aliases": len(taxonomy.aliases),
+            "path": str(self.path),
+        }
@@ -0,0 +1,38 @@
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+import main  # noqa: E402
+
+PDF = b"%PDF-1.4\n1 0 obj\n<< >>\nendobj\ntrailer\n<< >>\n%%EOF\n"
+
+
+def make_zip(members, compression=zipfile.ZIP_STORED):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_archive_with_stored_pdf_first_member_is_expanded():
+    data = make_zip({"a.pdf": PDF, "b.docx": make_zip({"word/document.xml": "<w/>"}), "notes.txt": "x"})
+    assert main.sniff_file_type(data) == "docx"
+    items = main.expand_batch_upload("z.zip", data)
+    assert [name for name, _ in items] == ["a.pdf", "b.docx"]
+    assert items[0][1] == PDF
+
+
+def test_pdf_and_docx_are_not_expanded():
+    docx = make_zip({"word/document.xml": "<w/>"}, zipfile.ZIP_DEFLATED)
+    assert main.expand_batch_upload("cv.pdf", PDF) == [("cv.pdf", PDF)]
+    assert main.expand_batch_upload("cv.docx", docx) == [("cv.docx", docx)]
+
+
+def test_pdf_header_must_lead_the_file():
+    assert main.sniff_file_type(b"\xef\xbb\xbf\r\n%PDF-1.7") == "pdf"
+    assert main.sniff_file_type(b"<html>%PDF-1.7") is None
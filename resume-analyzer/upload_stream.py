@@ -0,0 +1,179 @@
+import hashlib
+import os
+from tempfile import NamedTemporaryFile
+from typing import Callable, Dict, Optional, Union
+from urllib.parse import parse_qsl
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+# Multipart overhead allowed on top of the file limit when checking Content-Length
+FORM_OVERHEAD_BYTES = 64 * 1024
+MAX_FIELD_BYTES = 64 * 1024
+SPOOL_MAX_BYTES = 1024 * 1024
+
+
+class UploadRejected(Exception):
+    """The upload was refused before (or while) its body was read."""
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class StreamedUpload:
+    """
+    A multipart upload read straight off the request stream.
+
+    - a file of up to SPOOL_MAX_BYTES stays in memory; a larger one is
+      written to a named temporary file as it arrives, so it can be opened
+      by path from another process instead of being read back here
+    - `sha256` is the hex digest of the file bytes, computed as they arrive
+    - `fields` holds the plain form fields
+    - close() deletes the temporary file; call it once nothing reads it
+    """
+
+    def __init__(self):
+        self.filename: Optional[str] = None
+        self.path: Optional[str] = None
+        self.size = 0
+        self.sha256 = ""
+        self.fields: Dict[str, str] = {}
+        self._memory = bytearray()
+        self._disk = None
+
+    def write(self, chunk: bytes):
+        if self._disk is None and len(self._memory) + len(chunk) > SPOOL_MAX_BYTES:
+            self._disk = NamedTemporaryFile(prefix="upload-", delete=False)
+            self.path = self._disk.name
+            self._disk.write(self._memory)
+            self._memory = bytearray()
+        if self._disk is not None:
+            self._disk.write(chunk)
+        else:
+            self._memory += chunk
+
+    def source(self) -> Union[bytes, str]:
+        """The file: its bytes if it stayed in memory, else its path on disk."""
+        if self._disk is not None:
+            self._disk.flush()
+            return self.path
+        return bytes(self._memory)
+
+    def close(self):
+        self._memory = bytearray()
+        if self._disk is not None:
+            self._disk.close()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self._disk = None
+
+
+async def receive_upload(
+    request: Request,
+    file_field: str,
+    max_bytes: int,
+    check_filename: Optional[Callable[[str], None]] = None,
+) -> StreamedUpload:
+    """
+    Stream a multipart/form-data body, keeping only `file_field`'s file and
+    the text fields.
+
+    Raises UploadRejected as soon as the declared Content-Length, or the file
+    bytes received so far, exceed `max_bytes`, so an oversized body is never
+    read in full. `check_filename` may raise UploadRejected to refuse the file
+    as soon as its part headers arrive.
+    """
+    too_large = f"File too large. Maximum size is {max_bytes // (1024 * 1024)}MB"
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise UploadRejected(too_large)
+
+    upload = StreamedUpload()
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type == b"application/x-www-form-urlencoded":
+        # A form without a file: keep the fields so the caller can report what is missing
+        body = bytearray()
+        async for chunk in request.stream():
+            body += chunk
+            if len(body) > MAX_FIELD_BYTES:
+                upload.close()
+                raise UploadRejected("Form is too large")
+        upload.fields = dict(parse_qsl(body.decode("utf-8", "replace"), keep_blank_values=True))
+        return upload
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        upload.close()
+        raise UploadRejected("Expected a multipart/form-data upload")
+
+    hasher = hashlib.sha256()
+    part = {"name": "", "filename": None, "headers": {}, "data": bytearray()}
+    header = {"field": b"", "value": b""}
+
+    def on_part_begin():
+        part.update(name="", filename=None, headers={}, data=bytearray())
+
+    def on_header_field(data, start, end):
+        header["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        header["value"] += data[start:end]
+
+    def on_header_end():
+        part["headers"][header["field"].lower()] = header["value"]
+        header.update(field=b"", value=b"")
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        part["name"] = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" in options:
+            part["filename"] = options[b"filename"].decode("utf-8", "replace")
+            if part["name"] == file_field:
+                if upload.filename is not None:
+                    raise UploadRejected(f"Only one '{file_field}' file may be uploaded")
+                upload.filename = part["filename"]
+                if check_filename is not None:
+                    check_filename(upload.filename)
+
+    def on_part_data(data, start, end):
+        if part["filename"] is None:
+            if len(part["data"]) + end - start > MAX_FIELD_BYTES:
+                raise UploadRejected(f"Form field '{part['name']}' is too large")
+            part["data"] += data[start:end]
+        elif part["name"] == file_field:
+            upload.size += end - start
+            if upload.size > max_bytes:
+                raise UploadRejected(too_large)
+            chunk = data[start:end]
+            hasher.update(chunk)
+            upload.write(chunk)
+        # other file parts are discarded
+
+    def on_part_end():
+        if part["filename"] is None and part["name"]:
+            upload.fields[part["name"]] = part["data"].decode("utf-8", "replace")
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except UploadRejected:
+        upload.close()
+        raise
+    except Exception as e:
+        upload.close()
+        raise UploadRejected(f"Could not read file: {str(e)}")
+
+    upload.sha256 = hasher.hexdigest()
+    return upload
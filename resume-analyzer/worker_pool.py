@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+
+class PoolBusy(Exception):
+    """Raised when the pool already holds max_pending jobs."""
+
+
+class AnalysisPool:
+    """
+    Bounded process pool for CPU-heavy parsing and scoring.
+
+    - `workers` processes run jobs (defaults to the number of cores)
+    - at most `max_pending` jobs may be running or waiting at once;
+      submit() raises PoolBusy beyond that so callers can shed load
+    - the executor is created on first use and replaced once when a worker
+      dies (e.g. OOM-killed, or a crash in a PDF backend): the jobs it was
+      running or holding fail with BrokenProcessPool, later jobs get the new
+      executor
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {"submitted": 0, "rejected": 0, "restarts": 0}
+
+    def submit(self, fn: Callable, *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise PoolBusy(f"{self._pending} analysis jobs already pending")
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            executor = self._executor
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._replace(executor)
+                executor = self._executor
+                future = executor.submit(fn, *args)
+
+            self._pending += 1
+            self._stats["submitted"] += 1
+
+        future.add_done_callback(lambda done: self._release(done, executor))
+        return future
+
+    # Start every worker process now and run `fn` once per worker slot, outside
+    # the pending-job accounting; returns how many distinct results (e.g. worker
+    # pids) came back
+    def prestart(self, fn: Callable[[], Any]) -> int:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            executor = self._executor
+        futures = [executor.submit(fn) for _ in range(self.workers)]
+        return len({future.result() for future in futures})
+
+    def _release(self, future: Future, executor: ProcessPoolExecutor):
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                self._replace(executor)
+
+    # Caller must hold self._lock. Every job of a broken executor fails, so
+    # only the first one to report it replaces the executor.
+    def _replace(self, executor: ProcessPoolExecutor):
+        if self._executor is not executor:
+            return
+        executor.shutdown(wait=False)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._stats["restarts"] += 1
+
+    def idle_workers(self) -> int:
+        with self._lock:
+            return max(0, self.workers - self._pending)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "pending": self._pending,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -2,15 +2,23 @@ import os
 import json
 import cv2
 import time
-import math
+import threading
+import multiprocessing
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
 import moviepy.editor as mp
 import speech_recognition as sr
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
-from deepface import DeepFace
+import numpy as np
 import mediapipe as mp_solutions  # NEW: MediaPipe
+from job_queue import JobQueue, QueueFull
+from model_registry import ModelRegistry, is_ready
+from frame_sampler import AdaptiveSampler, iter_sampled_frames
+from emotion_engine import EmotionEngine
+from gaze import decision_margin, gaze_metrics, gaze_series, landmarks_to_array, look_away_episodes
 try:
     import whisper  # NEW: Whisper (optional)
     WHISPER_AVAILABLE = True
@@ -23,6 +31,21 @@ except ImportError:
 UPLOAD_FOLDER = "uploads"
 MAX_ANALYSIS_SECONDS = 180          # analyze at most first 3 minutes of video
 FRAME_SAMPLE_EVERY_SEC = 2.0        # sample one frame every N seconds for emotion/gaze
+# Which frames get the gaze/emotion analysis (see frame_sampler.py): the
+# fixed stride of FRAME_SAMPLE_EVERY_SEC is decoded with "seek" (jump to each
+# sampled frame), "grab" (demux every frame, convert only the sampled ones)
+# or "read". "adaptive" (opt-in) picks them from frame changes and unsure
+# gaze readings, densely around changes and sparsely in stable stretches; it
+# decodes every frame to probe for changes, so its sampling costs several
+# times "seek"'s (benchmarks/bench_adaptive_sampling.py)
+FRAME_SAMPLING_MODE = os.getenv("VIDEO_FRAME_SAMPLING", "seek")
+# Adaptive sampling: frames analyzed per video at most, as a multiple of what
+# the fixed stride analyzes on the same video (1.0 = same CPU budget)
+ADAPTIVE_BUDGET_FACTOR = float(os.getenv("VIDEO_ADAPTIVE_BUDGET", "1.0"))
+# ...and a gaze reading this close to a decision threshold gets a second look
+ADAPTIVE_MIN_MARGIN = 0.05
+# Sampled frames per DeepFace emotion model call (labels don't depend on it)
+EMOTION_BATCH_SIZE = int(os.getenv("VIDEO_EMOTION_BATCH", "16"))
 TEMP_AUDIO_PREFIX = "temp_audio"
 
 # Ideal speaking rate range for scoring (words per minute)
@@ -32,6 +55,23 @@ MAX_IDEAL_WPM = 160
 # Choose Whisper model (if installed)
 WHISPER_MODEL_NAME = "small"  # "tiny", "base", "small" – small = better accuracy, still okay on CPU
 
+# Background analysis jobs: how many interviews are analyzed at once, how many
+# may be queued or running before uploads get a 503 (each one holds a video on
+# disk and, while running, Whisper/DeepFace memory), and the SQLite file that
+# keeps the queue across restarts
+ANALYSIS_WORKERS = int(os.getenv("VIDEO_ANALYSIS_WORKERS", "1"))
+MAX_QUEUED_JOBS = int(os.getenv("VIDEO_MAX_QUEUED_JOBS", "4"))
+JOB_DB_PATH = os.getenv("VIDEO_JOB_DB") or os.path.join(UPLOAD_FOLDER, "jobs.sqlite3")
+
+# The audio (Whisper) and video (OpenCV/MediaPipe/DeepFace) branches of an
+# interview run at the same time, each in its own process. Thread budget of
+# each branch process; 0 = split this worker's share of the CPUs between the
+# two so they don't oversubscribe the cores. VIDEO_PARALLEL_BRANCHES=0 runs
+# the branches one after the other on the job worker thread instead.
+PARALLEL_BRANCHES = os.getenv("VIDEO_PARALLEL_BRANCHES", "1") != "0"
+AUDIO_BRANCH_THREADS = int(os.getenv("VIDEO_AUDIO_THREADS", "0"))
+VIDEO_BRANCH_THREADS = int(os.getenv("VIDEO_FRAME_THREADS", "0"))
+
 # -------------------------------------------------
 
 app = Flask(__name__)
@@ -48,16 +88,57 @@ eye_cascade = cv2.CascadeClassifier(
     cv2.data.haarcascades + "haarcascade_eye.xml"
 )
 
-# Load Whisper model once (if available) to avoid reloading every request
-WHISPER_MODEL = None
-if WHISPER_AVAILABLE:
-    try:
-        print(f"[WHISPER] Loading Whisper model: {WHISPER_MODEL_NAME}")
-        WHISPER_MODEL = whisper.load_model(WHISPER_MODEL_NAME)
-        print("[WHISPER] Model loaded successfully")
-    except Exception as e:
-        print(f"[WHISPER] Failed to load model: {e}")
-        WHISPER_AVAILABLE = False
+# -------------------------------------------------
+# Models: loaded and warmed once per process (see model_registry.py). Each
+# branch process warms the models of its branch when it starts; in
+# sequential mode the serving process warms all of them.
+# -------------------------------------------------
+
+def load_whisper_model():
+    if not WHISPER_AVAILABLE:
+        raise RuntimeError("openai-whisper is not installed")
+    print(f"[WHISPER] Loading Whisper model: {WHISPER_MODEL_NAME}")
+    return whisper.load_model(WHISPER_MODEL_NAME)
+
+
+def warm_whisper_model(model):
+    # One second of silence
+    model.transcribe(np.zeros(16000, dtype=np.float32), fp16=False, language="en")
+
+
+def warm_emotion_model(_model):
+    # Also builds DeepFace's face detector and traces the model
+    engine = EmotionEngine(1)
+    engine.add(np.zeros((240, 320, 3), dtype=np.uint8))
+    engine.finish()
+
+
+def create_face_mesh():
+    return mp_solutions.solutions.face_mesh.FaceMesh(
+        static_image_mode=False,
+        max_num_faces=1,
+        refine_landmarks=True,  # needed for iris
+        min_detection_confidence=0.3,  # lowered for more detections
+        min_tracking_confidence=0.3    # lowered for more detections
+    )
+
+
+def warm_face_mesh(face_mesh):
+    face_mesh.process(np.zeros((480, 640, 3), dtype=np.uint8))
+
+
+MODELS = ModelRegistry()
+# Optional: without Whisper, transcription falls back to Google STT
+MODELS.register("whisper", load_whisper_model, warm_whisper_model, required=False)
+MODELS.register("emotion", EmotionEngine.load, warm_emotion_model)
+# FaceMesh keeps per-stream tracking state: one instance per running thread,
+# handed from request to request
+MODELS.register("face_mesh", create_face_mesh, warm_face_mesh, pooled=True)
+
+BRANCH_MODELS = {
+    "audio": ("whisper",),
+    "video": ("emotion", "face_mesh"),
+}
 
 # -------------------------------------------------
 # Helper: robust speech-to-text and fluency stats
@@ -119,10 +200,11 @@ def analyze_audio_fluency(video_path: str) -> dict:
         clip = None
 
         # 1) Prefer Whisper for transcription if available
-        if WHISPER_AVAILABLE and WHISPER_MODEL is not None:
+        whisper_model = MODELS.get("whisper")
+        if whisper_model is not None:
             try:
                 print("[AUDIO] Using Whisper ASR...")
-                result = WHISPER_MODEL.transcribe(
+                result = whisper_model.transcribe(
                     audio_path,
                     fp16=False,   # CPU-friendly
                     language="en"
@@ -230,6 +312,7 @@ def analyze_gaze_and_emotion(video_path: str) -> dict:
             "gaze": {
                 "percentage": 0.0,
                 "looked_away_events": 0,
+                "looked_away_episodes": 0,
                 "total_face_frames": 0,
                 "frames_with_eye_contact": 0
             }
@@ -249,147 +332,75 @@ def analyze_gaze_and_emotion(video_path: str) -> dict:
         sample_stride = int(fps)
 
     emotion_counts = Counter()
-    total_face_frames = 0
-    frames_with_eye_contact = 0
-
-    frame_idx = 0
-    mp_face_mesh = mp_solutions.solutions.face_mesh
-
-    def avg_coords(landmarks, indices):
-        """Safely average coordinates, skip if indices missing."""
-        valid_coords = []
-        for i in indices:
-            if i < len(landmarks):
-                valid_coords.append((landmarks[i].x, landmarks[i].y))
-        if valid_coords:
-            xs = [coord[0] for coord in valid_coords]
-            ys = [coord[1] for coord in valid_coords]
-            return sum(xs) / len(xs), sum(ys) / len(ys)
-        return 0.5, 0.5  # fallback center
-
-    with mp_face_mesh.FaceMesh(
-        static_image_mode=False,
-        max_num_faces=1,
-        refine_landmarks=True,  # needed for iris
-        min_detection_confidence=0.3,  # lowered for more detections
-        min_tracking_confidence=0.3    # lowered for more detections
-    ) as face_mesh:
-
-        while True:
-            ret, frame = cap.read()
-            if not ret or frame_idx >= max_frames_to_analyze:
-                break
-
-            if frame_idx % sample_stride == 0:
-                # ---------- EMOTION ANALYSIS (unchanged) ----------
-                try:
-                    small_frame = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
-                    emotion_result = DeepFace.analyze(
-                        small_frame,
-                        actions=["emotion"],
-                        enforce_detection=False,
-                        detector_backend="opencv"
-                    )
-                    if isinstance(emotion_result, list) and len(emotion_result) > 0:
-                        dom = emotion_result[0].get("dominant_emotion", None)
-                    else:
-                        dom = emotion_result.get("dominant_emotion", None)
-
-                    if dom:
-                        emotion_counts[dom] += 1
-                except Exception:
-                    pass
-
-                # ---------- IMPROVED GAZE DETECTION ----------
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = face_mesh.process(rgb_frame)
-
-                if results.multi_face_landmarks:
-                    total_face_frames += 1
-                    landmarks = results.multi_face_landmarks[0].landmark
-
-                    try:
-                        # Eye corners & iris (more robust indexing)
-                        left_outer_idx = 33
-                        left_inner_idx = 133
-                        right_outer_idx = 362
-                        right_inner_idx = 263
-                        
-                        left_iris_indices = [468, 469, 470, 471]
-                        right_iris_indices = [473, 474, 475, 476]
-
-                        # Safely get eye corners
-                        left_outer = landmarks[left_outer_idx] if left_outer_idx < len(landmarks) else None
-                        left_inner = landmarks[left_inner_idx] if left_inner_idx < len(landmarks) else None
-                        right_outer = landmarks[right_outer_idx] if right_outer_idx < len(landmarks) else None
-                        right_inner = landmarks[right_inner_idx] if right_inner_idx < len(landmarks) else None
-
-                        # Safely get iris centers
-                        left_iris_x, _ = avg_coords(landmarks, left_iris_indices)
-                        right_iris_x, _ = avg_coords(landmarks, right_iris_indices)
-
-                        # IMPROVED: More lenient normalization (0=left, 1=right)
-                        def normalized_pos(outer, inner, iris_x):
-                            if outer is None or inner is None:
-                                return 0.5  # neutral if eye corners missing
-                            
-                            denom = abs(inner.x - outer.x)
-                            if denom < 1e-4:  # very small eye width
-                                return 0.5
-                            
-                            # Flip logic if right eye (outer.x > inner.x)
-                            if outer.x < inner.x:  # left eye
-                                return (iris_x - outer.x) / denom
-                            else:  # right eye
-                                return (inner.x - iris_x) / denom  # reversed for right eye
-
-                        left_norm = normalized_pos(left_outer, left_inner, left_iris_x)
-                        right_norm = normalized_pos(right_outer, right_inner, right_iris_x)
-
-                        # RELAXED: Much wider "center" range (0.2-0.8 instead of 0.3-0.7)
-                        # Accept if EITHER eye is centered (not both)
-                        left_centered = 0.2 <= left_norm <= 0.8
-                        right_centered = 0.2 <= right_norm <= 0.8
-                        at_least_one_eye_centered = left_centered or right_centered
-
-                        # SIMPLIFIED HEAD FACING: Much more lenient (0.6 instead of 0.75)
-                        # Only check if both eye corners available
-                        head_facing = True
-                        if left_outer and right_outer:
-                            nose = landmarks[1] if 1 < len(landmarks) else landmarks[0]
-                            def dist(a, b):
-                                return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
-                            
-                            d_left = dist(left_outer, nose)
-                            d_right = dist(right_outer, nose)
-                            if max(d_left, d_right) > 0:
-                                ratio_lr = min(d_left, d_right) / max(d_left, d_right)
-                                head_facing = ratio_lr > 0.6  # much more lenient
-
-                        # IMPROVED LOGIC: Much easier to pass
-                        is_looking_at_screen = at_least_one_eye_centered and head_facing
-
-                        if is_looking_at_screen:
-                            frames_with_eye_contact += 1
-
-                        # Debug print for first 10 frames (remove later)
-                        if total_face_frames <= 10:
-                            print(f"[GAZE DEBUG] Frame {total_face_frames}: "
-                                  f"L:{left_norm:.2f}, R:{right_norm:.2f}, "
-                                  f"eyes:{at_least_one_eye_centered}, head:{head_facing}, "
-                                  f"contact:{is_looking_at_screen}")
-
-                    except Exception as e:
-                        # Silently skip bad frames
-                        pass
-
-            frame_idx += 1
+    emotions = EmotionEngine(EMOTION_BATCH_SIZE)
+    # Landmarks ((478, 3) arrays) and indices of the frames with a face; the
+    # gaze metrics are computed for all of them at once after the loop
+    face_landmarks = []
+    face_frames = []
+    analyzed_frames = 0
+
+    sampler = None
+    if FRAME_SAMPLING_MODE == "adaptive":
+        fixed_count = (max_frames_to_analyze - 1) // sample_stride + 1
+        sampler = AdaptiveSampler(fps, max_frames_to_analyze, int(fixed_count * ADAPTIVE_BUDGET_FACTOR))
+        sampled_frames = sampler.frames(cap)
+    else:
+        sampled_frames = iter_sampled_frames(cap, sample_stride, max_frames_to_analyze, FRAME_SAMPLING_MODE)
+
+    with MODELS.checkout("face_mesh") as face_mesh:
+
+        for frame_idx, frame in sampled_frames:
+            analyzed_frames += 1
+            # ---------- EMOTION ANALYSIS (batched, see emotion_engine.py) ----------
+            try:
+                small_frame = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
+                emotions.add(small_frame)
+            except Exception:
+                pass
+
+            # ---------- IMPROVED GAZE DETECTION ----------
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            results = face_mesh.process(rgb_frame)
+
+            confident = False
+            if results.multi_face_landmarks:
+                landmarks = landmarks_to_array(results.multi_face_landmarks[0].landmark)
+                face_landmarks.append(landmarks)
+                face_frames.append(frame_idx)
+                if sampler is not None:
+                    confident = decision_margin(gaze_metrics(landmarks))[0] >= ADAPTIVE_MIN_MARGIN
+            if sampler is not None:
+                sampler.report(confident)
 
     cap.release()
 
+    for dom in emotions.finish():
+        if dom:
+            emotion_counts[dom] += 1
+
+    # ---------- GAZE (vectorized over all face frames, see gaze.py) ----------
+    total_face_frames = len(face_landmarks)
+    gaze = gaze_metrics(np.stack(face_landmarks) if face_landmarks else np.empty((0, 478, 3), np.float32))
+    frames_with_eye_contact = int(gaze["eye_contact"].sum())
+
+    # Debug print for first 10 frames (remove later)
+    for i in range(min(total_face_frames, 10)):
+        print(f"[GAZE DEBUG] Frame {i + 1}: "
+              f"L:{gaze['left'][i]:.2f}, R:{gaze['right'][i]:.2f}, "
+              f"head:{gaze['head_ratio'][i]:.2f}, contact:{bool(gaze['eye_contact'][i])}")
+
+    # With adaptive sampling each frame counts for the time up to the next
+    # analyzed frame, so dense sampling around changes doesn't skew it
     gaze_percentage = 0.0
     if total_face_frames > 0:
-        gaze_percentage = (frames_with_eye_contact / total_face_frames) * 100.0
+        weights = None
+        if sampler is not None:
+            weights = sampler.durations()[np.searchsorted(sampler.analyzed, face_frames)]
+        gaze_percentage = float(np.average(gaze["eye_contact"], weights=weights)) * 100.0
+
+    sampling = {"mode": FRAME_SAMPLING_MODE, "analyzed_frames": analyzed_frames}
+    if sampler is not None:
+        sampling.update(budget=sampler.budget, triggers=sampler.triggers)
 
     # Emotion summary (unchanged)
     if emotion_counts:
@@ -411,9 +422,15 @@ def analyze_gaze_and_emotion(video_path: str) -> dict:
         },
         "gaze": {
             "percentage": round(gaze_percentage, 2),
-            "looked_away_events": max(total_face_frames - frames_with_eye_contact, 0),
+            # Face frames without eye contact
+            "looked_away_events": total_face_frames - frames_with_eye_contact,
+            # Runs of consecutive face frames without eye contact
+            "looked_away_episodes": look_away_episodes(gaze["eye_contact"]),
             "total_face_frames": total_face_frames,
-            "frames_with_eye_contact": frames_with_eye_contact
+            "frames_with_eye_contact": frames_with_eye_contact,
+            # Per face frame: time (s), eye contact, iris positions, head ratio
+            "series": gaze_series([i / fps for i in face_frames], gaze),
+            "sampling": sampling
         }
     }
 
@@ -459,18 +476,237 @@ def compute_interview_scores(gaze: dict, fluency: dict) -> dict:
         "overall_score": overall_score
     }
 
+# -------------------------------------------------
+# Branch processes: audio and video analysis in parallel
+# -------------------------------------------------
+
+def branch_thread_budgets() -> tuple:
+    """(audio, video) thread counts per branch process."""
+    cpus = max(1, (os.cpu_count() or 1) // max(1, ANALYSIS_WORKERS))
+    audio = AUDIO_BRANCH_THREADS or max(1, cpus // 2)
+    video = VIDEO_BRANCH_THREADS or max(1, cpus - audio)
+    return audio, video
+
+
+# OpenMP / BLAS read these once, when NumPy, OpenCV and PyTorch are loaded,
+# which a spawned branch process does while importing this module, before
+# its initializer runs; so they are put in its environment when it starts
+# (see submit_branch)
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def _limit_torch_threads(threads: int):  # Whisper
+    import torch
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+
+def _limit_tensorflow_threads(threads: int):  # DeepFace
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _limit_blas_threads(threads: int):  # NumPy's BLAS, if threadpoolctl is installed
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)
+
+
+def limit_branch_threads(branch: str, threads: int):
+    """
+    Cap the thread pools the libraries of a branch process set up at runtime
+    (before any model runs in that process).
+    """
+    cv2.setNumThreads(threads)
+    for library, limit in (
+        ("PyTorch", _limit_torch_threads),
+        ("TensorFlow", _limit_tensorflow_threads),
+        ("BLAS", _limit_blas_threads),
+    ):
+        try:
+            limit(threads)
+        except Exception as e:
+            print(f"[PIPELINE] {branch} branch process {os.getpid()}: could not limit {library} threads: {e}")
+    print(f"[PIPELINE] {branch} branch process {os.getpid()} limited to {threads} thread(s)")
+
+
+def init_branch_process(branch: str, threads: int):
+    """Pool initializer: thread budget, then the branch's models, before any job."""
+    limit_branch_threads(branch, threads)
+    MODELS.warm_up(BRANCH_MODELS[branch])
+
+
+def branch_models_status(branch: str) -> dict:
+    return {"pid": os.getpid(), "models": MODELS.status(BRANCH_MODELS[branch])}
+
+
+def run_branch(fn, video_path: str) -> tuple:
+    """(fn(video_path), wall-clock seconds); runs in the branch process."""
+    start = time.perf_counter()
+    result = fn(video_path)
+    return result, time.perf_counter() - start
+
+
+# One process pool per branch, a process per job worker in each, started on
+# first use and kept (with its loaded models) for the following interviews.
+# "spawn", not fork: the server process has job and request threads running
+# (and TensorFlow loaded), which a forked child can deadlock on.
+_branch_pools = {}
+_branch_pools_lock = threading.Lock()
+_branch_env_lock = threading.Lock()
+
+
+def branch_threads(branch: str) -> int:
+    audio_threads, video_threads = branch_thread_budgets()
+    return audio_threads if branch == "audio" else video_threads
+
+
+def branch_pool(branch: str) -> ProcessPoolExecutor:
+    with _branch_pools_lock:
+        pool = _branch_pools.get(branch)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=max(1, ANALYSIS_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_branch_process,
+                initargs=(branch, branch_threads(branch))
+            )
+            _branch_pools[branch] = pool
+        return pool
+
+
+def submit_branch(branch: str, fn, *args):
+    """
+    Submit a call to a branch's pool. The pool starts its processes from
+    submit(), so the thread variables are set in this process's environment
+    for the duration, for a new process to inherit.
+    """
+    threads = str(branch_threads(branch))
+    with _branch_env_lock:
+        saved = {var: os.environ.get(var) for var in THREAD_ENV_VARS}
+        os.environ.update({var: threads for var in THREAD_ENV_VARS})
+        try:
+            return branch_pool(branch).submit(fn, *args)
+        finally:
+            for var, value in saved.items():
+                if value is None:
+                    os.environ.pop(var, None)
+                else:
+                    os.environ[var] = value
+
+
+# A pool whose process died (e.g. killed for memory) can't run anything
+# more; drop it so the next interview starts a fresh one
+def discard_branch_pool(branch: str):
+    with _branch_pools_lock:
+        pool = _branch_pools.pop(branch, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------- Warm-up and readiness ----------
+# Started with the job workers. In parallel mode: one status call per branch
+# process, which answers once its pool initializer has warmed the branch's
+# models; in sequential mode this process warms all models on a thread.
+_warm_up = {"started": False, "futures": []}
+_warm_up_lock = threading.Lock()
+
+
+def start_model_warm_up():
+    with _warm_up_lock:
+        if _warm_up["started"]:
+            return
+        _warm_up["started"] = True
+        if PARALLEL_BRANCHES:
+            _warm_up["futures"] = [
+                (branch, submit_branch(branch, branch_models_status, branch))
+                for branch in BRANCH_MODELS
+                for _ in range(max(1, ANALYSIS_WORKERS))
+            ]
+        else:
+            threading.Thread(target=MODELS.warm_up, name="model-warm-up", daemon=True).start()
+
+
+def readiness() -> tuple:
+    """(ready, model states per branch process or of this process)"""
+    if not PARALLEL_BRANCHES:
+        return _warm_up["started"] and MODELS.ready(), {"models": MODELS.status()}
+
+    ready = _warm_up["started"]
+    processes = []
+    for branch, future in _warm_up["futures"]:
+        if not future.done():
+            processes.append({"branch": branch, "state": "starting"})
+            ready = False
+        elif future.exception() is not None:
+            processes.append({"branch": branch, "state": "failed", "error": str(future.exception())})
+            ready = False
+        else:
+            status = future.result()
+            warm = all(is_ready(model) for model in status["models"].values())
+            processes.append({"branch": branch, "state": "ready" if warm else "failed", **status})
+            ready = ready and warm
+    return ready, {"processes": processes}
+
+
 # -------------------------------------------------
 # Main analysis pipeline
 # -------------------------------------------------
 
-def analyze_full_interview(video_path: str) -> dict:
+BRANCHES = (
+    ("audio", analyze_audio_fluency),
+    ("video", analyze_gaze_and_emotion),
+)
+
+
+def branch_partial(branch: str, result: dict) -> dict:
+    if branch == "audio":
+        return {"fluency": result}
+    return {
+        "gaze": result.get("gaze", {}),
+        "emotions": result.get("emotions", {}),
+        "emotion_summary": result.get("emotion_summary", {}),
+    }
+
+
+def analyze_full_interview(video_path: str, on_partial=None) -> dict:
     """
     Full pipeline: fluency + gaze + emotions + derived scores.
+    The audio and video branches run in parallel (see PARALLEL_BRANCHES);
+    `on_partial` (optional) receives each branch's result as soon as it is done.
     """
     print(f"[PIPELINE] Running full analysis for {video_path}")
+    start = time.perf_counter()
+    results = {}
+    timings = {}
+
+    def finish(branch, result, seconds):
+        results[branch] = result
+        timings[f"{branch}_seconds"] = round(seconds, 2)
+        print(f"[PIPELINE] {branch} branch done in {seconds:.1f}s")
+        if on_partial is not None:
+            on_partial(branch_partial(branch, result))
+
+    if PARALLEL_BRANCHES:
+        futures = {submit_branch(name, run_branch, fn, video_path): name for name, fn in BRANCHES}
+        for future in as_completed(futures):
+            branch = futures[future]
+            try:
+                result, seconds = future.result()
+            except BrokenProcessPool:
+                discard_branch_pool(branch)
+                raise RuntimeError(f"{branch} analysis process stopped unexpectedly")
+            finish(branch, result, seconds)
+    else:
+        for name, fn in BRANCHES:
+            finish(name, *run_branch(fn, video_path))
 
-    fluency_result = analyze_audio_fluency(video_path)
-    video_result = analyze_gaze_and_emotion(video_path)
+    fluency_result = results["audio"]
+    video_result = results["video"]
+    timings["total_seconds"] = round(time.perf_counter() - start, 2)
+    timings["parallel"] = PARALLEL_BRANCHES
+    print(f"[PIPELINE] Analysis done in {timings['total_seconds']:.1f}s "
+          f"(audio {timings['audio_seconds']:.1f}s, video {timings['video_seconds']:.1f}s)")
 
     scores = compute_interview_scores(
         gaze=video_result.get("gaze", {}),
@@ -483,9 +719,54 @@ def analyze_full_interview(video_path: str) -> dict:
         "gaze": video_result.get("gaze", {}),
         "emotions": video_result.get("emotions", {}),
         "emotion_summary": video_result.get("emotion_summary", {}),
-        "scores": scores
+        "scores": scores,
+        "timings": timings
     }
 
+# -------------------------------------------------
+# Background jobs
+# -------------------------------------------------
+
+def run_analysis_job(payload: dict, report) -> dict:
+    """
+    Runs on a job worker thread: analyze the uploaded video and save the
+    analysis JSON where /get-analysis serves it.
+    """
+    analysis_results = analyze_full_interview(payload["video_path"], on_partial=report)
+
+    analysis_filepath = os.path.join(UPLOAD_FOLDER, payload["analysis_filename"])
+    with open(analysis_filepath, "w", encoding="utf-8") as f:
+        json.dump(analysis_results, f, indent=2)
+
+    return analysis_results
+
+
+JOBS = JobQueue(
+    JOB_DB_PATH,
+    run_analysis_job,
+    workers=ANALYSIS_WORKERS,
+    max_depth=MAX_QUEUED_JOBS,
+)
+
+
+# Workers and the model warm-up start with the first request in the serving
+# process (not at import, which the Flask reloader's watcher process and the
+# spawned branch processes also do); queued jobs left from before a restart
+# resume then. A readiness probe on /ready is enough to start them.
+@app.before_request
+def start_job_workers():
+    JOBS.start()
+    start_model_warm_up()
+
+
+def queue_full_response():
+    response = jsonify({
+        "success": False,
+        "error": "Video analysis queue is full. Please retry in a few minutes."
+    })
+    response.headers["Retry-After"] = "60"
+    return response, 503
+
 # -------------------------------------------------
 # Flask endpoints
 # -------------------------------------------------
@@ -499,9 +780,30 @@ def health():
     return jsonify({
         "status": "ok",
         "service": "video-analysis",
-        "version": "3.0"
+        "version": "3.0",
+        "jobs": JOBS.stats()
     })
 
+# Readiness: 503 until every analysis process has loaded and warmed its
+# models, so a deploy takes traffic only once the first interview is fast
+@app.route("/ready", methods=["GET"])
+def ready():
+    is_warm, details = readiness()
+    return jsonify({"ready": is_warm, **details}), 200 if is_warm else 503
+
+
+# Remove a saved (or partly saved) video whose job was never queued
+def discard_upload(filepath):
+    if filepath is None or not os.path.exists(filepath):
+        return
+    try:
+        os.remove(filepath)
+    except OSError as e:
+        print(f"[UPLOAD] Could not remove {filepath}: {e}")
+
+
+# Submit: save the video and queue its analysis. Answers 202 right away;
+# poll status_url until the job is done (or failed).
 @app.route("/upload-video", methods=["POST"])
 def upload_video():
     if "video" not in request.files:
@@ -511,6 +813,11 @@ def upload_video():
     if file.filename == "":
         return jsonify({"success": False, "error": "No selected file"}), 400
 
+    # Don't store a video that can't be queued
+    if not JOBS.has_capacity():
+        return queue_full_response()
+
+    filepath = None
     try:
         ts = int(time.time() * 1000)
         # keep original extension if possible
@@ -521,30 +828,60 @@ def upload_video():
 
         print(f"[UPLOAD] Saved video to {filepath}")
 
-        # Run full analysis
-        analysis_results = analyze_full_interview(filepath)
-
-        # Save analysis JSON
         analysis_filename = f"analysis_{ts}.json"
-        analysis_filepath = os.path.join(UPLOAD_FOLDER, analysis_filename)
-        with open(analysis_filepath, "w", encoding="utf-8") as f:
-            json.dump(analysis_results, f, indent=2)
-
-        return jsonify({
-            "success": True,
-            "message": "Video uploaded and analyzed",
+        job_id = JOBS.submit({
+            "video_path": filepath,
             "video_url": f"/get-video/{filename}",
+            "analysis_filename": analysis_filename,
             "analysis_url": f"/get-analysis/{analysis_filename}",
-            "results": analysis_results
-        }), 200
-
+        })
+    except QueueFull:
+        discard_upload(filepath)
+        return queue_full_response()
     except Exception as e:
-        print(f"[UPLOAD] Analysis error: {e}")
+        print(f"[UPLOAD] Upload error: {e}")
+        discard_upload(filepath)
         return jsonify({
             "success": False,
-            "error": f"Analysis failed: {str(e)}"
+            "error": f"Upload failed: {str(e)}"
         }), 500
 
+    print(f"[UPLOAD] Queued analysis job {job_id}")
+    return jsonify({
+        "success": True,
+        "message": "Video uploaded, analysis queued",
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+        "video_url": f"/get-video/{filename}",
+        "analysis_url": f"/get-analysis/{analysis_filename}"
+    }), 202
+
+
+# Poll: state (queued / running / done / failed), queue position, the results
+# of the branches finished so far, and the full results once done
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Unknown job id"}), 404
+
+    payload = job["payload"]
+    return jsonify({
+        "success": job["state"] != "failed",
+        "job_id": job_id,
+        "status": job["state"],
+        "queue_position": job["queue_position"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "video_url": payload["video_url"],
+        "analysis_url": payload["analysis_url"],
+        "partial": job["partial"],
+        "results": job["result"],
+        "error": job["error"]
+    }), 200
+
 @app.route("/get-video/<filename>")
 def get_video(filename):
     return send_from_directory(UPLOAD_FOLDER, filename)
@@ -0,0 +1,186 @@
+"""
+Benchmark: look-away detection accuracy against CPU cost, fixed-stride vs
+adaptive frame sampling (frame_sampler.AdaptiveSampler).
+
+Generates synthetic interview videos locally: a drawn face over a noisy
+background with scripted look-away episodes (the irises slide to one side
+over 0.2 s and the head turns slightly; brief 0.3-1.2 s glances and longer
+2-6 s ones), plus distractors: head movement without a look-away and
+lighting changes. Every sampling strategy decodes the real video; the
+expensive per-frame analysis (FaceMesh + emotion) is stood in for by the
+script (eye contact and decision margin of the rendered iris position at
+that frame), and charged --analysis-ms of CPU per analyzed frame.
+
+Per strategy, summed over --videos videos:
+
+    analyses      frames given the expensive analysis
+    wall s        wall time of the whole sampling loop (decode, probes, and the
+                  stand-in analysis, which only reads the script)
+    loop cpu s    CPU time (this process) of the same loop
+    cpu s         loop cpu s + analyses * --analysis-ms
+    event err     |detected - true| look-away episodes (looked_away_episodes)
+    missed        true episodes (frames without eye contact) with no analyzed frame
+    contact err   mean |detected - true| eye-contact percentage
+
+Usage:
+    python benchmarks/bench_adaptive_sampling.py [--videos 4] [--seconds 120] [--analysis-ms 80]
+                                                 [--budget 1.0]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from frame_sampler import AdaptiveSampler, iter_sampled_frames  # noqa: E402
+from gaze import look_away_episodes  # noqa: E402
+
+FPS = 30.0
+SIZE = (320, 240)
+FIXED_EVERY = 2.0  # FRAME_SAMPLE_EVERY_SEC
+AWAY = 0.6         # iris offset (share of the eye width) while looking away
+CENTERED = 0.3     # offsets below this count as eye contact
+MIN_MARGIN = 0.05  # a smaller margin to CENTERED reports an unsure analysis
+RAMP = 0.2         # seconds for the irises to move
+
+
+def make_script(seconds, seed):
+    rng = np.random.default_rng(seed)
+    episodes, moves, lights = [], [], []
+    t = rng.uniform(2, 6)
+    while t < seconds - 3:
+        length = rng.uniform(0.3, 1.2) if rng.random() < 0.6 else rng.uniform(2, 6)
+        episodes.append((t, t + length))
+        t += length + rng.uniform(4, 20)
+    for _ in range(int(seconds / 15)):
+        moves.append((rng.uniform(0, seconds), rng.uniform(0.5, 2), rng.uniform(-30, 30)))
+        lights.append((rng.uniform(0, seconds), rng.uniform(0.8, 1.2)))
+    return episodes, moves, lights
+
+
+def iris_offset(t, episodes):
+    for start, end in episodes:
+        if start - RAMP < t < end + RAMP:
+            return AWAY * min(1.0, (t - start + RAMP) / RAMP, (end + RAMP - t) / RAMP)
+    return 0.0
+
+
+def render(path, seconds, script, seed):
+    episodes, moves, lights = script
+    rng = np.random.default_rng(seed)
+    w, h = SIZE
+    background = cv2.GaussianBlur(rng.integers(0, 255, (h, w, 3), dtype=np.uint8), (0, 0), 5)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), FPS, SIZE)
+    for i in range(int(seconds * FPS)):
+        t = i / FPS
+        dx = sum(shift * np.sin(np.pi * min(1, (t - start) / length))
+                 for start, length, shift in moves if start <= t <= start + length)
+        light = next((gain for start, gain in lights if start <= t <= start + 1.5), 1.0)
+        frame = (background * light + rng.normal(0, 2, background.shape)).clip(0, 255).astype(np.uint8)
+        offset = iris_offset(t, episodes)
+        cx, cy = int(w / 2 + dx + offset * 12), h // 2
+        cv2.ellipse(frame, (cx, cy), (55, 70), 0, 0, 360, (150, 180, 220), -1)
+        for side in (-1, 1):
+            ex, ey = cx + side * 24, cy - 15
+            cv2.ellipse(frame, (ex, ey), (13, 7), 0, 0, 360, (255, 255, 255), -1)
+            cv2.circle(frame, (int(ex + offset * 13), ey), 5, (60, 40, 20), -1)
+        cv2.line(frame, (cx - 18, cy + 35), (cx + 18, cy + 35), (60, 40, 130), 3)
+        writer.write(frame)
+    writer.release()
+
+
+def truth(seconds, episodes):
+    offsets = np.array([iris_offset(i / FPS, episodes) for i in range(int(seconds * FPS))])
+    contact = offsets < CENTERED
+    return offsets, contact
+
+
+# (first, last + 1) frame of every run without eye contact
+def away_runs(contact):
+    edges = np.flatnonzero(np.diff(np.concatenate(([1], contact.astype(int), [1]))))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def run_strategy(path, strategy, offsets, budget_factor):
+    cap = cv2.VideoCapture(str(path))
+    max_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    start = time.perf_counter()
+    start_cpu = time.process_time()
+    sampler = None
+    if strategy.startswith("fixed"):
+        every = float(strategy.split()[1].rstrip("s"))
+        frames = iter_sampled_frames(cap, int(every * FPS), max_frames, "seek")
+    else:
+        budget = int(np.ceil(max_frames / FPS / FIXED_EVERY * budget_factor))
+        sampler = AdaptiveSampler(FPS, max_frames, budget)
+        frames = sampler.frames(cap)
+    analyzed = []
+    for frame_idx, _ in frames:
+        analyzed.append(frame_idx)
+        if sampler is not None:
+            sampler.report(confident=abs(offsets[frame_idx] - CENTERED) >= MIN_MARGIN)
+    seconds = time.perf_counter() - start
+    cpu_seconds = time.process_time() - start_cpu
+    cap.release()
+
+    contact = offsets[analyzed] < CENTERED
+    weights = sampler.durations() if sampler is not None else np.ones(len(analyzed))
+    return {
+        "analyzed": np.array(analyzed),
+        "seconds": seconds,
+        "cpu_seconds": cpu_seconds,
+        "events": look_away_episodes(contact),
+        "contact_pct": float(np.average(contact, weights=weights) * 100),
+    }
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--analysis-ms", type=float, default=80.0)
+    parser.add_argument("--budget", type=float, default=1.0, help="adaptive budget, times the fixed 2 s stride's")
+    args = parser.parse_args()
+
+    strategies = ["fixed 2s", "fixed 1s", "adaptive"]
+    totals = {name: {"analyses": 0, "seconds": 0.0, "cpu_seconds": 0.0, "event_err": 0, "missed": 0, "contact_err": 0.0}
+              for name in strategies}
+    true_events = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for seed in range(args.videos):
+            path = Path(tmp) / f"interview_{seed}.mp4"
+            script = make_script(args.seconds, seed)
+            render(path, args.seconds, script, seed)
+            offsets, contact = truth(args.seconds, script[0])
+            true_events += len(away_runs(contact))
+            for name in strategies:
+                result = run_strategy(path, name, offsets, args.budget)
+                total = totals[name]
+                total["analyses"] += len(result["analyzed"])
+                total["seconds"] += result["seconds"]
+                total["cpu_seconds"] += result["cpu_seconds"]
+                total["event_err"] += abs(result["events"] - len(away_runs(contact)))
+                total["missed"] += sum(
+                    not np.any((result["analyzed"] >= start) & (result["analyzed"] < end))
+                    for start, end in away_runs(contact)
+                )
+                total["contact_err"] += abs(result["contact_pct"] - contact.mean() * 100) / args.videos
+
+    print(f"{args.videos} synthetic videos of {args.seconds:.0f}s, {true_events} look-away episodes; "
+          f"{args.analysis_ms:.0f} ms per analyzed frame, adaptive budget {args.budget}x\n")
+    print(f"{'strategy':<10} {'analyses':>9} {'wall s':>8} {'loop cpu s':>11} {'cpu s':>8} {'event err':>10} "
+          f"{'missed':>7} {'contact err':>12}")
+    for name, total in totals.items():
+        cpu = total["cpu_seconds"] + total["analyses"] * args.analysis_ms / 1000
+        print(f"{name:<10} {total['analyses']:>9} {total['seconds']:8.2f} {total['cpu_seconds']:11.2f} {cpu:8.1f} "
+              f"{total['event_err']:>10} {total['missed']:>7} {total['contact_err']:11.2f}%")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,105 @@
+"""
+Benchmark: emotion labels per second, DeepFace.analyze per frame vs the
+batched EmotionEngine (emotion_engine.py).
+
+Generates --frames test frames locally (drawn faces of varying size,
+position, brightness and expression over a noisy background, at the half
+resolution analyze_gaze_and_emotion passes to the emotion model), labels
+them the current way, one DeepFace.analyze(actions=["emotion"]) call per
+frame, and with EmotionEngine at each --batch size, and reports frames per
+second. The batched labels must equal the per-frame ones.
+
+Usage:
+    python benchmarks/bench_emotion_batch.py [--frames 90] [--batch 1 8 32] [--size 320x240]
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from deepface import DeepFace  # noqa: E402
+
+from emotion_engine import EmotionEngine  # noqa: E402
+
+
+def make_frames(count, width, height):
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (0, 0), 4)
+    frames = []
+    for i in range(count):
+        frame = (background * rng.uniform(0.5, 1.2)).clip(0, 255).astype(np.uint8)
+        size = int(height * rng.uniform(0.25, 0.4))
+        cx = int(width / 2 + rng.integers(-width // 6, width // 6))
+        cy = int(height / 2 + rng.integers(-height // 8, height // 8))
+        skin = tuple(int(v) for v in rng.integers(120, 230, 3))
+        cv2.ellipse(frame, (cx, cy), (int(size * 0.8), size), 0, 0, 360, skin, -1)
+        for side in (-1, 1):
+            eye = (cx + side * size // 3, cy - size // 4)
+            cv2.ellipse(frame, eye, (size // 7, size // 12), 0, 0, 360, (255, 255, 255), -1)
+            cv2.circle(frame, eye, size // 16, (40, 30, 20), -1)
+            cv2.line(frame, (eye[0] - size // 6, eye[1] - size // 5 + int(rng.integers(-4, 5))),
+                     (eye[0] + size // 6, eye[1] - size // 5), (30, 30, 30), 2)
+        smile = int(rng.integers(-size // 5, size // 5))
+        start, end = (0, 180) if smile >= 0 else (180, 360)
+        cv2.ellipse(frame, (cx, cy + size // 2), (size // 3, abs(smile) + 1), 0, start, end, (40, 20, 120), 3)
+        frames.append(frame)
+    return frames
+
+
+def per_frame_labels(frames):
+    labels = []
+    for frame in frames:
+        result = DeepFace.analyze(frame, actions=["emotion"], enforce_detection=False, detector_backend="opencv")
+        labels.append(result[0]["dominant_emotion"] if result else None)
+    return labels
+
+
+def batched_labels(frames, batch_size):
+    engine = EmotionEngine(batch_size)
+    for frame in frames:
+        engine.add(frame)
+    return engine.finish()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=90)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--size", default="320x240")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    frames = make_frames(args.frames, width, height)
+    # Build the model and detector, and trace the model, outside the timings
+    per_frame_labels(frames[:2])
+    batched_labels(frames[:2], 2)
+
+    seconds, expected = timed(per_frame_labels, frames)
+    counts = Counter(expected)
+    print(f"{args.frames} frames of {width}x{height}; labels: "
+          f"{', '.join(f'{label} {n}' for label, n in counts.most_common())}\n")
+    print(f"{'path':<20} {'seconds':>8} {'frames/s':>9} {'speedup':>8} {'same labels':>12}")
+    print(f"{'analyze per frame':<20} {seconds:8.2f} {args.frames / seconds:9.1f} {1.0:7.1f}x {'-':>12}")
+    for batch_size in args.batch:
+        batch_seconds, labels = timed(batched_labels, frames, batch_size)
+        same = sum(a == b for a, b in zip(labels, expected))
+        print(f"{f'engine, batch {batch_size}':<20} {batch_seconds:8.2f} {args.frames / batch_seconds:9.1f} "
+              f"{seconds / batch_seconds:7.1f}x {f'{same}/{args.frames}':>12}")
+        assert labels == expected, f"batch {batch_size}: labels differ from DeepFace.analyze"
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,99 @@
+"""
+Benchmark: decode throughput of the frame sampling modes (frame_sampler.py).
+
+Generates test videos locally with OpenCV's VideoWriter (moving shapes over
+a noisy background, so the encoders have real work to do), one per
+container/codec, and for each sampling mode reports the wall time to pull
+the sampled frames of the whole video (one every --every seconds, as
+analyze_gaze_and_emotion does with FRAME_SAMPLE_EVERY_SEC) and the speed in
+seconds of video per second. Every mode must return the same frames as
+"read"; the largest pixel difference is reported.
+
+Usage:
+    python benchmarks/bench_frame_sampling.py [--seconds 60] [--every 2.0] [--size 640x480] [--repeat 3]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from frame_sampler import SAMPLING_MODES, iter_sampled_frames  # noqa: E402
+
+FPS = 30.0
+# (file name, fourcc)
+FORMATS = (
+    ("mpeg4.mp4", "mp4v"),
+    ("vp8.webm", "VP80"),
+    ("mjpeg.avi", "MJPG"),
+)
+
+
+def make_video(path, fourcc, seconds, width, height):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc), FPS, (width, height))
+    if not writer.isOpened():
+        return False
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    background = cv2.GaussianBlur(background, (0, 0), 3)
+    for i in range(int(seconds * FPS)):
+        frame = background.copy()
+        x = int(width / 2 + width / 3 * np.sin(i / 40))
+        cv2.circle(frame, (x, height // 2), height // 6, (40, 180, 240), -1)
+        cv2.rectangle(frame, (i * 3 % width, 20), (i * 3 % width + 60, 80), (255, 255, 255), -1)
+        cv2.putText(frame, str(i), (10, height - 20), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3)
+        writer.write(frame)
+    writer.release()
+    return True
+
+
+def sample(path, mode, every):
+    cap = cv2.VideoCapture(str(path))
+    fps = cap.get(cv2.CAP_PROP_FPS) or FPS
+    max_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    start = time.perf_counter()
+    frames = list(iter_sampled_frames(cap, int(every * fps), max_frames, mode))
+    seconds = time.perf_counter() - start
+    cap.release()
+    return seconds, frames
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--every", type=float, default=2.0)
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    print(f"{args.seconds:.0f}s test videos at {FPS:.0f} fps, {width}x{height}, "
+          f"one frame every {args.every}s, best of {args.repeat}\n")
+    print(f"{'video':<11} {'mode':<5} {'seconds':>8} {'x realtime':>11} {'speedup':>8} {'frames':>7} {'max diff':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fourcc in FORMATS:
+            path = Path(tmp) / name
+            if not make_video(path, fourcc, args.seconds, width, height):
+                print(f"{name:<11} (no {fourcc} encoder in this OpenCV build)")
+                continue
+            reference = None
+            for mode in SAMPLING_MODES:
+                seconds, frames = min((sample(path, mode, args.every) for _ in range(args.repeat)),
+                                      key=lambda r: r[0])
+                if reference is None:
+                    reference, read_seconds = frames, seconds
+                assert [i for i, _ in frames] == [i for i, _ in reference], f"{name} {mode}: other frames"
+                diff = max(int(cv2.absdiff(a, b).max()) for (_, a), (_, b) in zip(frames, reference))
+                print(f"{name:<11} {mode:<5} {seconds:8.2f} {args.seconds / seconds:11.1f} "
+                      f"{read_seconds / seconds:7.1f}x {len(frames):>7} {diff:>9}")
+            print()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,138 @@
+"""
+Benchmark: gaze metrics per landmark object (the loop analyze_gaze_and_emotion
+used to run) vs vectorized over stacked landmark arrays (gaze.py).
+
+Generates --frames FaceMesh-like landmark sets (478 points: eye corners,
+irises and nose placed like a face, looking at or away from the screen,
+head turned or not, plus noise) as objects with float32 x / y / z like
+MediaPipe's, and times:
+
+    per landmark   the previous per-frame Python code on the landmark objects
+    convert        landmarks_to_array for every frame, then np.stack
+    vectorized     gaze_metrics over the (frames, 478, 3) array
+
+The eye-contact flags (and the iris positions) must be identical.
+
+Usage:
+    python benchmarks/bench_gaze.py [--frames 5400] [--repeat 3]
+"""
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from gaze import gaze_metrics, landmarks_to_array  # noqa: E402
+
+
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+
+def make_faces(count, seed=0):
+    rng = np.random.default_rng(seed)
+    faces = []
+    for _ in range(count):
+        points = rng.uniform(0.3, 0.7, (478, 3))
+        cx, cy = rng.uniform(0.4, 0.6, 2)
+        turn = rng.choice([0.0, rng.uniform(-0.08, 0.08)])
+        look = rng.choice([0.0, rng.uniform(-0.5, 0.5)])
+        eye_w = rng.uniform(0.02, 0.06)
+        for outer, inner, side in ((33, 133, -1), (362, 263, 1)):
+            ex = cx + side * 0.07
+            points[outer, :2] = (ex - eye_w / 2, cy)
+            points[inner, :2] = (ex + eye_w / 2, cy)
+        points[1, :2] = (cx + turn, cy + 0.08)
+        for iris, ex in (((468, 469, 470, 471), cx - 0.07), ((473, 474, 475, 476), cx + 0.07)):
+            for i in iris:
+                points[i, :2] = (ex + look * eye_w + rng.normal(0, 0.002), cy + rng.normal(0, 0.002))
+        points = points.astype(np.float32)
+        faces.append([Landmark(*p) for p in points])
+    return faces
+
+
+def per_landmark(landmarks):
+    """The previous per-frame code of analyze_gaze_and_emotion."""
+    def avg_coords(landmarks, indices):
+        valid_coords = []
+        for i in indices:
+            if i < len(landmarks):
+                valid_coords.append((landmarks[i].x, landmarks[i].y))
+        if valid_coords:
+            xs = [coord[0] for coord in valid_coords]
+            ys = [coord[1] for coord in valid_coords]
+            return sum(xs) / len(xs), sum(ys) / len(ys)
+        return 0.5, 0.5
+
+    left_outer, left_inner = landmarks[33], landmarks[133]
+    right_outer, right_inner = landmarks[362], landmarks[263]
+    left_iris_x, _ = avg_coords(landmarks, [468, 469, 470, 471])
+    right_iris_x, _ = avg_coords(landmarks, [473, 474, 475, 476])
+
+    def normalized_pos(outer, inner, iris_x):
+        denom = abs(inner.x - outer.x)
+        if denom < 1e-4:
+            return 0.5
+        if outer.x < inner.x:
+            return (iris_x - outer.x) / denom
+        return (inner.x - iris_x) / denom
+
+    left_norm = normalized_pos(left_outer, left_inner, left_iris_x)
+    right_norm = normalized_pos(right_outer, right_inner, right_iris_x)
+    at_least_one_eye_centered = 0.2 <= left_norm <= 0.8 or 0.2 <= right_norm <= 0.8
+
+    head_facing = True
+    nose = landmarks[1]
+
+    def dist(a, b):
+        return math.sqrt((a.x - b.x) ** 2 + (a.y - b.y) ** 2)
+
+    d_left = dist(left_outer, nose)
+    d_right = dist(right_outer, nose)
+    if max(d_left, d_right) > 0:
+        head_facing = min(d_left, d_right) / max(d_left, d_right) > 0.6
+    return left_norm, right_norm, at_least_one_eye_centered and head_facing
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=5400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    faces = make_faces(args.frames)
+    loop_s, expected = best(lambda: [per_landmark(f) for f in faces], args.repeat)
+    convert_s, stacked = best(lambda: np.stack([landmarks_to_array(f) for f in faces]), args.repeat)
+    vector_s, metrics = best(lambda: gaze_metrics(stacked), args.repeat)
+
+    left, right, contact = (np.array(column) for column in zip(*expected))
+    assert np.array_equal(metrics["eye_contact"], contact), "eye contact flags differ"
+    assert np.array_equal(metrics["left"], left) and np.array_equal(metrics["right"], right), "iris positions differ"
+
+    print(f"{args.frames} face frames, {contact.mean():.0%} with eye contact; best of {args.repeat}\n")
+    print(f"{'step':<15} {'ms':>9} {'us/frame':>9}")
+    for name, seconds in (("per landmark", loop_s), ("convert", convert_s), ("vectorized", vector_s)):
+        print(f"{name:<15} {seconds * 1000:9.2f} {seconds * 1e6 / args.frames:9.2f}")
+    print(f"\nvectorized metrics {loop_s / vector_s:.0f}x faster than per landmark; converting all "
+          f"{stacked.shape[1]} landmarks to the array costs {convert_s * 1e6 / args.frames:.0f} us per frame")
+
+
+if __name__ == "__main__":
+    run()
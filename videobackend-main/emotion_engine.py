@@ -0,0 +1,136 @@
+import inspect
+from typing import List, Optional
+
+import cv2
+import numpy as np
+from deepface import DeepFace
+
+# The batched path calls DeepFace internals as laid out in deepface 0.0.91
+# (pinned in requirements.txt); other versions move or change them, and the
+# engine then falls back to one DeepFace.analyze call per frame
+try:
+    from deepface.extendedmodels import Emotion
+    from deepface.modules import detection, modeling, preprocessing
+except ImportError:
+    Emotion = detection = modeling = preprocessing = None
+
+
+def _batched_support() -> bool:
+    if Emotion is None:
+        return False
+    try:
+        extract_faces = inspect.signature(detection.extract_faces).parameters
+        build_model = inspect.signature(modeling.build_model).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return (
+        {"img_path", "detector_backend", "grayscale", "enforce_detection", "align", "expand_percentage"} <= set(extract_faces)
+        and list(build_model)[:1] == ["model_name"]
+        and callable(getattr(preprocessing, "resize_image", None))
+        and len(getattr(Emotion, "labels", ())) == 7
+    )
+
+
+BATCHED = _batched_support()
+if not BATCHED:
+    print("[EMOTION] DeepFace internals not as in 0.0.91: analyzing one frame at a time")
+
+
+class EmotionEngine:
+    """
+    Dominant emotion of the sampled frames of one video, with DeepFace's
+    emotion model run over batches of faces instead of one DeepFace.analyze
+    call (one model dispatch) per frame.
+
+    - every frame goes through the same face detection and preprocessing as
+      DeepFace.analyze(frame, actions=["emotion"], enforce_detection=False),
+      so the labels are the ones analyze() gives: the first face of the
+      frame, or the whole frame when no face is found
+    - faces wait as 48x48 grayscale crops and are predicted `batch_size` at
+      a time; finish() predicts the rest and returns a label per frame
+    - the model is built once per process (DeepFace caches it); load()
+      builds it ahead of the first video
+    - a frame that fails (e.g. a broken image) gets None, as the per-frame
+      path skipped it
+    - without the deepface internals it relies on (BATCHED is False), each
+      frame goes through DeepFace.analyze as soon as it is added
+    """
+
+    def __init__(self, batch_size: int = 16, detector_backend: str = "opencv"):
+        self.batch_size = max(1, batch_size)
+        self.detector_backend = detector_backend
+        self._faces = []    # (frame number, 48x48 crop) waiting for the model
+        self._labels: List[Optional[str]] = []
+
+    @staticmethod
+    def load():
+        if BATCHED:
+            return modeling.build_model("Emotion")
+        # DeepFace.analyze builds and caches the model on its first call
+        DeepFace.analyze(np.zeros((48, 48, 3), dtype=np.uint8), actions=["emotion"], enforce_detection=False)
+        return None
+
+    def add(self, frame: np.ndarray):
+        index = len(self._labels)
+        self._labels.append(None)
+        if not BATCHED:
+            self._labels[index] = self._analyze(frame)
+            return
+        try:
+            face = self._face_crop(frame)
+        except Exception:
+            return
+        if face is None:
+            return
+        self._faces.append((index, face))
+        if len(self._faces) >= self.batch_size:
+            self._predict()
+
+    def finish(self) -> List[Optional[str]]:
+        if self._faces:
+            self._predict()
+        return self._labels
+
+    def _analyze(self, frame: np.ndarray) -> Optional[str]:
+        try:
+            result = DeepFace.analyze(
+                frame,
+                actions=["emotion"],
+                enforce_detection=False,
+                detector_backend=self.detector_backend
+            )
+        except Exception:
+            return None
+        if isinstance(result, list):
+            result = result[0] if result else {}
+        return result.get("dominant_emotion")
+
+    # The steps of DeepFace's demography.analyze and EmotionClient.predict
+    # (deepface 0.0.91) for the first face of the frame
+    def _face_crop(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        faces = detection.extract_faces(
+            img_path=frame,
+            detector_backend=self.detector_backend,
+            grayscale=False,
+            enforce_detection=False,
+            align=True,
+            expand_percentage=0,
+        )
+        if not faces:
+            return None
+        face = faces[0]["face"][:, :, ::-1]
+        face = preprocessing.resize_image(img=face, target_size=(224, 224))
+        gray = cv2.cvtColor(face[0], cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, (48, 48))
+
+    def _predict(self):
+        indices = [index for index, _ in self._faces]
+        batch = np.stack([face for _, face in self._faces])
+        self._faces = []
+        try:
+            predictions = np.asarray(self.load().model(batch[..., np.newaxis], training=False))
+        except Exception as e:
+            print(f"[EMOTION] Batch of {len(indices)} frames failed: {e}")
+            return
+        for index, prediction in zip(indices, predictions):
+            self._labels[index] = Emotion.labels[int(np.argmax(prediction))]
@@ -0,0 +1,182 @@
+from typing import Iterator, Tuple
+
+import cv2
+import numpy as np
+
+# How sampled frames are pulled out of the video:
+# - "read": decode and convert every frame, keep every stride-th one
+# - "grab": grab() every frame (demux + decode) and retrieve() only the
+#   sampled ones, skipping the BGR conversion and copy of the others
+# - "seek": jump to each sampled frame (CAP_PROP_POS_FRAMES: the decoder
+#   restarts at the keyframe before it); cheapest when keyframes are
+#   frequent, falls back to "grab" when the container can't seek
+SAMPLING_MODES = ("read", "grab", "seek")
+
+
+def iter_sampled_frames(
+    cap: "cv2.VideoCapture",
+    stride: int,
+    max_frames: int,
+    mode: str = "grab"
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yields (frame index, BGR frame) for frames 0, stride, 2 * stride, ...
+    below max_frames, the same frames in every mode, from a freshly opened
+    capture.
+    """
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"Unknown frame sampling mode {mode!r}, expected one of {SAMPLING_MODES}")
+    stride = max(1, stride)
+    if mode == "seek":
+        yield from _seek_frames(cap, stride, max_frames)
+    elif mode == "grab":
+        yield from _grab_frames(cap, stride, max_frames, 0)
+    else:
+        frame_idx = 0
+        while frame_idx < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if frame_idx % stride == 0:
+                yield frame_idx, frame
+            frame_idx += 1
+
+
+def _grab_frames(cap, stride, max_frames, frame_idx):
+    # frame_idx: index of the next frame grab() returns
+    while frame_idx < max_frames:
+        if not cap.grab():
+            break
+        if frame_idx % stride == 0:
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            yield frame_idx, frame
+        frame_idx += 1
+
+
+def _seek_frames(cap, stride, max_frames):
+    for frame_idx in range(0, max_frames, stride):
+        if frame_idx > 0 and not _seek_to(cap, frame_idx):
+            # Not seekable (e.g. a streamed WebM without cues) or the seek
+            # missed: go on decoding from wherever the capture is now
+            position = int(round(cap.get(cv2.CAP_PROP_POS_FRAMES)))
+            yield from _grab_frames(cap, stride, max_frames, min(position, frame_idx))
+            return
+        ret, frame = cap.read()
+        if not ret:
+            break
+        yield frame_idx, frame
+
+
+def _seek_to(cap, frame_idx) -> bool:
+    if not cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx):
+        return False
+    return int(round(cap.get(cv2.CAP_PROP_POS_FRAMES))) == frame_idx
+
+
+class AdaptiveSampler:
+    """
+    Chooses which frames get the expensive analysis (FaceMesh + emotion)
+    from cheap signals, within a per-video budget, instead of a fixed stride.
+
+    - every `probe_every` seconds a frame is retrieved (the others are only
+      grab()bed), shrunk to a small grayscale thumbnail and compared with
+      the thumbnail of the last analyzed frame: the 99th percentile of the
+      absolute difference (0-255) is the change energy, so that a change
+      in a small region (the eyes) counts like one all over the frame
+    - a frame is analyzed when the change energy exceeds `change_threshold`
+      or the last analysis was unsure (report(confident=False): no face
+      tracked, or a gaze close to a decision threshold), at most every
+      `min_interval`, and whenever nothing was analyzed for `max_interval`
+    - the first two only run while the budget allows it, paced over the
+      video (`burst` analyses ahead of an even spread at most), so a busy
+      start can't use up what the end needs; the `max_interval` baseline
+      also stops when the budget is spent
+    - frames() yields (frame index, frame) like iter_sampled_frames; the
+      consumer calls report() after analyzing each one
+    """
+
+    THUMBNAIL = (64, 48)
+
+    def __init__(
+        self,
+        fps: float,
+        max_frames: int,
+        budget: int,
+        probe_every: float = 0.2,
+        min_interval: float = 0.4,
+        max_interval: float = 6.0,
+        change_threshold: float = 25.0,
+        burst: int = 4
+    ):
+        self.fps = fps
+        self.max_frames = max_frames
+        self.budget = max(1, budget)
+        self.probe_stride = max(1, int(round(probe_every * fps)))
+        self.min_gap = max(1, int(round(min_interval * fps)))
+        self.max_gap = max(self.min_gap, int(round(max_interval * fps)))
+        self.change_threshold = change_threshold
+        self.burst = burst
+        self.analyzed = []  # indices of the analyzed frames, in order
+        self.triggers = {"start": 0, "change": 0, "unsure": 0, "baseline": 0}
+        self.probes = 0
+        self._confident = True
+
+    def report(self, confident: bool):
+        self._confident = confident
+
+    def durations(self) -> np.ndarray:
+        """
+        Seconds of video each analyzed frame stands for: up to the next
+        analyzed frame (the last one: up to the end, at most max_interval).
+        """
+        indices = np.asarray(self.analyzed, dtype=np.float64)
+        if indices.size == 0:
+            return indices
+        end = min(self.max_frames, indices[-1] + self.max_gap)
+        return np.diff(indices, append=max(end, indices[-1] + 1)) / self.fps
+
+    def frames(self, cap: "cv2.VideoCapture") -> Iterator[Tuple[int, np.ndarray]]:
+        reference = None
+        frame_idx = 0
+        while frame_idx < self.max_frames:
+            if not cap.grab():
+                break
+            if frame_idx % self.probe_stride == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                self.probes += 1
+                thumbnail = self._thumbnail(frame)
+                reason = self._reason(frame_idx, reference, thumbnail)
+                if reason is not None:
+                    self.triggers[reason] += 1
+                    self.analyzed.append(frame_idx)
+                    reference = thumbnail
+                    yield frame_idx, frame
+            frame_idx += 1
+
+    def _reason(self, frame_idx, reference, thumbnail):
+        if reference is None:
+            return "start"
+        if len(self.analyzed) >= self.budget:
+            return None
+        gap = frame_idx - self.analyzed[-1]
+        if gap >= self.max_gap:
+            return "baseline"
+        if gap < self.min_gap or not self._within_pace(frame_idx):
+            return None
+        if not self._confident:
+            return "unsure"
+        if float(np.percentile(cv2.absdiff(thumbnail, reference), 99)) > self.change_threshold:
+            return "change"
+        return None
+
+    def _within_pace(self, frame_idx):
+        even_share = (self.budget - self.burst) * frame_idx / max(1, self.max_frames)
+        return len(self.analyzed) < self.burst + even_share
+
+    def _thumbnail(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, self.THUMBNAIL, interpolation=cv2.INTER_AREA)
@@ -0,0 +1,120 @@
+from itertools import chain
+from typing import Dict, Sequence
+
+import numpy as np
+
+# MediaPipe FaceMesh landmark indices (refine_landmarks=True gives 478)
+LEFT_OUTER, LEFT_INNER = 33, 133
+RIGHT_OUTER, RIGHT_INNER = 362, 263
+NOSE = 1
+LEFT_IRIS = [468, 469, 470, 471]
+RIGHT_IRIS = [473, 474, 475, 476]
+
+# An eye counts as centered when its iris sits in this part of the eye
+# width (0 = outer corner, 1 = inner corner); wide on purpose
+CENTER_MIN, CENTER_MAX = 0.2, 0.8
+# Head counts as facing the screen when the eye-to-nose distances of the
+# two eyes are at least this similar (min / max)
+HEAD_FACING_MIN_RATIO = 0.6
+
+
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """(N, 3) float32 x, y, z of a MediaPipe landmark list."""
+    coords = chain.from_iterable((p.x, p.y, p.z) for p in landmarks)
+    return np.fromiter(coords, dtype=np.float32, count=3 * len(landmarks)).reshape(-1, 3)
+
+
+def gaze_metrics(frames: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Eye contact of every face frame at once, from landmarks stacked as
+    (frames, N, 3). Per frame:
+
+    - left / right: iris position across each eye (0.5 if the eye is too
+      narrow to tell)
+    - head_ratio: min / max of the two eye-to-nose distances (1 = frontal)
+    - eye_contact: at least one eye centered and the head facing the screen
+
+    Computed in float64 from the float32 landmarks, so the results are the
+    same as per-landmark Python arithmetic.
+    """
+    frames = np.asarray(frames)
+    if frames.ndim == 2:
+        frames = frames[np.newaxis]
+
+    def point(index):
+        return frames[:, index, :2].astype(np.float64)
+
+    def iris_x(indices):
+        if indices[-1] < frames.shape[1]:
+            return frames[:, indices, 0].astype(np.float64).mean(axis=1)
+        return np.full(len(frames), 0.5)
+
+    left_outer, left_inner = point(LEFT_OUTER), point(LEFT_INNER)
+    right_outer, right_inner = point(RIGHT_OUTER), point(RIGHT_INNER)
+    nose = point(NOSE)
+
+    left = _normalized_pos(left_outer[:, 0], left_inner[:, 0], iris_x(LEFT_IRIS))
+    right = _normalized_pos(right_outer[:, 0], right_inner[:, 0], iris_x(RIGHT_IRIS))
+    eyes_centered = ((left >= CENTER_MIN) & (left <= CENTER_MAX)) | ((right >= CENTER_MIN) & (right <= CENTER_MAX))
+
+    d_left = _distance(left_outer, nose)
+    d_right = _distance(right_outer, nose)
+    longest = np.maximum(d_left, d_right)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        head_ratio = np.where(longest > 0, np.minimum(d_left, d_right) / longest, 1.0)
+    head_facing = (longest <= 0) | (head_ratio > HEAD_FACING_MIN_RATIO)
+
+    return {
+        "left": left,
+        "right": right,
+        "head_ratio": head_ratio,
+        "eye_contact": eyes_centered & head_facing,
+    }
+
+
+# Iris position from the outer to the inner eye corner; the outer corner is
+# on the left in the image for the left eye, on the right for the right eye
+def _normalized_pos(outer_x, inner_x, iris):
+    width = np.abs(inner_x - outer_x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pos = np.where(outer_x < inner_x, (iris - outer_x) / width, (inner_x - iris) / width)
+    return np.where(width < 1e-4, 0.5, pos)
+
+
+def _distance(a, b):
+    delta = a - b
+    return np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+
+
+def gaze_series(times: Sequence[float], metrics: Dict[str, np.ndarray]) -> Dict[str, list]:
+    """Per-frame gaze time series for the JSON result (one list per column)."""
+    return {
+        "t": [round(float(t), 2) for t in times],
+        "eye_contact": [bool(v) for v in metrics["eye_contact"]],
+        "left": np.round(metrics["left"], 3).tolist(),
+        "right": np.round(metrics["right"], 3).tolist(),
+        "head_ratio": np.round(metrics["head_ratio"], 3).tolist(),
+    }
+
+
+def decision_margin(metrics: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Per frame, how far the eye-contact decision is from flipping: the
+    distance of the deciding values (iris positions, head ratio) from their
+    thresholds. Small margins mean an unsure decision.
+    """
+    def eye(pos):
+        return np.minimum(pos - CENTER_MIN, CENTER_MAX - pos)
+
+    eyes = np.maximum(eye(metrics["left"]), eye(metrics["right"]))
+    head = metrics["head_ratio"] - HEAD_FACING_MIN_RATIO
+    return np.abs(np.minimum(eyes, head))
+
+
+def look_away_episodes(eye_contact: np.ndarray) -> int:
+    """Runs of consecutive face frames without eye contact."""
+    contact = np.asarray(eye_contact, dtype=bool)
+    if contact.size == 0:
+        return 0
+    before = np.concatenate(([True], contact[:-1]))
+    return int(np.count_nonzero(~contact & before))
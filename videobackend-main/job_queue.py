@@ -0,0 +1,282 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+# States a job moves through: queued -> running -> done | failed
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """Raised by submit() when max_depth jobs are already queued or running."""
+
+
+class JobQueue:
+    """
+    Persistent queue of analysis jobs in a local SQLite file.
+
+    - `workers` threads per process run jobs, oldest first; the runner gets
+      the job's payload and a callback to store partial results, which
+      /jobs/<id> reports while the job is still running
+    - at most `max_depth` jobs may be queued or running at once (counted in
+      the database, so across processes); submit() raises QueueFull beyond
+      that so the caller can answer 503 instead of filling the disk and RAM
+    - queued jobs survive a restart; a job whose process died while running
+      it is queued again, and failed after `max_attempts` starts
+    - workers start with start(), not at import, so a process that only
+      imports the app (e.g. the Flask reloader parent) runs no jobs
+    - every thread has its own SQLite connection, and the thread lock only
+      guards in-process state: a write lock held by another process delays
+      the writes that need it (submit, claim), never polls and status reads
+    - a worker that can't reach the database (e.g. still locked after
+      `busy_timeout`) logs it and retries after `poll_seconds`; a job whose
+      end could not be stored is marked failed on its next pass
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        runner: Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Dict[str, Any]],
+        workers: int = 1,
+        max_depth: int = 8,
+        max_attempts: int = 2,
+        poll_seconds: float = 1.0,
+        busy_timeout: float = 30.0
+    ):
+        self.db_path = db_path
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.max_depth = max(self.workers, max_depth)
+        self.max_attempts = max(1, max_attempts)
+        self.poll_seconds = poll_seconds
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._submitted = 0  # jobs submitted by this process, to wake idle workers
+        self._threads = []
+        self._stopping = False
+        self._unfinished: Dict[str, str] = {}  # job id -> why its end wasn't stored
+        self._local = threading.local()
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, seq INTEGER NOT NULL, state TEXT NOT NULL, payload TEXT NOT NULL, "
+            "partial TEXT NOT NULL DEFAULT '{}', result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+            "owner INTEGER, created REAL NOT NULL, started REAL, finished REAL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, seq)")
+
+    # This thread's connection (autocommit: transactions are explicit)
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, isolation_level=None, timeout=self.busy_timeout)
+            self._local.db = db
+        return db
+
+    # ---------- Submitting and polling ----------
+
+    def has_capacity(self) -> bool:
+        return self._active_count() < self.max_depth
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if self._active_count() >= self.max_depth:
+                raise QueueFull(f"{self.max_depth} analysis jobs already queued or running")
+            seq = db.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM jobs").fetchone()[0]
+            db.execute(
+                "INSERT INTO jobs (id, seq, state, payload, created) VALUES (?, ?, ?, ?, ?)",
+                (job_id, seq, QUEUED, json.dumps(payload), time.time())
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._submitted += 1
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        db = self._db()
+        row = db.execute(
+            "SELECT seq, state, payload, partial, result, error, attempts, created, started, finished "
+            "FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        seq, state, payload, partial, result, error, attempts, created, started, finished = row
+        position = None
+        if state == QUEUED:
+            position = db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = ? AND seq < ?", (QUEUED, seq)
+            ).fetchone()[0]
+        return {
+            "job_id": job_id,
+            "state": state,
+            "queue_position": position,
+            "payload": json.loads(payload),
+            "partial": json.loads(partial),
+            "result": json.loads(result) if result is not None else None,
+            "error": error,
+            "attempts": attempts,
+            "created_at": created,
+            "started_at": started,
+            "finished_at": finished,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        counts = dict(self._db().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return {
+            **{state: counts.get(state, 0) for state in (QUEUED, RUNNING, DONE, FAILED)},
+            "workers": self.workers,
+            "max_depth": self.max_depth,
+            "started": bool(self._threads),
+        }
+
+    def _active_count(self) -> int:
+        return self._db().execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)", (QUEUED, RUNNING)
+        ).fetchone()[0]
+
+    # ---------- Workers ----------
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"analysis-job-{i}", daemon=True)
+                self._threads.append(thread)
+            threads = list(self._threads)
+        self._requeue_orphans()
+        for thread in threads:
+            thread.start()
+        print(f"[JOBS] Started {self.workers} worker(s), max depth {self.max_depth}")
+
+    def stop(self):
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify_all()
+
+    # Running jobs of processes that no longer exist go back to the queue
+    def _requeue_orphans(self):
+        db = self._db()
+        rows = db.execute("SELECT id, owner, attempts FROM jobs WHERE state = ?", (RUNNING,)).fetchall()
+        for job_id, owner, attempts in rows:
+            if owner is not None and owner != os.getpid() and _process_alive(owner):
+                continue
+            if attempts >= self.max_attempts:
+                db.execute(
+                    "UPDATE jobs SET state = ?, error = ?, finished = ? WHERE id = ?",
+                    (FAILED, "Analysis was interrupted too many times", time.time(), job_id)
+                )
+            else:
+                db.execute("UPDATE jobs SET state = ?, owner = NULL WHERE id = ?", (QUEUED, job_id))
+                print(f"[JOBS] Re-queued interrupted job {job_id}")
+
+    def _claim(self) -> Optional[tuple]:
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT id, payload FROM jobs WHERE state = ? ORDER BY seq LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET state = ?, owner = ?, attempts = attempts + 1, started = ? WHERE id = ?",
+                    (RUNNING, os.getpid(), time.time(), row[0])
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return row
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if self._stopping:
+                    return
+                submitted = self._submitted
+            try:
+                self._fail_unfinished()
+                claimed = self._claim()
+            except Exception as e:
+                print(f"[JOBS] Could not claim a job: {e}")
+                self._pause()
+                continue
+            if claimed is None:
+                with self._lock:
+                    # Also polls, for jobs submitted by other processes
+                    if not self._stopping and self._submitted == submitted:
+                        self._wakeup.wait(self.poll_seconds)
+                continue
+            job_id, payload = claimed
+            try:
+                self._run(job_id, json.loads(payload))
+            except Exception as e:
+                print(f"[JOBS] Could not store the end of job {job_id}: {e}")
+                with self._lock:
+                    self._unfinished[job_id] = str(e)
+                self._pause()
+
+    def _pause(self):
+        with self._lock:
+            if not self._stopping:
+                self._wakeup.wait(self.poll_seconds)
+
+    # Jobs this process ran but couldn't mark done or failed (still "running")
+    def _fail_unfinished(self):
+        with self._lock:
+            unfinished = list(self._unfinished.items())
+        for job_id, error in unfinished:
+            self._finish(job_id, FAILED, error=f"Analysis result could not be saved: {error}")
+            with self._lock:
+                del self._unfinished[job_id]
+            print(f"[JOBS] Marked job {job_id} failed")
+
+    def _run(self, job_id: str, payload: Dict[str, Any]):
+        def report(partial: Dict[str, Any]):
+            db = self._db()
+            row = db.execute("SELECT partial FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            merged = {**json.loads(row[0]), **partial}
+            db.execute("UPDATE jobs SET partial = ? WHERE id = ?", (json.dumps(merged), job_id))
+
+        print(f"[JOBS] Running job {job_id}")
+        start = time.perf_counter()
+        try:
+            result = self.runner(payload, report)
+        except Exception as e:
+            print(f"[JOBS] Job {job_id} failed: {e}")
+            self._finish(job_id, FAILED, error=f"Analysis failed: {str(e)}")
+            return
+        self._finish(job_id, DONE, result=result)
+        print(f"[JOBS] Job {job_id} done in {time.perf_counter() - start:.1f}s")
+
+    def _finish(self, job_id: str, state: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        self._db().execute(
+            "UPDATE jobs SET state = ?, result = ?, error = ?, finished = ? WHERE id = ?",
+            (state, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+        )
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,133 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# States of a registered model
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+UNAVAILABLE = "unavailable"  # an optional model failed to load; callers fall back
+FAILED = "failed"
+
+
+class ModelRegistry:
+    """
+    The models a process uses, loaded once and warmed up (a dummy input run
+    through them) before the first real request instead of during it.
+
+    - register() a model with its load and warm functions; warm_up() loads
+      and warms the given models (or all), typically at worker start
+    - get() returns the shared instance, loading it first if warm-up hasn't;
+      an optional model that failed gives None, a required one raises
+    - a `pooled` model is not safe to share between threads (e.g. MediaPipe
+      FaceMesh): checkout() lends a thread its own instance and takes it
+      back afterwards for the next request, creating one only when all are
+      in use, so there is at most one per concurrently running thread
+    - status() reports each model's state and load/warm seconds, for the
+      readiness endpoint
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        load: Callable[[], Any],
+        warm: Optional[Callable[[Any], None]] = None,
+        required: bool = True,
+        pooled: bool = False
+    ):
+        self._models[name] = {
+            "load": load,
+            "warm": warm,
+            "required": required,
+            "pooled": pooled,
+            "state": PENDING,
+            "instance": None,
+            "free": [],
+            "seconds": None,
+            "error": None,
+            "lock": threading.Lock(),
+        }
+
+    def warm_up(self, names: Optional[Iterable[str]] = None):
+        for name in (self._models if names is None else names):
+            entry = self._models[name]
+            if entry["pooled"]:
+                if entry["state"] in (PENDING, FAILED):
+                    instance = self._create(name, entry)
+                    if instance is not None:
+                        with self._lock:
+                            entry["free"].append(instance)
+            else:
+                self._load(name, entry)
+
+    def get(self, name: str) -> Any:
+        entry = self._models[name]
+        self._load(name, entry)
+        if entry["state"] == FAILED:
+            raise RuntimeError(f"Model {name} failed to load: {entry['error']}")
+        return entry["instance"]
+
+    def _load(self, name: str, entry: Dict[str, Any]):
+        with entry["lock"]:
+            if entry["state"] in (PENDING, FAILED):
+                entry["instance"] = self._create(name, entry)
+
+    @contextmanager
+    def checkout(self, name: str):
+        entry = self._models[name]
+        with self._lock:
+            instance = entry["free"].pop() if entry["free"] else None
+        if instance is None:
+            instance = self._create(name, entry)
+            if instance is None:
+                raise RuntimeError(f"Model {name} failed to load: {entry['error']}")
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                entry["free"].append(instance)
+
+    def _create(self, name: str, entry: Dict[str, Any]) -> Any:
+        if entry["state"] != READY:
+            entry["state"] = LOADING
+        start = time.perf_counter()
+        try:
+            instance = entry["load"]()
+            if entry["warm"] is not None:
+                entry["warm"](instance)
+        except Exception as e:
+            print(f"[MODELS] {name} failed to load: {e}")
+            entry["state"] = FAILED if entry["required"] else UNAVAILABLE
+            entry["error"] = str(e)
+            return None
+        seconds = time.perf_counter() - start
+        if entry["state"] != READY:
+            entry["state"] = READY
+            entry["seconds"] = round(seconds, 2)
+            entry["error"] = None
+            print(f"[MODELS] {name} loaded and warmed in {seconds:.1f}s")
+        return instance
+
+    def status(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "state": self._models[name]["state"],
+                "required": self._models[name]["required"],
+                "seconds": self._models[name]["seconds"],
+                "error": self._models[name]["error"],
+            }
+            for name in (self._models if names is None else names)
+        }
+
+    def ready(self, names: Optional[Iterable[str]] = None) -> bool:
+        return all(is_ready(model) for model in self.status(names).values())
+
+
+def is_ready(model: Dict[str, Any]) -> bool:
+    """A model counts as ready once warmed, or when optional and unavailable."""
+    return model["state"] == READY or (model["state"] == UNAVAILABLE and not model["required"])
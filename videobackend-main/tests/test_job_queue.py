@@ -0,0 +1,69 @@
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from job_queue import DONE, FAILED, JobQueue  # noqa: E402
+
+
+def lock_database(db_path):
+    # Another writer holding the SQLite write lock
+    locker = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    locker.execute("BEGIN IMMEDIATE")
+    return locker
+
+
+def wait_for(queue, job_id, states, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["state"] in states:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} still {queue.get(job_id)['state']}")
+
+
+def test_worker_survives_a_locked_database(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    queue = JobQueue(db_path, lambda payload, report: {"ok": payload["n"]}, poll_seconds=0.05, busy_timeout=0.05)
+    job_id = queue.submit({"n": 1})
+    locker = lock_database(db_path)
+    queue.start()
+    try:
+        time.sleep(0.3)  # several claims fail with "database is locked"
+        assert queue.get(job_id)["state"] == "queued"
+    finally:
+        locker.execute("ROLLBACK")
+    job = wait_for(queue, job_id, (DONE, FAILED))
+    assert job["state"] == DONE and job["result"] == {"ok": 1}
+    assert all(thread.is_alive() for thread in queue._threads)
+
+    second = queue.submit({"n": 2})
+    assert wait_for(queue, second, (DONE, FAILED))["result"] == {"ok": 2}
+    queue.stop()
+
+
+def test_job_whose_end_was_not_stored_is_failed(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    lockers = []
+
+    def runner(payload, report):
+        lockers.append(lock_database(db_path))  # locked when the result is stored
+        return {"ok": True}
+
+    queue = JobQueue(db_path, runner, poll_seconds=0.05, busy_timeout=0.05)
+    job_id = queue.submit({})
+    queue.start()
+    deadline = time.monotonic() + 5
+    while not queue._unfinished and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert job_id in queue._unfinished
+    threading.Timer(0.1, lambda: lockers[0].execute("ROLLBACK")).start()
+    job = wait_for(queue, job_id, (DONE, FAILED))
+    assert job["state"] == FAILED
+    assert job["error"].startswith("Analysis result could not be saved")
+    queue.stop()